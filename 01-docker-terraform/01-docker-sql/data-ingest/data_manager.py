@@ -1,19 +1,42 @@
 #!/usr/bin/env python
 # coding: utf-8
+import asyncio
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import as_completed, ProcessPoolExecutor, ThreadPoolExecutor
 import csv
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-from io import StringIO
+from functools import partial
+import hashlib
+from io import BytesIO, StringIO
+from itertools import chain, groupby
+import json
 import logging
-from os import PathLike
+from operator import itemgetter
+from os import getpid, link, PathLike, pipe
 from pathlib import Path
-from re import match
-from typing import Callable, Dict, Literal, Tuple
+from queue import Empty, Full, Queue
+from re import match, search, sub
+import resource
+import shutil
+import ssl
+from threading import Event, Lock
+from time import perf_counter, process_time, time
+import tracemalloc
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterable, Iterator, List, Literal, Tuple
 
+import asyncpg
 import click
+import numpy as np
 import pandas as pd
 from pathvalidate import sanitize_filepath
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import requests
+from requests.adapters import HTTPAdapter
 import sqlalchemy as sa
 import validators
 
@@ -26,8 +49,297 @@ PATHS = {
     "certs": PATH_BASE/"certs",
 }
 
+# Local download cache (relative to `PATHS["data"]`): index of cached urls and content-addressed objects (SHA-256).
+PATH_CACHE = Path("cache")
+PATH_CACHE_INDEX = PATH_CACHE/"index.json"
+PATH_CACHE_OBJECTS = PATH_CACHE/"objects"
+
 MIN_PORT, MAX_PORT = 1024, 65535
 
+TABLE_TRIPS_DTYPES = {
+    "tpep_pickup_datetime": sa.types.TIMESTAMP,
+    "tpep_dropoff_datetime": sa.types.TIMESTAMP,
+    "dt": sa.types.BIGINT,
+    "trip_distance": sa.types.REAL,
+    "avg_speed": sa.types.REAL,
+    "PULocationID": sa.types.INTEGER,
+    "DOLocationID": sa.types.INTEGER,
+    "RatecodeID": sa.types.INTEGER,
+    "passenger_count": sa.types.INTEGER,
+    "total_amount": sa.types.REAL,
+    "fare_amount": sa.types.REAL,
+    "tip_amount": sa.types.REAL,
+    "tolls_amount": sa.types.REAL,
+    "extra": sa.types.REAL,
+    "mta_tax": sa.types.REAL,
+    "improvement_surcharge": sa.types.REAL,
+    "congestion_surcharge": sa.types.REAL,
+    "airport_fee": sa.types.REAL,
+    "payment_type": sa.types.INTEGER,
+    "VendorID": sa.types.INTEGER,
+}
+
+# Columns/attributes of NYC taxi trips tabular data read from their source (see `data_read()`), along with the compact
+# dtype (Arrow) each one is read into, as allowed by its SQL type (see TABLE_TRIPS_DTYPES): REAL as float32, and INTEGER
+# as int32 (int8 for small codes). Those which may include missing values are read as float32 (instead of integers) so
+# that pandas does not turn them into float64, and datetimes are read in microseconds whichever resolution they are
+# stored in (PARQUET) or inferred in (seconds, CSV), so `dt` is always in microseconds too. However, `trip_distance`
+# keeps its full precision (float64), as `avg_speed` is computed from it and compared with the speed limits while
+# cleaning (see CLEAN_RULES). Any other column/attribute (e.g., `store_and_fwd_flag`) is never read.
+TABLE_TRIPS_READ_DTYPES = {
+    "VendorID": pa.int8(),
+    "tpep_pickup_datetime": pa.timestamp("us"),
+    "tpep_dropoff_datetime": pa.timestamp("us"),
+    "passenger_count": pa.float32(),
+    "trip_distance": pa.float64(),
+    "RatecodeID": pa.float32(),
+    "PULocationID": pa.int32(),
+    "DOLocationID": pa.int32(),
+    "payment_type": pa.int8(),
+    "fare_amount": pa.float32(),
+    "extra": pa.float32(),
+    "mta_tax": pa.float32(),
+    "tip_amount": pa.float32(),
+    "tolls_amount": pa.float32(),
+    "improvement_surcharge": pa.float32(),
+    "total_amount": pa.float32(),
+    "congestion_surcharge": pa.float32(),
+    # Originally stored as 'airport_fee', later on as 'Airport_fee'.
+    "airport_fee": pa.float32(),
+    "Airport_fee": pa.float32(),
+}
+
+# Columns/attributes of NYC taxi trips tabular data missing in older months (e.g., `airport_fee` until 2021). They are
+# added as missing values (float32) before cleaning, so cleaned tabular data always includes them (see `data_clean()`).
+TABLE_TRIPS_OPTIONAL = ["congestion_surcharge", "airport_fee"]
+
+# Columns/attributes of NYC taxi trips tabular data indexed after a fast load or a sorted load (see `trips_index()`),
+# along with the index access method used in the latter. Trips sorted by pickup datetime are stored in consecutive table
+# blocks, so a (tiny) BRIN index summarizing the pickup datetimes of each block range is enough to skip most of them.
+TABLE_TRIPS_INDEXES = {"tpep_pickup_datetime": "brin", "PULocationID": "btree", "DOLocationID": "btree"}
+
+# Rollups of NYC taxi trips tabular data computed while it is ingested (see `rollups_compute()`), each one stored in its
+# own companion table (`<table_trips>_<name>`). Trips are grouped by the month of their pickup datetime along with the
+# given keys (see ROLLUP_KEYS_DTYPES), and only aggregates (name: column/attribute, function) that can be merged across
+# batches are supported (count | sum | min | max).
+ROLLUPS = {
+    "daily": {
+        "keys": ["day"],
+        "aggregates": {
+            "trips": ("tpep_pickup_datetime", "count"),
+            "trip_distance": ("trip_distance", "sum"),
+            "trip_distance_max": ("trip_distance", "max"),
+            "total_amount": ("total_amount", "sum"),
+            "tip_amount": ("tip_amount", "sum"),
+        },
+    },
+    "hourly_zone_pairs": {
+        "keys": ["hour", "PULocationID", "DOLocationID"],
+        "aggregates": {
+            "trips": ("tpep_pickup_datetime", "count"),
+            "total_amount": ("total_amount", "sum"),
+        },
+    },
+    "distance_buckets": {
+        "keys": ["day", "distance_bucket"],
+        "aggregates": {
+            "trips": ("tpep_pickup_datetime", "count"),
+            "trip_distance": ("trip_distance", "sum"),
+        },
+    },
+    "max_tip_by_zone": {
+        "keys": ["PULocationID", "DOLocationID"],
+        "aggregates": {
+            "trips": ("tpep_pickup_datetime", "count"),
+            "tip_amount_max": ("tip_amount", "max"),
+        },
+    },
+}
+
+# Keys the rollups are grouped by: pickup datetime truncated to the month (always), day, or hour, pickup and dropoff
+# locations, and trip distance bucket (upper bounds, in miles, see ROLLUP_DISTANCE_BUCKETS).
+ROLLUP_KEYS_DTYPES = {
+    "month": sa.types.TIMESTAMP,
+    "day": sa.types.TIMESTAMP,
+    "hour": sa.types.TIMESTAMP,
+    "PULocationID": sa.types.INTEGER,
+    "DOLocationID": sa.types.INTEGER,
+    "distance_bucket": sa.types.String(8),
+}
+ROLLUP_DISTANCE_BUCKETS = [1, 3, 7, 10]
+
+# How partial aggregates (computed per batch) are merged into the whole ones.
+ROLLUP_MERGE = {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+
+# Number of partial rollups (one per batch) kept before they are merged (see `data_ingest()`). Merging them every few
+# batches (instead of after every batch) avoids aggregating the rollups merged so far over and over again, while the
+# memory used by partial rollups stays bounded.
+ROLLUP_MERGE_BATCHES = 16
+
+TABLE_ZONES_DTYPES = {
+    "LocationID": sa.types.INTEGER,
+    "Borough": sa.types.String(15),
+    "Zone": sa.types.String(45),
+    "service_zone": sa.types.String(15),
+}
+
+# Table (in the same schema) recording the row ranges of the cleaned NYC taxi trips of each month already committed into
+# every trips table, so an interrupted data ingestion can be resumed (see `progress_batches()`).
+TABLE_PROGRESS_NAME = "ingest_progress"
+
+# PostgreSQL binary COPY format: file header (signature, flags field, and header extension area length), file trailer,
+# and epoch used to encode TIMESTAMP values (microseconds since 2000-01-01).
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + np.array([0, 0], dtype=">i4").tobytes()
+PGCOPY_TRAILER = np.array([-1], dtype=">i2").tobytes()
+PGCOPY_EPOCH = np.datetime64("2000-01-01T00:00:00", "us")
+
+# Adaptive chunk size during data ingestion (see `chunk_size_adapt()`): minimum chunk size (rows), multiplicative
+# decrease factor, and relative drop in throughput tolerated when the chunk size grows.
+CHUNK_SIZE_MIN = 100
+CHUNK_SIZE_DECREASE = 0.5
+CHUNK_SIZE_TOLERANCE = 0.1
+
+# Size (in bytes) of the blocks CSV files are streamed in (see `csv_open()`), each of them parsed by its own thread.
+CSV_BLOCK_SIZE = 16 * 2**20
+
+# Number of chunks serialized ahead of the one being sent during asynchronous data ingestion (see `psql_copy_async()`).
+COPY_ASYNC_QUEUE_SIZE = 4
+
+# Number of time units (as defined in Arrow temporal types) per hour.
+UNITS_PER_HOUR = {"s": 3600, "ms": 3600 * 10**3, "us": 3600 * 10**6, "ns": 3600 * 10**9}
+
+# Version of the rules applied by `data_clean()` and `data_clean_arrow()`. Bump it whenever they change, so that cached
+# cleaned tabular data (see `data_prepare()`) is invalidated.
+CLEAN_RULES_VERSION = "4"
+
+# Rules identifying bad NYC taxi trips, evaluated by `clean_rules_evaluate()`. Each rule is a vectorized predicate
+# (returning whether each trip is bad data) implemented for both pandas and Arrow. Its input are the columns/attributes
+# of the tabular data (including `dt` and `avg_speed`) and the time period boundaries for the trips recorded. Rules can
+# be disabled (see `main()`), unless cleaned tabular data relies on them (i.e., they are required).
+#
+# Note that we cannot discuss with the business experts how to identify bad data and, therefore, our hability to do so
+# is limited. Next, we propose several scenarios that could identify bad data using our shallow understanding in this
+# sector.
+CLEAN_RULES = {
+    "invalid_datetimes": {
+        "description": "Dropoff datetime not later than pickup datetime.",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: c["tpep_dropoff_datetime"] <= c["tpep_pickup_datetime"],
+        "arrow": lambda c, dates: pc.less_equal(c["tpep_dropoff_datetime"], c["tpep_pickup_datetime"]),
+    },
+    "outside_period": {
+        "description": "Pickup or dropoff datetime outside the analyzed time period.",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: (
+            (c["tpep_pickup_datetime"] < dates[0])
+            | (c["tpep_pickup_datetime"] >= dates[1])
+            | (c["tpep_dropoff_datetime"] < dates[0])
+            | (c["tpep_dropoff_datetime"] >= dates[1])
+        ),
+        "arrow": lambda c, dates: pc.or_kleene(
+            pc.or_kleene(
+                pc.less(c["tpep_pickup_datetime"], dates[0]),
+                pc.greater_equal(c["tpep_pickup_datetime"], dates[1]),
+            ),
+            pc.or_kleene(
+                pc.less(c["tpep_dropoff_datetime"], dates[0]),
+                pc.greater_equal(c["tpep_dropoff_datetime"], dates[1]),
+            ),
+        ),
+    },
+    "invalid_vendor": {
+        "description": "Invalid `VendorID` value (6).",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: c["VendorID"] == 6,
+        "arrow": lambda c, dates: pc.equal(c["VendorID"], 6),
+    },
+    # Cleaned tabular data stores `RatecodeID` (and `passenger_count`, missing whenever `RatecodeID` is) as integers.
+    "missing_ratecode": {
+        "description": "Missing `RatecodeID` value.",
+        "enabled": True,
+        "required": True,
+        "pandas": lambda c, dates: c["RatecodeID"].isna(),
+        "arrow": lambda c, dates: pc.is_null(c["RatecodeID"], nan_is_null=True),
+    },
+    "invalid_ratecode": {
+        "description": "Invalid `RatecodeID` value (99).",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: c["RatecodeID"] == 99.0,
+        "arrow": lambda c, dates: pc.equal(c["RatecodeID"], 99.0),
+    },
+    # By law, a maximum of 4 passengers are allowed in standard NYC taxis. A child under 7 is allowed to sit on a
+    # passenger's lap in the rear seat in addition to the passenger limit.
+    "invalid_passenger_count": {
+        "description": "More than 5 passengers or no passengers at all.",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: (c["passenger_count"] > 5) | (c["passenger_count"] == 0),
+        "arrow": lambda c, dates: pc.or_kleene(
+            pc.greater(c["passenger_count"], 5),
+            pc.equal(c["passenger_count"], 0),
+        ),
+    },
+    "invalid_distance": {
+        "description": "Negative or nil trip distance.",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: c["trip_distance"] <= 0,
+        "arrow": lambda c, dates: pc.less_equal(c["trip_distance"], 0),
+    },
+    "negligible_duration": {
+        "description": "Negligible trip duration (lower than 1 minute).",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: c["dt"] < pd.Timedelta(minutes=1),
+        "arrow": lambda c, dates: pc.less(
+            c["dt"],
+            pa.scalar(UNITS_PER_HOUR[c["dt"].type.unit] // 60, type=c["dt"].type),
+        ),
+    },
+    "negative_speed": {
+        "description": "Negative average speed (i.e., the trip distance or duration is negative).",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: c["avg_speed"] < 0,
+        "arrow": lambda c, dates: pc.less(c["avg_speed"], 0),
+    },
+    "speeding_outside_nyc": {
+        "description": "Trip from or to outside NYC faster than 75 mph (max freeway speed limit around NYC).",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: (c["avg_speed"] > 75) & ((c["PULocationID"] > 263) | (c["DOLocationID"] > 263)),
+        "arrow": lambda c, dates: pc.and_kleene(
+            pc.greater(c["avg_speed"], 75),
+            pc.or_kleene(pc.greater(c["PULocationID"], 263), pc.greater(c["DOLocationID"], 263)),
+        ),
+    },
+    "speeding_within_nyc": {
+        "description": "Trip within NYC faster than 50 mph (max speed limit in NYC).",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: (c["avg_speed"] > 50) & ((c["PULocationID"] < 264) & (c["DOLocationID"] < 264)),
+        "arrow": lambda c, dates: pc.and_kleene(
+            pc.greater(c["avg_speed"], 50),
+            pc.and_kleene(pc.less(c["PULocationID"], 264), pc.less(c["DOLocationID"], 264)),
+        ),
+    },
+    # These slow trips cannot even be associated with traffic jams, even in NYC.
+    "slow_trip": {
+        "description": "Trip taking more than 1 hour at an average speed lower than 3 mph.",
+        "enabled": True,
+        "required": False,
+        "pandas": lambda c, dates: (c["dt"] > pd.Timedelta(hours=1)) & (c["avg_speed"] < 3),
+        "arrow": lambda c, dates: pc.and_kleene(
+            pc.greater(c["dt"], pa.scalar(UNITS_PER_HOUR[c["dt"].type.unit], type=c["dt"].type)),
+            pc.less(c["avg_speed"], 3),
+        ),
+    },
+}
+
 
 def init_logger() -> logging.Logger:
     logger = logging.getLogger(name="data-manager")
@@ -42,6 +354,228 @@ def init_logger() -> logging.Logger:
 
 _logger = init_logger()
 
+# Local download cache index lock (data may be downloaded concurrently) and stats (cache hits and bytes saved).
+_cache_lock = Lock()
+_cache_stats = {"hits": 0, "bytes_saved": 0}
+
+# Stats of the rules identifying bad NYC taxi trips evaluated so far (see `clean_rules_evaluate()`).
+_clean_report = {
+    "rows": 0,
+    "rows_rejected": 0,
+    "rules": defaultdict(lambda: {"rows_rejected": 0, "tex": 0., "mem": 0}),
+}
+
+# End-of-stream marker sent between the stages of the backfill pipeline (see `data_backfill()`).
+_PIPELINE_END = object()
+
+# SQLAlchemy engine used by each worker process during parallel data ingestion (see `data_ingest_parallel()`).
+_engine = None
+
+# State of the adaptive chunk size used during data ingestion, per layout (columns/attributes) of the destination table
+# (see `chunk_size_adapt()`), so it is kept across batches and tables sharing it (e.g., monthly partitions).
+_chunk_sizes = {}
+
+# Stage metrics recorded so far (see `metrics_end()`), the local path (JSON-lines format) where they are appended (if
+# any), and the identifier of the current run (shared by all of them).
+_metrics = []
+_metrics_fname = None
+_metrics_lock = Lock()
+_metrics_run = f"{datetime.now():%Y%m%dT%H%M%S}-{getpid()}"
+
+
+def data_size(data: pd.DataFrame | pa.Table) -> Tuple[int, int]:
+    """
+    Returns the number of rows and the size (in bytes) of tabular data in memory.
+
+    Args:
+        data: Tabular data (either a pandas DataFrame or an Arrow Table).
+
+    Returns:
+        Number of rows and size (in bytes, excluding Python objects referenced by pandas columns) of tabular data.
+    """
+    if isinstance(data, pa.Table):
+        return data.num_rows, data.nbytes
+    else:
+        return len(data), int(data.memory_usage(index=False).sum())
+
+
+def metrics_begin(stage: str, **labels: Any) -> Dict[str, Any]:
+    """
+    Starts measuring a stage (e.g., download, read, clean, create, copy, or grant) of the data ingestion.
+
+    Args:
+        stage: Name of the stage.
+        labels: Additional details of the stage (e.g., its destination table).
+
+    Returns:
+        Metrics of the stage, to be completed by `metrics_end()`. Stages may set its `rows` and `bytes` beforehand.
+    """
+    return {
+        "run": _metrics_run,
+        "stage": stage,
+        **labels,
+        "rows": None,
+        "bytes": None,
+        "wall": perf_counter(),
+        "cpu": process_time(),
+    }
+
+
+def metrics_end(metrics: Dict[str, Any], data: pd.DataFrame | pa.Table | None = None) -> Dict[str, Any]:
+    """
+    Completes and records the metrics of a stage started by `metrics_begin()`.
+
+    Every stage records its elapsed real (wall clock) time, its CPU time (of the whole process, so including any other
+    thread running concurrently), the peak resident set size of the process so far (in bytes), and the number of rows
+    and bytes it processed (if known). They are appended to `_metrics_fname` (JSON-lines format), if set.
+
+    Args:
+        metrics: Metrics of the stage returned by `metrics_begin()`.
+        data: If set, tabular data processed by the stage (its number of rows and size are recorded).
+
+    Returns:
+        Completed metrics of the stage.
+    """
+    metrics["wall"] = perf_counter() - metrics["wall"]
+    metrics["cpu"] = process_time() - metrics["cpu"]
+    # Kilobytes on Linux.
+    metrics["rss_peak"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    metrics["time"] = time()
+
+    if data is not None:
+        metrics["rows"], metrics["bytes"] = data_size(data)
+    else:
+        pass
+
+    metrics_record(metrics)
+
+    return metrics
+
+
+def metrics_record(metrics: Dict[str, Any]) -> None:
+    """
+    Records the (completed) metrics of a stage.
+
+    Args:
+        metrics: Metrics of the stage (e.g., returned by `metrics_end()` in a worker process).
+    """
+    with _metrics_lock:
+        _metrics.append(metrics)
+
+        if _metrics_fname is not None:
+            with open(_metrics_fname, "a") as f:
+                f.write(json.dumps(metrics) + "\n")
+        else:
+            pass
+
+    return None
+
+
+@contextmanager
+def metrics_stage(stage: str, **labels: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Measures the stage of the data ingestion run within the context (see `metrics_begin()` and `metrics_end()`).
+
+    The stage is recorded even if it fails, along with the type of the exception raised (`error`).
+
+    Args:
+        stage: Name of the stage.
+        labels: Additional details of the stage (e.g., its destination table).
+
+    Yields:
+        Metrics of the stage (its `rows` and `bytes` may be set within the context).
+    """
+    metrics = metrics_begin(stage, **labels)
+    try:
+        yield metrics
+    except BaseException as error:
+        metrics["error"] = type(error).__name__
+        raise
+    finally:
+        metrics_end(metrics)
+
+
+def metrics_batches(
+        stage: str,
+        batches: Iterable[pd.DataFrame | pa.Table],
+        **labels: Any,
+) -> Iterator[pd.DataFrame | pa.Table]:
+    """
+    Yields the given tabular data batches, measuring the stage producing each of them (e.g., reading it). A batch
+    whose stage fails is recorded as well (see `metrics_stage()`).
+
+    Args:
+        stage: Name of the stage.
+        batches: Tabular data batches (either pandas DataFrames or Arrow Tables), lazily produced by the stage.
+        labels: Additional details of the stage (e.g., its source file).
+
+    Yields:
+        Tabular data batches.
+    """
+    batches = iter(batches)
+    while True:
+        metrics = metrics_begin(stage, **labels)
+        try:
+            batch = next(batches)
+        except StopIteration:
+            return None
+        except BaseException as error:
+            metrics["error"] = type(error).__name__
+            metrics_end(metrics)
+            raise
+
+        metrics_end(metrics, batch)
+        yield batch
+
+
+def metrics_prometheus_write(fname: str | bytes | PathLike) -> None:
+    """
+    Writes the stage metrics recorded so far, aggregated by stage, for the Prometheus node exporter textfile collector.
+
+    Samples are only labelled by stage, so the number of series does not grow with every run. The run they belong to
+    (see the `run` field of the JSON-lines metrics) is exposed by a single info metric instead.
+
+    Args:
+        fname: Local path where the metrics are to-be-written (Prometheus text format, `.prom` extension).
+    """
+    stages = defaultdict(lambda: {"count": 0, "wall": 0., "cpu": 0., "rss_peak": 0, "rows": 0, "bytes": 0})
+    with _metrics_lock:
+        for metrics in _metrics:
+            stats = stages[metrics["stage"]]
+            stats["count"] += 1
+            stats["wall"] += metrics["wall"]
+            stats["cpu"] += metrics["cpu"]
+            stats["rss_peak"] = max(stats["rss_peak"], metrics["rss_peak"])
+            stats["rows"] += metrics["rows"] or 0
+            stats["bytes"] += metrics["bytes"] or 0
+
+    lines = [
+        "# HELP data_manager_run_info Data ingestion run the stage metrics belong to.",
+        "# TYPE data_manager_run_info gauge",
+        f'data_manager_run_info{{run="{_metrics_run}"}} 1',
+    ]
+    for name, key, description in [
+        ("stage_runs", "count", "Number of times each stage was run."),
+        ("stage_wall_seconds", "wall", "Elapsed real (wall clock) time spent in each stage."),
+        ("stage_cpu_seconds", "cpu", "CPU time (whole process) spent in each stage."),
+        ("stage_rss_peak_bytes", "rss_peak", "Peak resident set size of the process after each stage."),
+        ("stage_rows", "rows", "Number of rows processed by each stage."),
+        ("stage_bytes", "bytes", "Number of bytes processed by each stage."),
+    ]:
+        lines.append(f"# HELP data_manager_{name} {description}")
+        lines.append(f"# TYPE data_manager_{name} gauge")
+        for stage, stats in stages.items():
+            lines.append(f'data_manager_{name}{{stage="{stage}"}} {stats[key]}')
+
+    # The textfile collector may read the file at any time, so it is replaced atomically.
+    fname_tmp = Path(fname).with_suffix(".tmp")
+    fname_tmp.write_text("\n".join(lines) + "\n")
+    fname_tmp.replace(fname)
+
+    _logger.info(f"Stage metrics written to {fname}.")
+
+    return None
+
 
 # Alternative to_sql() *method* for DBs that support COPY FROM
 def psql_insert_copy(table, conn, keys, data_iter):
@@ -75,375 +609,3981 @@ def psql_insert_copy(table, conn, keys, data_iter):
         cur.copy_expert(sql=sql, file=s_buf)
 
 
-def data_download(url: str, fname: str | bytes | PathLike, chunk_size: int) -> None:
+def pgcopy_encode_column(
+        values: pd.Series | pa.ChunkedArray,
+        dtype: sa.types.TypeEngine,
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Downloads tabular data (NYC taxi trips; PARQUET format) from remote location and store it locally.
+    Encodes a column/attribute into PostgreSQL binary COPY format (big-endian), without any per-row Python loop.
 
     Args:
-        url: Tabular data (NYC taxi trips; PARQUET format) remote repository.
-        fname: Local path where tabular data (NYC taxi trips) will be stored (PARQUET format).
-        chunk_size: Chunk size used during local storage.
+        values: Column/attribute values to be encoded (either a pandas Series or an Arrow ChunkedArray).
+        dtype: SQL type of the column/attribute (TIMESTAMP, BIGINT, REAL, DOUBLE PRECISION, INTEGER, or VARCHAR).
+
+    Returns:
+        Encoded values as a matrix of bytes (one row per value, right-padded to the widest value) and the length (in
+        bytes) of each encoded value (-1 for NULL values).
 
     Raises:
-        ConnectionError: If unable to download tabular data (NYC taxi trips) from remote location.
+        ValueError: If provided `dtype` is unsupported.
     """
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
+    dtype = dtype() if isinstance(dtype, type) else dtype
+    n_rows = len(values)
 
-    fname = PATHS["data"]/Path(fname).name
-    with open(fname, "wb") as file:
-        for data in response.iter_content(chunk_size):
-            if data:
-                file.write(data)
-            else:
-                pass
+    if isinstance(values, pd.Series):
+        nulls = values.isna().to_numpy()
+        values = values.to_numpy()
+    else:
+        nulls = values.is_null(nan_is_null=True).to_numpy()
+        values = values.to_numpy()
 
-    _logger.info(f"NYC taxi tabular data downloaded from {url} and saved locally in {fname}.")
+    if isinstance(dtype, sa.types.DateTime):
+        # Microseconds since 2000-01-01 (NaT values are discarded later on as NULL values).
+        encoded = (values.astype("datetime64[us]") - PGCOPY_EPOCH).view("i8").astype(">i8")
+    elif isinstance(dtype, sa.types.BigInteger):
+        # Timedeltas are stored as integers in their own resolution, consistently with `to_sql()`.
+        if np.issubdtype(values.dtype, np.timedelta64):
+            encoded = values.view("i8").astype(">i8")
+        else:
+            encoded = np.where(nulls, 0, values).astype(">i8")
+    elif isinstance(dtype, sa.types.Integer):
+        encoded = np.where(nulls, 0, values).astype(">i4")
+    elif isinstance(dtype, sa.types.Double):
+        encoded = values.astype(">f8")
+    elif isinstance(dtype, sa.types.Float):
+        encoded = values.astype(">f4")
+    elif isinstance(dtype, sa.types.String):
+        strings = pd.Series(values).where(~nulls, "").astype(str).str.encode("utf-8")
+        encoded = np.array(strings.tolist(), dtype=bytes)
+        lengths = np.where(nulls, -1, strings.str.len().to_numpy()).astype("int32")
+        return encoded.view(np.uint8).reshape(n_rows, encoded.itemsize), lengths
+    else:
+        raise ValueError(f"Unsupported SQL type ({dtype}) in PostgreSQL binary COPY format.")
 
-    return None
+    lengths = np.where(nulls, -1, encoded.itemsize).astype("int32")
 
+    return np.ascontiguousarray(encoded).view(np.uint8).reshape(n_rows, encoded.itemsize), lengths
 
-def data_read(fname: str | bytes | PathLike) -> pd.DataFrame:
+
+def pgcopy_encode(data: pd.DataFrame | pa.Table, dtypes: Dict[str, sa.types.TypeEngine]) -> bytes:
     """
-    Returns NYC taxi tabular data read from given local path (PARQUET | CSV format).
+    Encodes tabular data into PostgreSQL binary COPY format, including its file header and trailer.
+
+    Every tuple is laid out as a row of a matrix of bytes (field count, and then length and value of each field), and
+    the bytes of those values that are NULL or shorter than the widest value in its column/attribute are masked out
+    afterwards.
 
     Args:
-        fname: Local path where NYC taxi tabular data is stored (PARQUET | CSV format).
+        data: Tabular data to be encoded (either a pandas DataFrame or an Arrow Table).
+        dtypes: SQL type of each column/attribute in `data`.
 
     Returns:
-        NYC taxi tabular data read from given local path.
+        Tabular data encoded in PostgreSQL binary COPY format.
+    """
+    n_rows = len(data)
+    columns = data.column_names if isinstance(data, pa.Table) else list(data.columns)
+
+    fields = [np.full(n_rows, len(columns), dtype=">i2").view(np.uint8).reshape(n_rows, 2)]
+    masks = [np.ones((n_rows, 2), dtype=bool)]
+    for column in columns:
+        encoded, lengths = pgcopy_encode_column(data[column], dtypes[column])
+
+        fields.append(lengths.astype(">i4").view(np.uint8).reshape(n_rows, 4))
+        masks.append(np.ones((n_rows, 4), dtype=bool))
+
+        fields.append(encoded)
+        masks.append(np.arange(encoded.shape[1]) < lengths[:, None])
+
+    fields = np.hstack(fields)
+    masks = np.hstack(masks)
+    if masks.all():
+        tuples = fields.tobytes()
+    else:
+        tuples = fields[masks].tobytes()
+
+    return PGCOPY_HEADER + tuples + PGCOPY_TRAILER
+
+
+def pgcopy_decode(buf: bytes | memoryview, schema: pa.Schema) -> pa.RecordBatch:
+    """
+    Decodes tuples in PostgreSQL binary COPY format (without its file header and trailer), as exported by
+    `export_query()`, without any per-row Python loop.
+
+    Every value is exported with a fixed width (NULL values replaced by zero and flagged in a trailing bitmask, see
+    `export_query()`), so tuples are laid out as the records of a structured array (field count, and then length and
+    value of each field), and every column/attribute is read out of it as a whole.
+
+    Args:
+        buf: Tuples to be decoded (whole tuples only).
+        schema: Arrow schema of the exported columns/attributes (see `export_schema()`), excluding the bitmask.
+
+    Returns:
+        Decoded tabular data.
 
     Raises:
-        ValueError: If provided `fname` is not stored in a supported format (PARQUET | CSV).
+        ValueError: If provided `buf` does not hold whole tuples, or these are not laid out as expected.
     """
-    if Path(fname).suffix == ".parquet":
-        data = pd.read_parquet(PATHS["data"]/Path(fname).name)
-    elif Path(fname).suffix == ".csv":
-        data = pd.read_csv(PATHS["data"]/Path(fname).name)
+    # Big-endian layout of each value (TIMESTAMP values as microseconds since 2000-01-01), and then the bitmask.
+    layouts = [np.dtype("i8") if pa.types.is_timestamp(field.type) else np.dtype(field.type.to_pandas_dtype())
+               for field in schema]
+    layouts = [layout.newbyteorder(">") for layout in layouts] + [np.dtype(">i8")]
+
+    names, formats = ["count"], [np.dtype(">i2")]
+    for i, layout in enumerate(layouts):
+        names += [f"length_{i}", f"value_{i}"]
+        formats += [np.dtype(">i4"), layout]
+
+    layout_tuple = np.dtype({"names": names, "formats": formats})
+
+    if len(buf) % layout_tuple.itemsize != 0:
+        raise ValueError(f"Truncated tuples in PostgreSQL binary COPY format ({len(buf)} bytes).")
+    else:
+        pass
+
+    tuples = np.frombuffer(buf, dtype=layout_tuple)
+    if not (tuples["count"] == len(layouts)).all() or not all(
+        (tuples[f"length_{i}"] == layout.itemsize).all() for i, layout in enumerate(layouts)
+    ):
+        raise ValueError("Unexpected field count or length in PostgreSQL binary COPY format (NULL or variable width).")
     else:
-        raise ValueError(f"Invalid file extension ({Path(fname).suffix}). Supported extensions: PARQUET | CSV.")
+        pass
+
+    nulls = tuples[f"value_{len(schema)}"].astype("i8")
+    arrays = []
+    for i, field in enumerate(schema):
+        column = tuples[f"value_{i}"].astype(layouts[i].newbyteorder("="))
+        if pa.types.is_timestamp(field.type):
+            column = (column + PGCOPY_EPOCH.view("i8")).view("datetime64[us]")
+        else:
+            pass
 
-    _logger.info(f"NYC taxi tabular data read from {PATHS['data']/Path(fname).name}")
+        mask = ((nulls >> i) & 1).astype(bool)
+        arrays.append(pa.array(column, type=field.type, mask=mask if mask.any() else None))
 
-    return data
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
 
 
-def data_clean(data: pd.DataFrame, dates: Tuple[datetime, datetime]) -> pd.DataFrame:
+# Alternative to to_sql() for DBs that support COPY FROM using PostgreSQL binary format
+def psql_copy_binary(
+        data: pd.DataFrame | pa.Table,
+        conn: sa.engine.Connection,
+        table_name: str,
+        dtypes: Dict[str, sa.types.TypeEngine],
+        chunk_size: int,
+) -> None:
     """
-    Return cleaned tabular data (NYC taxi trips).
+    Execute SQL statement inserting data (PostgreSQL binary COPY format).
+
+    Unlike `psql_insert_copy()`, data is not converted to Python objects (one per value) and then to text, but whole
+    columns/attributes are packed straight into PostgreSQL binary representation.
 
     Args:
-        data: Tabular data (NYC taxi trips) to be cleaned.
-        dates: time period boundaries for the tabular data (NYC taxi trips) recorded.
+        data: Tabular data to be inserted (either a pandas DataFrame or an Arrow Table).
+        conn: SQLAlchemy connection to the PostgreSQL database.
+        table_name: Name of the (already existing) destination table, including its schema (if any).
+        dtypes: SQL type of each column/attribute in `data`.
+        chunk_size: Number of rows inserted per COPY statement.
+    """
+    # gets a DBAPI connection that can provide a cursor
+    dbapi_conn = conn.connection
+    with dbapi_conn.cursor() as cur:
+        if isinstance(data, pa.Table):
+            columns = ', '.join(['"{}"'.format(k) for k in data.column_names])
+        else:
+            columns = ', '.join(['"{}"'.format(k) for k in data.columns])
+        sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT binary)'.format(table_name, columns)
+
+        for start in range(0, len(data), chunk_size):
+            if isinstance(data, pa.Table):
+                chunk = data.slice(start, chunk_size)
+            else:
+                chunk = data.iloc[start:start + chunk_size]
+
+            b_buf = BytesIO(pgcopy_encode(chunk, dtypes))
+            cur.copy_expert(sql=sql, file=b_buf)
+
+
+async def psql_copy_async(
+        data: pd.DataFrame | pa.Table,
+        conn: asyncpg.Connection,
+        schema: str,
+        table_name: str,
+        dtypes: Dict[str, sa.types.TypeEngine],
+        chunk_size: int,
+) -> None:
     """
-    # Discard `store_and_fwd_flag` details because of its lack of relevance.
-    del data["store_and_fwd_flag"]
+    Execute SQL statement inserting data (PostgreSQL binary COPY format), streaming it asynchronously.
 
-    # Originally stored as 'airport_fee', later on as 'Airport_fee'.
-    if "Airport_fee" in data:
-        data["airport_fee"] = data["Airport_fee"]
-        del data["Airport_fee"]
+    Unlike `psql_copy_binary()`, every chunk is sent within a single COPY statement, and each chunk is serialized in a
+    worker thread while the previous ones are being sent. Serialized chunks wait in a bounded queue (up to
+    COPY_ASYNC_QUEUE_SIZE), so serialization never gets too far ahead of the network.
+
+    Args:
+        data: Tabular data to be inserted (either a pandas DataFrame or an Arrow Table).
+        conn: asyncpg connection to the PostgreSQL database (see `pg_session_async()`).
+        schema: PostgreSQL schema of the destination table.
+        table_name: Name of the (already existing) destination table.
+        dtypes: SQL type of each column/attribute in `data`.
+        chunk_size: Number of rows serialized at a time.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=COPY_ASYNC_QUEUE_SIZE)
+
+    async def serialize() -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                for start in range(0, len(data), chunk_size):
+                    if isinstance(data, pa.Table):
+                        chunk = data.slice(start, chunk_size)
+                    else:
+                        chunk = data.iloc[start:start + chunk_size]
+
+                    encoded = await loop.run_in_executor(executor, pgcopy_encode, chunk, dtypes)
+                    await queue.put(encoded[len(PGCOPY_HEADER):-len(PGCOPY_TRAILER)])
+        except Exception as e:
+            # Abort the COPY statement rather than committing a truncated one.
+            await queue.put(e)
+            raise
+        else:
+            await queue.put(None)
+
+    async def stream() -> AsyncIterator[bytes]:
+        yield PGCOPY_HEADER
+        while (encoded := await queue.get()) is not None:
+            if isinstance(encoded, Exception):
+                raise encoded
+            else:
+                yield encoded
+
+        yield PGCOPY_TRAILER
+
+    if isinstance(data, pa.Table):
+        columns = data.column_names
+    else:
+        columns = list(data.columns)
+
+    producer = asyncio.create_task(serialize())
+    try:
+        await conn.copy_to_table(table_name, source=stream(), columns=columns, schema_name=schema, format="binary")
+        await producer
+    finally:
+        producer.cancel()
+
+
+def rss_current() -> int:
+    """
+    Returns the current resident set size of the process (in bytes).
+
+    Returns:
+        Current resident set size of the process (or its peak resident set size so far, if unavailable, i.e., outside
+        Linux).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def chunk_size_adapt(state: Dict[str, Any], rows: int, nbytes: int, tex: float, mem: int) -> int:
+    """
+    Adapts the chunk size used during data ingestion to the throughput and memory growth measured on the last chunk
+    (additive increase, multiplicative decrease).
+
+    The chunk size doubles (slow start) until it first decreases, and then grows by its initial value. If growing it
+    drops throughput (rows/s) by more than CHUNK_SIZE_TOLERANCE, it is multiplied by CHUNK_SIZE_DECREASE instead.
+    Either way, it is capped so that the next chunk is expected to fit in the memory left under the ceiling, based on
+    the memory used per row by the last chunk (i.e., memory growth of the process or in-memory size of the chunk,
+    whichever is larger).
+
+    Args:
+        state: Adaptive chunk size state (see `data_insert()`), updated in place.
+        rows: Number of rows ingested in the last chunk.
+        nbytes: Size (in bytes) of the last chunk in memory.
+        tex: Elapsed real (wall clock) time, in seconds, ingesting the last chunk.
+        mem: Growth (in bytes) of the resident set size of the process while ingesting the last chunk.
+
+    Returns:
+        Chunk size (rows) of the next chunk.
+    """
+    chunk_size = state["chunk_size"]
+    throughput = rows / max(tex, 1e-9)
+    state["mem_row"] = max(mem, nbytes) / rows
+
+    # Partial (last) chunks are not representative of the throughput of the current chunk size.
+    if rows < chunk_size:
+        pass
+    elif state["increased"] and throughput < state["throughput"] * (1 - CHUNK_SIZE_TOLERANCE):
+        state["chunk_size"] = int(chunk_size * CHUNK_SIZE_DECREASE)
+        state["slow_start"] = False
+    elif state["slow_start"]:
+        state["chunk_size"] = chunk_size * 2
+    else:
+        state["chunk_size"] = chunk_size + state["step"]
+
+    limit = int((state["mem_max"] - rss_current()) / state["mem_row"])
+    if state["chunk_size"] > limit:
+        state["chunk_size"] = limit
+        state["slow_start"] = False
     else:
         pass
 
-    # Check number of unique values per column/attribute and identify potential categorical values.
-    for column in data.columns:
-        if data[column].nunique() < 10:
-            _logger.debug(f"Column {column} includes {data[column].nunique()} unique values ({data[column].unique()}).")
-        else:
-            _logger.debug(f"Column {column} includes {data[column].nunique()} unique values.")
+    state["chunk_size"] = max(state["chunk_size"], CHUNK_SIZE_MIN)
+    if rows == chunk_size:
+        state["increased"] = state["chunk_size"] > chunk_size
+        state["throughput"] = throughput
+    else:
+        pass
 
-    # Compute delta time (time elapsed between pickup and dropoff).
-    data["dt"] = (
-        data["tpep_dropoff_datetime"]
-        - data["tpep_pickup_datetime"]
+    _logger.debug(
+        f"Chunk of {rows} rows ingested ({throughput:.0f} rows/s, {nbytes / max(tex, 1e-9) / 2**20:.1f} MiB/s, "
+        f"{mem / 2**20:+.1f} MiB). Next chunk size: {state['chunk_size']} rows."
     )
 
-    data["avg_speed"] = (
-        data["trip_distance"]
-        / (data["dt"]/pd.Timedelta(hours=1))
-    )
+    return state["chunk_size"]
 
-    # Reorder columns/attributes based on its relevance.
-    data = data[
-        [
-            "tpep_pickup_datetime",
-            "tpep_dropoff_datetime",
-            "dt",
-            "trip_distance",
-            "avg_speed",
-            "PULocationID",
-            "DOLocationID",
-            "RatecodeID",
-            "passenger_count",
-            "total_amount",
-            "fare_amount",
-            "tip_amount",
-            "tolls_amount",
-            "extra",
-            "mta_tax",
-            "improvement_surcharge",
-            "congestion_surcharge",
-            "airport_fee",
-            "payment_type",
-            "VendorID",
-        ]
-    ].copy()
-
-    # Discard trips considered bad data.
-
-    # Note that we cannot discuss with the business experts how to identify bad data and, therefore, our hability to do
-    # so is limited. Next, we propose several scenarios that could identify bad data using our shallow understanding in
-    # this sector.
-
-    # - Discard trips outside the analyzed time period and those with invalid pickup and dropoff datetimes.
-    data.drop(
-        data[
-            (data["tpep_dropoff_datetime"] <= data["tpep_pickup_datetime"])
-            | (data["tpep_pickup_datetime"] < dates[0])
-            | (data["tpep_pickup_datetime"] >= dates[1])
-            | (data["tpep_dropoff_datetime"] < dates[0])
-            | (data["tpep_dropoff_datetime"] >= dates[1])
-        ].index,
-        inplace=True,
-    )
 
-    # - Discard trips with invalid `VendorID` values.
-    data.drop(data[data["VendorID"] == 6].index, inplace=True)
+def data_insert(
+        data: pd.DataFrame | pa.Table,
+        engine: sa.engine.Engine,
+        schema: str,
+        table_name: str,
+        dtypes: Dict[str, sa.types.TypeEngine],
+        chunk_size: int,
+        method: str,
+        mem_max: int = 0,
+        checkpoint: sa.sql.Executable | None = None,
+        session: Tuple[asyncio.AbstractEventLoop, asyncpg.Connection] | None = None,
+) -> None:
+    """
+    Inserts tabular data into an already existing table in a PostgreSQL database.
 
-    # - Discard trips with invalid `RatecodeID` values and convert to `int64` this column/attribute.
-    data.drop(
-        data[
-            (data["RatecodeID"].isna())
-            | (data["RatecodeID"] == 99.0)
-        ].index,
-        inplace=True,
-    )
+    Arrow Tables are sent straight to the binary COPY serializers (`psql_copy_binary` and `psql_copy_async`). Otherwise,
+    they are converted to pandas DataFrames beforehand, as required by `to_sql()`.
 
-    data["RatecodeID"] = data["RatecodeID"].astype("int64")
+    If a memory ceiling is set, tabular data is inserted one chunk at a time, and the size of each chunk is adapted to
+    the throughput and memory growth measured on the previous ones (see `chunk_size_adapt()`), starting from
+    `chunk_size`. The adapted chunk size is kept for later calls inserting the same columns/attributes.
 
-    # - By law, a maximum of 4 passengers are allowed in standard NYC taxis. A child under 7 is allowed to sit on a
-    #     passenger's lap in the rear seat in addition to the passenger limit. Therefore, discard trips with more than 5
-    #     passengers. Also, discard trips with no passengers.
-    data.drop(data[(data["passenger_count"] > 5) | (data["passenger_count"] == 0)].index, inplace=True)
-    data["passenger_count"] = data["passenger_count"].astype("int64")
+    Every chunk is inserted within a single transaction. With `psql_copy_async`, it is an asyncpg transaction over the
+    connection of `session` (or over a connection of its own, if unset), so no SQLAlchemy connection is held meanwhile.
 
-    # - Discard trips with negative or nil distance.
-    data.drop(data[data["trip_distance"] <= 0].index, inplace=True)
+    Args:
+        data: Tabular data to be inserted (either a pandas DataFrame or an Arrow Table).
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        schema: PostgreSQL schema of the destination table.
+        table_name: PostgreSQL destination table.
+        dtypes: SQL type of each column/attribute in `data`.
+        chunk_size: Number of rows inserted at a time (initial one, if `mem_max` is set).
+        method: SQL insertion clause used (multi | psql_insert_copy | psql_copy_binary | psql_copy_async | None).
+        mem_max: Memory ceiling (resident set size of the process, in bytes) while adapting the chunk size. If 0, the
+            chunk size is fixed.
+        checkpoint: If set, SQL statement executed within the same transaction as the inserted tabular data (e.g.,
+            recording its row range, see `progress_insert()`), so both are committed together or not at all.
+        session: asyncpg connection (along with the event loop driving it) reused by `psql_copy_async` across calls
+            (see `pg_session_async()`).
 
-    # - Discard trips with a negligible duration (lower than 1 minute).
-    data.drop(data[data["dt"]/pd.Timedelta(minutes=1) < 1].index, inplace=True)
+    Raises:
+        ValueError: If provided `method` is unsupported.
+    """
+    metrics = metrics_begin("copy", table=table_name, method=method)
+    if method == "psql_copy_binary":
+        def insert(chunk: pd.DataFrame | pa.Table, conn: sa.engine.Connection, chunk_size: int) -> None:
+            psql_copy_binary(chunk, conn, f"{schema}.{table_name}", dtypes, chunk_size)
+    elif method == "psql_copy_async":
+        def insert(
+                chunk: pd.DataFrame | pa.Table,
+                conn: Tuple[asyncio.AbstractEventLoop, asyncpg.Connection],
+                chunk_size: int,
+        ) -> None:
+            loop, conn_async = conn
+            loop.run_until_complete(psql_copy_async(chunk, conn_async, schema, table_name, dtypes, chunk_size))
+    else:
+        if method == "psql_insert_copy":
+            method = psql_insert_copy
+        elif method == "None":
+            method = None
+        elif method == "multi":
+            pass
+        else:
+            raise ValueError(f"Invalid method ({method})")
 
-    # - Discard trips with a negative average speed (i.e., the trip distance or duration is negative).
-    data.drop(data[data["avg_speed"] < 0].index, inplace=True)
+        if isinstance(data, pa.Table):
+            data = data.to_pandas()
+        else:
+            pass
 
-    # - Discard trips from or to outside NYC with an average speed higher than 75 mph (max freeway speed limit in the
-    #     surrounding states).
-    data.drop(
-        data[
-            (data["avg_speed"] > 75)
-            & (
-                (data["PULocationID"] > 263)
-                | (data["DOLocationID"] > 263)
+        def insert(chunk: pd.DataFrame, conn: sa.engine.Connection, chunk_size: int) -> None:
+            chunk.to_sql(
+                name=table_name,
+                con=conn,
+                schema=schema,
+                if_exists="append",
+                index=False,
+                chunksize=chunk_size,
+                method=method,
+                dtype=dtypes,
             )
-        ].index,
-        inplace=True,
-    )
 
-    # - Discard trips within NYC with an average speed higher than 50 mph (max speed limit in NYC).
-    data.drop(
-        data[
-            (data["avg_speed"] > 50)
-            & (
-                (data["PULocationID"] < 264)
-                & (data["DOLocationID"] < 264)
+    if method == "psql_copy_async":
+        transaction = pg_transaction_async(engine.url, session)
+    else:
+        transaction = engine.begin()
+
+    with transaction as conn:
+        if mem_max > 0:
+            state = _chunk_sizes.setdefault(
+                ",".join(dtypes),
+                {
+                    "chunk_size": chunk_size,
+                    "step": chunk_size,
+                    "slow_start": True,
+                    "increased": False,
+                    "throughput": 0.,
+                    "mem_row": 0.,
+                },
             )
-        ].index,
-        inplace=True,
-    )
+            state["mem_max"] = mem_max
 
-    # - Discard trips taking more than 1 hour at an average speed lower than 3 mph, as it is assumed these slow trips
-    #     cannot even be associated with traffic jams, even in NYC.
-    data.drop(
-        data[
-            (data["dt"]/pd.Timedelta(hours=1) > 1)
-            & (data["avg_speed"] < 3)
-        ].index,
-        inplace=True,
-    )
+            chunk_sizes = []
+            start = 0
+            while start < len(data):
+                if isinstance(data, pa.Table):
+                    chunk = data.slice(start, state["chunk_size"])
+                else:
+                    chunk = data.iloc[start:start + state["chunk_size"]]
 
-    data[
-        [
-            "PULocationID",
-            "DOLocationID",
-            "RatecodeID",
-            "passenger_count",
-            "payment_type",
-            "VendorID",
-        ]
-    ] = data[
-        [
-            "PULocationID",
-            "DOLocationID",
-            "RatecodeID",
-            "passenger_count",
-            "payment_type",
-            "VendorID",
-        ]
-    ].astype("int32")
+                rss, tex = rss_current(), perf_counter()
+                insert(chunk, conn, len(chunk))
+                rows, nbytes = data_size(chunk)
+                chunk_sizes.append(rows)
+                chunk_size_adapt(state, rows, nbytes, perf_counter() - tex, rss_current() - rss)
+                start += rows
+
+            metrics["chunk_sizes"] = chunk_sizes
+            _logger.info(
+                f"Adaptive chunk size ({schema}.{table_name}): {len(chunk_sizes)} chunks of "
+                f"{min(chunk_sizes, default=0)}-{max(chunk_sizes, default=0)} rows, next chunk size "
+                f"{state['chunk_size']} rows ({state['mem_row']:.0f} bytes/row under {mem_max / 2**20:.0f} MiB)."
+            )
+        else:
+            insert(data, conn, chunk_size)
 
-    # Reset index after data processing.
-    data.reset_index(drop=True, inplace=True)
+        if checkpoint is None:
+            pass
+        elif method == "psql_copy_async":
+            loop, conn_async = conn
+            query = checkpoint.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+            loop.run_until_complete(conn_async.execute(str(query)))
+        else:
+            conn.execute(checkpoint)
 
-    _logger.info("Tabular data (NYC taxi) cleaned.")
+    metrics_end(metrics, data)
 
-    return data
+    return None
 
 
-def data_ingest(
-        data_trips: pd.DataFrame,
-        data_zones: pd.DataFrame,
-        pg_params: Dict[str, str],
-) -> None:
+def file_sha256(fname: str | bytes | PathLike, chunk_size: int = 2**20) -> str:
     """
-    Ingests NYC taxi tabular data into a PostgreSQL database.
+    Returns the SHA-256 hash (hexadecimal digest) of the content of a local file.
+
+    Args:
+        fname: Local path of the file to be hashed.
+        chunk_size: Chunk size used during file reading.
+
+    Returns:
+        SHA-256 hash (hexadecimal digest) of the content of the file.
+    """
+    sha256 = hashlib.sha256()
+    with open(fname, "rb") as file:
+        while data := file.read(chunk_size):
+            sha256.update(data)
+
+    return sha256.hexdigest()
+
+
+def file_link(src: Path, dst: Path) -> None:
+    """
+    Makes `dst` point to the content of `src` (hard link if possible, copy otherwise), replacing `dst` if it exists.
+
+    Args:
+        src: Local path of the source file.
+        dst: Local path of the destination file.
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+    return None
+
+
+def cache_index_read() -> Dict[str, Dict]:
+    """
+    Returns the index of the local download cache (an entry per cached url).
+
+    Returns:
+        Index of the local download cache.
+    """
+    fname_index = PATHS["data"]/PATH_CACHE_INDEX
+    if fname_index.exists():
+        with open(fname_index) as file:
+            return json.load(file)
+    else:
+        return {}
+
+
+def cache_index_write(index: Dict[str, Dict]) -> None:
+    """
+    Stores the index of the local download cache (atomically).
+
+    Args:
+        index: Index of the local download cache.
+    """
+    fname_index = PATHS["data"]/PATH_CACHE_INDEX
+    fname_index.parent.mkdir(parents=True, exist_ok=True)
+    with open(fname_index.with_suffix(".tmp"), "w") as file:
+        json.dump(index, file, indent=2)
+
+    fname_index.with_suffix(".tmp").replace(fname_index)
+
+    return None
+
+
+def cache_evict(index: Dict[str, Dict], max_bytes: int) -> Dict[str, Dict]:
+    """
+    Evicts the least recently used entries from the local download cache until it fits in `max_bytes`.
+
+    Args:
+        index: Index of the local download cache.
+        max_bytes: Maximum size (in bytes) of the content stored in the local download cache.
+
+    Returns:
+        Index of the local download cache after evicting the least recently used entries.
+    """
+    # Objects are content-addressed, so several urls may share the same object.
+    sizes = {entry["sha256"]: entry["size"] for entry in index.values()}
+    for url, entry in sorted(index.items(), key=lambda item: item[1]["accessed"]):
+        if sum(sizes.values()) <= max_bytes:
+            break
+        else:
+            pass
+
+        del index[url]
+        if all(entry_i["sha256"] != entry["sha256"] for entry_i in index.values()):
+            (PATHS["data"]/PATH_CACHE_OBJECTS/entry["sha256"]).unlink(missing_ok=True)
+            del sizes[entry["sha256"]]
+        else:
+            pass
+
+        _logger.info(f"Local download cache entry for {url} evicted ({entry['size']} bytes).")
+
+    return index
+
+
+def cache_lookup(url: str) -> Dict | None:
+    """
+    Returns the entry of the local download cache for the given url (if any).
+
+    Args:
+        url: Remote url of the cached file.
+
+    Returns:
+        Entry of the local download cache (ETag, Last-Modified, SHA-256, size, and last access time), if any.
+    """
+    with _cache_lock:
+        entry = cache_index_read().get(url)
+
+    if entry is not None and (PATHS["data"]/PATH_CACHE_OBJECTS/entry["sha256"]).exists():
+        return entry
+    else:
+        return None
+
+
+def cache_restore(url: str, entry: Dict, fname: Path) -> bool:
+    """
+    Restores a file from the local download cache, checking its content (SHA-256) beforehand.
+
+    The cached file may be evicted by another process at any time (e.g., since it was looked up, see `cache_lookup()`),
+    which is handled as a cache miss.
+
+    Args:
+        url: Remote url of the cached file.
+        entry: Entry of the local download cache for the given url.
+        fname: Local path where the cached file will be restored.
+
+    Returns:
+        Whether the file was restored (i.e., its cached content is still available and intact).
+    """
+    fname_object = PATHS["data"]/PATH_CACHE_OBJECTS/entry["sha256"]
+    try:
+        if file_sha256(fname_object) != entry["sha256"]:
+            _logger.warning(f"Local download cache entry for {url} is corrupted and will be downloaded again.")
+            fname_object.unlink(missing_ok=True)
+
+            return False
+        else:
+            pass
+
+        file_link(fname_object, fname)
+    except FileNotFoundError:
+        _logger.info(f"Local download cache entry for {url} was evicted meanwhile and will be downloaded again.")
+
+        return False
+
+    with _cache_lock:
+        index = cache_index_read()
+        if url in index:
+            index[url]["accessed"] = time()
+            cache_index_write(index)
+        else:
+            pass
+
+        _cache_stats["hits"] += 1
+        _cache_stats["bytes_saved"] += entry["size"]
+
+    _logger.info(
+        f"Local download cache hit for {url} ({entry['size']} bytes saved; {_cache_stats['hits']} hits and "
+        f"{_cache_stats['bytes_saved']} bytes saved so far)."
+    )
+
+    return True
+
+
+def cache_store(url: str, fname: Path, headers: Dict[str, str], max_bytes: int) -> None:
+    """
+    Stores a downloaded file in the local download cache, evicting the least recently used entries if required.
+
+    Args:
+        url: Remote url of the downloaded file.
+        fname: Local path of the downloaded file.
+        headers: HTTP response headers sent by the remote location (ETag and Last-Modified, if any).
+        max_bytes: Maximum size (in bytes) of the content stored in the local download cache.
+    """
+    sha256 = file_sha256(fname)
+    size = fname.stat().st_size
+
+    if size > max_bytes:
+        _logger.info(f"{url} not stored in local download cache ({size} bytes > {max_bytes} bytes).")
+
+        return None
+    else:
+        pass
+
+    fname_object = PATHS["data"]/PATH_CACHE_OBJECTS/sha256
+    fname_object.parent.mkdir(parents=True, exist_ok=True)
+
+    with _cache_lock:
+        if not fname_object.exists():
+            file_link(fname, fname_object)
+        else:
+            pass
+
+        index = cache_index_read()
+        index[url] = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "sha256": sha256,
+            "size": size,
+            "accessed": time(),
+        }
+        cache_index_write(cache_evict(index, max_bytes))
+
+    _logger.info(f"{url} stored in local download cache (SHA-256: {sha256}).")
+
+    return None
+
+
+def data_download_stream(
+        session: requests.Session,
+        url: str,
+        fname_part: Path,
+        start: int,
+        end: int | None,
+        chunk_size: int,
+        tee: BinaryIO | None = None,
+        validator: str | None = None,
+) -> int:
+    """
+    Downloads (a byte range of) tabular data from remote location, resuming a partial download if available.
+
+    Byte ranges are requested along with the validator (ETag or Last-Modified header) of the version of the file whose
+    partial download is resumed (`If-Range`), so the remote location replies with the whole file instead whenever it
+    has been modified since.
+
+    Args:
+        session: HTTP session used during data downloading.
+        url: Tabular data remote repository.
+        fname_part: Local path where the (partially) downloaded data is stored.
+        start: First byte of the byte range to be downloaded.
+        end: Last byte (inclusive) of the byte range to be downloaded. If None, the whole file is downloaded from
+            scratch in a single stream (i.e., the remote location does not support HTTP range requests).
+        chunk_size: Chunk size used during local storage.
+        tee: If set, downloaded data is written to it as well (e.g., a pipe read by a parser, see
+            `data_download_tee()`).
+        validator: If set, validator (see `download_validator()`) of the version of the file being downloaded.
+
+    Returns:
+        Number of bytes stored in `fname_part`.
+
+    Raises:
+        ConnectionError: If unable to download tabular data from remote location (e.g., it has been modified since the
+            partial download started).
+    """
+    if end is None:
+        done = 0
+        headers = {}
+    else:
+        done = fname_part.stat().st_size if fname_part.exists() else 0
+        if start + done == end + 1:
+            return done
+        elif start + done > end + 1:
+            # Left by a download of a different version of the file (i.e., other byte ranges).
+            _logger.warning(f"Partial download {fname_part.name} exceeds its byte range. Downloading it again...")
+            done = 0
+        else:
+            pass
+
+        headers = {"Range": f"bytes={start + done}-{end}"}
+        if validator is not None:
+            headers["If-Range"] = validator
+        else:
+            pass
+
+    response = session.get(url, headers=headers, stream=True)
+    response.raise_for_status()
+
+    if end is not None and response.status_code != requests.codes.partial_content:
+        # The remote file has been modified since, so its partial download is useless (the version of the remote file
+        # recorded along with it no longer matches, see `download_parts_check()`).
+        response.close()
+        fname_part.unlink(missing_ok=True)
+        raise ConnectionError(
+            f"Unable to download bytes {start + done}-{end} from {url} (status code {response.status_code}, the remote "
+            "file may have been modified)."
+        )
+    else:
+        pass
+
+    with open(fname_part, "ab" if done > 0 else "wb") as file:
+        for data in response.iter_content(chunk_size):
+            if data:
+                file.write(data)
+                if tee is not None:
+                    tee.write(data)
+                else:
+                    pass
+
+                done += len(data)
+            else:
+                pass
+
+    return done
+
+
+def download_validator(headers: Dict[str, str]) -> str | None:
+    """
+    Returns the validator identifying the version of a remote file, as allowed in `If-Range` request headers.
+
+    Args:
+        headers: Response headers of the remote location (e.g., of a HEAD request).
+
+    Returns:
+        Strong ETag, if any, or Last-Modified date, if any. Otherwise, None.
+    """
+    etag = headers.get("ETag")
+    if etag is not None and not etag.startswith("W/"):
+        return etag
+    else:
+        return headers.get("Last-Modified")
+
+
+def download_parts_discard(fname: Path) -> None:
+    """
+    Removes the partial files left by interrupted downloads of the given local path (either a single stream or byte
+    ranges), along with the version of the remote file they belong to.
+
+    Args:
+        fname: Local path where tabular data will be stored.
+    """
+    for fname_part in fname.parent.glob("*.part"):
+        if fname_part.name.startswith(f"{fname.name}."):
+            fname_part.unlink(missing_ok=True)
+        else:
+            pass
+
+    fname.with_name(f"{fname.name}.part.json").unlink(missing_ok=True)
+
+    return None
+
+
+def download_parts_check(fname: Path, version: Dict[str, Any]) -> None:
+    """
+    Keeps the partial files left by interrupted downloads of the given local path only if they belong to the given
+    version of the remote file (stored next to them, in `<fname>.part.json`), which is recorded otherwise.
+
+    Args:
+        fname: Local path where tabular data will be stored.
+        version: Version of the remote file (validator and size, see `download_validator()`).
+    """
+    fname_version = fname.with_name(f"{fname.name}.part.json")
+    try:
+        version_parts = json.loads(fname_version.read_text())
+    except (OSError, ValueError):
+        version_parts = None
+
+    # Without any validator, partial files are only tied to the size of the remote file.
+    if version_parts != version:
+        if any(fname_part.name.startswith(f"{fname.name}.") for fname_part in fname.parent.glob("*.part")):
+            _logger.warning(f"Partial downloads of {fname.name} belong to another version of it. Discarding them...")
+        else:
+            pass
+
+        download_parts_discard(fname)
+
+        fname_tmp = fname_version.with_suffix(".tmp")
+        fname_tmp.write_text(json.dumps(version))
+        fname_tmp.replace(fname_version)
+    else:
+        pass
+
+    return None
+
+
+def data_download(
+        url: str,
+        fname: str | bytes | PathLike,
+        chunk_size: int,
+        segments: int = 1,
+        cache_max_bytes: int = 0,
+) -> None:
+    """
+    Downloads tabular data (NYC taxi trips; PARQUET format) from remote location and store it locally.
+
+    If the remote location supports HTTP range requests, the file is split into `segments` byte ranges that are
+    downloaded in parallel (over a pool of connections), each of them into its own partial file. Otherwise, the file is
+    downloaded in a single stream into a partial file. Either way, partial files left by interrupted downloads are
+    resumed, and the downloaded file is only stored locally once its size matches the expected one. Partial files are
+    tied to the version of the remote file (ETag or Last-Modified header, and size) they belong to, so they are
+    discarded whenever it is modified (before or while they are resumed), or their size does not match the expected one.
+
+    If the local download cache is enabled and the url is already cached, the request is conditional (based on the
+    cached ETag and Last-Modified headers), and the cached copy is used if the remote location has not modified it.
+
+    Args:
+        url: Tabular data (NYC taxi trips; PARQUET format) remote repository.
+        fname: Local path where tabular data (NYC taxi trips) will be stored (PARQUET format).
+        chunk_size: Chunk size used during local storage.
+        segments: Number of byte ranges downloaded in parallel (if supported by the remote location).
+        cache_max_bytes: Maximum size (in bytes) of the local download cache (0 disables it).
+
+    Raises:
+        ConnectionError: If unable to download tabular data (NYC taxi trips) from remote location.
+    """
+    fname = PATHS["data"]/Path(fname).name
+    metrics = metrics_begin("download", fname=fname.name)
+
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=segments)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # Compressed transfers would not match the size (in bytes) and byte ranges announced by the remote location.
+        session.headers["Accept-Encoding"] = "identity"
+
+        entry = cache_lookup(url) if cache_max_bytes > 0 else None
+        headers = {}
+        if entry is not None and entry["etag"] is not None:
+            headers["If-None-Match"] = entry["etag"]
+        else:
+            pass
+
+        if entry is not None and entry["last_modified"] is not None:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        else:
+            pass
+
+        response = session.head(url, headers=headers, allow_redirects=True)
+        if response.status_code == requests.codes.not_modified and cache_restore(url, entry, fname):
+            metrics["bytes"] = fname.stat().st_size
+            metrics_end(metrics)
+            return None
+        elif response.status_code == requests.codes.not_modified:
+            response = session.head(url, allow_redirects=True)
+        else:
+            pass
+
+        response.raise_for_status()
+
+        if "Content-Length" in response.headers:
+            size = int(response.headers["Content-Length"])
+        else:
+            size = None
+
+        ranges = response.headers.get("Accept-Ranges", "none") == "bytes"
+        validator = download_validator(response.headers)
+        if ranges and size is not None:
+            download_parts_check(fname, {"validator": validator, "size": size})
+        else:
+            pass
+
+        if segments > 1 and ranges and size is not None:
+            bounds = np.linspace(0, size, segments + 1, dtype="int64")
+            fnames_part = [fname.with_name(f"{fname.name}.{i}-{segments}.part") for i in range(segments)]
+
+            with ThreadPoolExecutor(max_workers=segments) as executor:
+                futures = [
+                    executor.submit(
+                        data_download_stream,
+                        session,
+                        url,
+                        fnames_part[i],
+                        int(bounds[i]),
+                        int(bounds[i + 1]) - 1,
+                        chunk_size,
+                        validator=validator,
+                    )
+                    for i in range(segments)
+                ]
+                downloaded = sum(future.result() for future in futures)
+
+            if downloaded != size:
+                # Otherwise, every later download would resume them (and fail) again.
+                download_parts_discard(fname)
+                raise ConnectionError(f"Unable to download {url} ({downloaded} out of {size} bytes downloaded).")
+            else:
+                pass
+
+            # Byte ranges are merged into a new file, as `fname` may be (hard) linked to the local download cache.
+            with open(fname.with_name(f"{fname.name}.part"), "wb") as file:
+                for fname_part in fnames_part:
+                    with open(fname_part, "rb") as file_part:
+                        shutil.copyfileobj(file_part, file)
+
+                    fname_part.unlink()
+
+            fname.with_name(f"{fname.name}.part").replace(fname)
+        else:
+            fname_part = fname.with_name(f"{fname.name}.part")
+            if ranges and size is not None:
+                downloaded = data_download_stream(
+                    session, url, fname_part, 0, size - 1, chunk_size, validator=validator
+                )
+            else:
+                downloaded = data_download_stream(session, url, fname_part, 0, None, chunk_size)
+
+            if size is not None and downloaded != size:
+                # Otherwise, every later download would resume it (and fail) again.
+                download_parts_discard(fname)
+                raise ConnectionError(f"Unable to download {url} ({downloaded} out of {size} bytes downloaded).")
+            else:
+                pass
+
+            fname_part.replace(fname)
+
+        fname.with_name(f"{fname.name}.part.json").unlink(missing_ok=True)
+
+    _logger.info(f"NYC taxi tabular data downloaded from {url} and saved locally in {fname}.")
+
+    if cache_max_bytes > 0:
+        cache_store(url, fname, response.headers, cache_max_bytes)
+    else:
+        pass
+
+    metrics["bytes"] = fname.stat().st_size
+    metrics_end(metrics)
+
+    return None
+
+
+def data_format(fname: str | bytes | PathLike) -> Literal["parquet", "csv"]:
+    """
+    Returns the format of the given tabular data, based on its file extension(s).
+
+    Args:
+        fname: Local path (or url) of tabular data (PARQUET | CSV | CSV.GZ format).
+
+    Returns:
+        Format of the given tabular data (gzipped CSV files are decompressed on the fly while read).
+
+    Raises:
+        ValueError: If provided `fname` is not stored in a supported format (PARQUET | CSV | CSV.GZ).
+    """
+    suffixes = Path(fname).suffixes
+    if suffixes[-1:] == [".parquet"]:
+        return "parquet"
+    elif suffixes[-1:] == [".csv"] or suffixes[-2:] == [".csv", ".gz"]:
+        return "csv"
+    else:
+        raise ValueError(
+            f"Invalid file extension ({''.join(suffixes)}). Supported extensions: PARQUET | CSV | CSV.GZ."
+        )
+
+
+def csv_schema(fname: Path) -> pa.Schema:
+    """
+    Returns the schema of the given local tabular data (CSV | CSV.GZ format), as inferred from its first block.
+
+    The inferred schema is saved in a sidecar file next to it (`<fname>.schema.json`), so later reads skip type
+    inference (unless the CSV file is newer than its sidecar file, e.g., it has been downloaded again). Either way,
+    columns/attributes only including missing values in the first block are given a dtype (see `csv_schema_resolve()`).
+
+    Args:
+        fname: Local path where tabular data is stored (CSV | CSV.GZ format).
+
+    Returns:
+        Schema of the given local tabular data.
+    """
+    fname_schema = fname.with_name(f"{fname.name}.schema.json")
+    if fname_schema.exists() and fname_schema.stat().st_mtime >= fname.stat().st_mtime:
+        try:
+            columns = json.loads(fname_schema.read_text())["columns"]
+            # Sidecar files saved by earlier versions may include null dtypes.
+            return csv_schema_resolve(
+                pa.schema([pa.field(name, pa.type_for_alias(dtype)) for name, dtype in columns.items()])
+            )
+        except (ValueError, KeyError):
+            _logger.warning(f"Invalid CSV schema sidecar file ({fname_schema.name}). Inferring schema again...")
+    else:
+        pass
+
+    reader = pacsv.open_csv(fname, read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE))
+    schema = csv_schema_resolve(reader.schema)
+    reader.close()
+
+    csv_schema_write(fname, schema)
+
+    return schema
+
+
+def csv_schema_resolve(schema: pa.Schema) -> pa.Schema:
+    """
+    Returns the given schema inferred from tabular data (CSV | CSV.GZ format) with a dtype for every column/attribute
+    only including missing values in the first block (null dtype): the one it is read into (see
+    TABLE_TRIPS_READ_DTYPES), or string if it is not read.
+
+    The streaming CSV reader fixes its schema after the first block, so a column/attribute read with a null dtype fails
+    to be converted as soon as any later block includes a value (e.g., `airport_fee` in older months).
+
+    Args:
+        schema: Schema inferred from the first block of tabular data (CSV | CSV.GZ format).
+
+    Returns:
+        Schema of tabular data without null dtypes.
+    """
+    return pa.schema([
+        pa.field(field.name, TABLE_TRIPS_READ_DTYPES.get(field.name) or pa.string())
+        if pa.types.is_null(field.type) else field
+        for field in schema
+    ])
+
+
+def csv_schema_write(fname: Path, schema: pa.Schema) -> None:
+    """
+    Saves the schema inferred from the given local tabular data (CSV | CSV.GZ format) in its sidecar file (see
+    `csv_schema()`).
+
+    Args:
+        fname: Local path where tabular data is stored (CSV | CSV.GZ format).
+        schema: Schema inferred from the first block of the given local tabular data (null dtypes are never saved, see
+            `csv_schema_resolve()`).
+    """
+    fname_schema = fname.with_name(f"{fname.name}.schema.json")
+    fname_tmp = fname_schema.with_suffix(".tmp")
+    columns = {field.name: str(field.type) for field in csv_schema_resolve(schema)}
+    fname_tmp.write_text(json.dumps({"columns": columns}))
+    fname_tmp.replace(fname_schema)
+    _logger.info(f"CSV schema inferred from {fname} and saved in {fname_schema.name}.")
+
+    return None
+
+
+def csv_open(fname: Path, schema: pa.Schema) -> pacsv.CSVStreamingReader:
+    """
+    Opens the given local tabular data (CSV | CSV.GZ format) to be streamed in blocks (record batches), parsed and
+    converted by multiple threads.
+
+    Args:
+        fname: Local path where tabular data is stored (CSV | CSV.GZ format).
+        schema: Columns/attributes to be read, along with their dtypes (so no type is inferred, see
+            `csv_schema_resolve()`).
+
+    Returns:
+        Reader yielding tabular data one block (record batch) at a time.
+    """
+    return pacsv.open_csv(
+        fname,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=schema.names,
+            # The schema is fixed after the first block, so every column/attribute is given its dtype beforehand.
+            column_types={field.name: field.type for field in schema},
+        ),
+    )
+
+
+def data_download_tee(
+        url: str,
+        fname: str | bytes | PathLike,
+        chunk_size: int,
+        cache_max_bytes: int = 0,
+) -> pa.RecordBatchReader:
+    """
+    Downloads tabular data (NYC taxi trips; CSV | CSV.GZ format) from remote location and store it locally, while it is
+    parsed (tee).
+
+    Downloaded data is written both to a partial file and to a pipe, from which it is parsed by multiple threads as it
+    arrives (decompressed on the fly if gzipped). Therefore, reading (and cleaning) tabular data starts before the
+    download ends, instead of once the local copy is read from scratch. The file is downloaded from scratch in a single
+    stream, and it is only stored locally (along with its schema, see `csv_schema()`, and in the local download cache,
+    if enabled) once every block has been parsed. Otherwise, the partial file is left to be resumed by
+    `data_download()`.
+
+    Args:
+        url: Tabular data (NYC taxi trips; CSV | CSV.GZ format) remote repository.
+        fname: Local path where tabular data (NYC taxi trips) will be stored (CSV | CSV.GZ format).
+        chunk_size: Chunk size used during local storage.
+        cache_max_bytes: Maximum size (in bytes) of the local download cache (0 disables it).
+
+    Returns:
+        Reader yielding tabular data one block (record batch) at a time, as it is downloaded. Its schema is inferred
+        from the first block, except for the columns/attributes in TABLE_TRIPS_READ_DTYPES (read into their dtypes).
+
+    Raises:
+        ConnectionError: If unable to download tabular data (NYC taxi trips) from remote location.
+    """
+    fname = PATHS["data"]/Path(fname).name
+    fname_part = fname.with_name(f"{fname.name}.part")
+    metrics = metrics_begin("download", fname=fname.name, tee=True)
+
+    session = requests.Session()
+    # Compressed transfers would not match the size (in bytes) announced by the remote location.
+    session.headers["Accept-Encoding"] = "identity"
+    response = session.head(url, allow_redirects=True)
+    response.raise_for_status()
+
+    if "Content-Length" in response.headers:
+        size = int(response.headers["Content-Length"])
+        # Its partial file is downloaded from scratch, but it may be resumed by `data_download()` later on.
+        download_parts_check(fname, {"validator": download_validator(response.headers), "size": size})
+    else:
+        size = None
+
+    fd_read, fd_write = pipe()
+
+    def download() -> int:
+        with open(fd_write, "wb") as tee:
+            return data_download_stream(session, url, fname_part, 0, None, chunk_size, tee=tee)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(download)
+    executor.shutdown(wait=False)
+
+    file_read = open(fd_read, "rb")
+    stream = pa.PythonFile(file_read, mode="r")
+    if Path(fname).suffix == ".gz":
+        stream = pa.CompressedInputStream(stream, "gzip")
+    else:
+        pass
+
+    def abort(error: BaseException) -> None:
+        # Closing the pipe stops the download (if still running). Its own failure (e.g., a connection reset), if any, is
+        # reported instead of the one it triggered while parsing (e.g., a truncated row).
+        stream.close()
+        file_read.close()
+        error_download = future.exception()
+        session.close()
+        if error_download is not None and not isinstance(error_download, BrokenPipeError):
+            raise error_download from None
+        else:
+            raise error
+
+    try:
+        reader = pacsv.open_csv(
+            stream,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+            # The schema is fixed after the first block, so columns/attributes which may only include missing values in
+            # it are given their dtype beforehand (as in `csv_open()`).
+            convert_options=pacsv.ConvertOptions(
+                column_types={**TABLE_TRIPS_READ_DTYPES, "store_and_fwd_flag": pa.string()},
+            ),
+        )
+    except BaseException as error:
+        abort(error)
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        try:
+            yield from reader
+        except BaseException as error:
+            abort(error)
+
+        stream.close()
+        file_read.close()
+        session.close()
+        downloaded = future.result()
+        if size is not None and downloaded != size:
+            raise ConnectionError(f"Unable to download {url} ({downloaded} out of {size} bytes downloaded).")
+        else:
+            pass
+
+        fname_part.replace(fname)
+        fname.with_name(f"{fname.name}.part.json").unlink(missing_ok=True)
+        csv_schema_write(fname, reader.schema)
+        _logger.info(f"NYC taxi tabular data downloaded (and parsed) from {url} and saved locally in {fname}.")
+
+        if cache_max_bytes > 0:
+            cache_store(url, fname, response.headers, cache_max_bytes)
+        else:
+            pass
+
+        metrics["bytes"] = downloaded
+        metrics_end(metrics)
+
+    return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
+
+def data_read_schema(
+        fname: Path,
+        columns: Dict[str, pa.DataType | None] | None = None,
+        reader: pa.RecordBatchReader | None = None,
+) -> pa.Schema:
+    """
+    Returns the schema of the given local tabular data (PARQUET | CSV | CSV.GZ format) restricted to the given
+    columns/attributes, which are to be read into the given dtypes.
+
+    Args:
+        fname: Local path where tabular data is stored (PARQUET | CSV | CSV.GZ format).
+        columns: If set, columns/attributes to be read, along with the dtype each one is to be read into (None keeps
+            the stored or inferred one). Those missing in the local tabular data are ignored.
+        reader: If set, tabular data is read from it instead of the local path (see `data_download_tee()`).
+
+    Returns:
+        Schema of the tabular data to be read (following the column/attribute order of the local tabular data).
+    """
+    if reader is not None:
+        schema = reader.schema
+    elif data_format(fname) == "parquet":
+        schema = pq.read_schema(fname, memory_map=True)
+    else:
+        schema = csv_schema(fname)
+
+    if columns is None:
+        return schema
+    else:
+        return pa.schema(
+            [pa.field(field.name, columns[field.name] or field.type) for field in schema if field.name in columns]
+        )
+
+
+def data_read_stream(
+        fname: Path,
+        schema: pa.Schema,
+        chunk_size: int | None,
+        filters: List[Tuple[str, str, Any]] | None,
+        reader: pa.RecordBatchReader | None = None,
+) -> Iterator[pa.Table]:
+    """
+    Yields tabular data read in batches from given local path (PARQUET | CSV | CSV.GZ format), casted to the given
+    schema and filtered on the fly.
+
+    PARQUET files are read one row group at a time (split into batches of up to `chunk_size` rows), but not
+    memory-mapped: every page mapped would be kept in the resident set size until the whole file is read. CSV files are
+    streamed one block at a time (see `csv_open()`), and blocks are split into batches of up to `chunk_size` rows.
+
+    Args:
+        fname: Local path where tabular data is stored (PARQUET | CSV | CSV.GZ format).
+        schema: Columns/attributes to be read, along with their dtypes (see `data_read_schema()`).
+        chunk_size: If set, maximum number of rows per batch.
+        filters: If set, filters (column/attribute, operator, value) all rows read meet (see `pyarrow.parquet`).
+        reader: If set, tabular data is read from it instead of the local path (see `data_download_tee()`).
+
+    Yields:
+        Tabular data batches read from given local path.
+    """
+    if reader is not None:
+        batches = reader
+    elif data_format(fname) == "parquet":
+        batches = pq.ParquetFile(fname).iter_batches(batch_size=chunk_size or 2**16, columns=schema.names)
+    else:
+        batches = csv_open(fname, schema)
+
+    for batch in batches:
+        data = pa.Table.from_batches([batch]).select(schema.names).cast(schema)
+        if filters is not None:
+            data = data.filter(pq.filters_to_expression(filters))
+        else:
+            pass
+
+        if chunk_size is not None:
+            for start in range(0, data.num_rows, chunk_size):
+                yield data.slice(start, chunk_size)
+        else:
+            yield data
+
+
+def data_read_report(fname: Path, data: pd.DataFrame | pa.Table, metrics: Dict[str, Any]) -> None:
+    """
+    Reports the memory saved by reading only the required columns/attributes and rows of the given local tabular data
+    (PARQUET format) into compact dtypes, against reading it whole into its stored dtypes.
+
+    Args:
+        fname: Local path where tabular data is stored (PARQUET format).
+        data: Tabular data read from given local path.
+        metrics: Metrics of the read stage, where the size of the whole tabular data is recorded (`bytes_full`).
+    """
+    # Size (in bytes, excluding Python objects referenced by pandas columns) of the whole DataFrame.
+    metadata = pq.read_metadata(fname, memory_map=True)
+    metrics["bytes_full"] = metadata.num_rows * sum(
+        np.dtype(field.type.to_pandas_dtype()).itemsize for field in metadata.schema.to_arrow_schema()
+    )
+
+    rows, nbytes = data_size(data)
+    saved = metrics["bytes_full"] - nbytes
+    _logger.info(
+        f"{rows} out of {metadata.num_rows} rows and {data.shape[1]} out of {metadata.num_columns} columns read from "
+        f"{fname} into {nbytes / 2**20:.1f} MiB ({saved / 2**20:.1f} MiB saved, "
+        f"{saved / max(metrics['bytes_full'], 1):.0%})."
+    )
+
+    return None
+
+
+def data_read(
+        fname: str | bytes | PathLike,
+        columns: Dict[str, pa.DataType | None] | None = None,
+        filters: List[Tuple[str, str, Any]] | None = None,
+        reader: pa.RecordBatchReader | None = None,
+) -> pd.DataFrame:
+    """
+    Returns NYC taxi tabular data read from given local path (PARQUET | CSV | CSV.GZ format).
+
+    PARQUET files are memory-mapped, so column chunks are decoded straight from the page cache instead of being copied
+    into freshly allocated buffers first. If set, the column/attribute projection, their dtypes, and the filters are
+    pushed into the PARQUET scan, so unneeded columns/attributes, row groups, and rows are never fully loaded into
+    memory. CSV files are streamed (see
+    `data_read_stream()`) and each block is casted and filtered as it is read. Otherwise, CSV files (e.g., small lookup
+    tables such as NYC taxi zones) are read by pandas as usual.
+
+    Args:
+        fname: Local path where NYC taxi tabular data is stored (PARQUET | CSV | CSV.GZ format).
+        columns: If set, columns/attributes to be read, along with the dtype each one is read into (None keeps the
+            stored one). Those missing in the local tabular data are ignored (see TABLE_TRIPS_READ_DTYPES).
+        filters: If set, filters (column/attribute, operator, value) all rows read meet (see `pyarrow.parquet`).
+        reader: If set, tabular data (CSV | CSV.GZ format) is read from it while it is downloaded to the given local
+            path, instead of once it has been stored there (see `data_download_tee()`).
+
+    Returns:
+        NYC taxi tabular data read from given local path.
+
+    Raises:
+        ValueError: If provided `fname` is not stored in a supported format (PARQUET | CSV | CSV.GZ).
+    """
+    fname_local = PATHS["data"]/Path(fname).name
+
+    metrics = metrics_begin("read", fname=Path(fname).name)
+    if data_format(fname) == "parquet":
+        if columns is not None:
+            schema = data_read_schema(fname_local, columns)
+            data = pq.read_table(fname_local, columns=schema.names, schema=schema, filters=filters, memory_map=True)
+        else:
+            data = pq.read_table(fname_local, filters=filters, memory_map=True)
+
+        # Arrow buffers are released as soon as they are converted, so both are not kept in memory at the same time.
+        data = data.to_pandas(split_blocks=True, self_destruct=True)
+
+        if columns is not None or filters is not None:
+            data_read_report(fname_local, data, metrics)
+        else:
+            pass
+    elif columns is None and filters is None and reader is None:
+        data = pd.read_csv(fname_local)
+    else:
+        schema = data_read_schema(fname_local, columns, reader)
+        data = pa.concat_tables([schema.empty_table(), *data_read_stream(fname_local, schema, None, filters, reader)])
+        data = data.to_pandas(split_blocks=True, self_destruct=True)
+
+    metrics_end(metrics, data)
+    _logger.info(f"NYC taxi tabular data read from {fname_local}")
+
+    return data
+
+
+def data_read_arrow(
+        fname: str | bytes | PathLike,
+        columns: Dict[str, pa.DataType | None] | None = None,
+        filters: List[Tuple[str, str, Any]] | None = None,
+        reader: pa.RecordBatchReader | None = None,
+) -> pa.Table:
+    """
+    Returns NYC taxi tabular data read from given local path (PARQUET | CSV | CSV.GZ format) as an Arrow Table.
+
+    If set, the column/attribute projection, their dtypes, and the filters are pushed into the scan (see `data_read()`).
+
+    Args:
+        fname: Local path where NYC taxi tabular data is stored (PARQUET | CSV | CSV.GZ format).
+        columns: If set, columns/attributes to be read, along with the dtype each one is read into (None keeps the
+            stored one). Those missing in the local tabular data are ignored (see TABLE_TRIPS_READ_DTYPES).
+        filters: If set, filters (column/attribute, operator, value) all rows read meet (see `pyarrow.parquet`).
+        reader: If set, tabular data (CSV | CSV.GZ format) is read from it while it is downloaded to the given local
+            path, instead of once it has been stored there (see `data_download_tee()`).
+
+    Returns:
+        NYC taxi tabular data read from given local path.
+
+    Raises:
+        ValueError: If provided `fname` is not stored in a supported format (PARQUET | CSV | CSV.GZ).
+    """
+    fname_local = PATHS["data"]/Path(fname).name
+
+    metrics = metrics_begin("read", fname=Path(fname).name)
+    if data_format(fname) == "parquet":
+        if columns is not None:
+            schema = data_read_schema(fname_local, columns)
+            data = pq.read_table(fname_local, columns=schema.names, schema=schema, filters=filters, memory_map=True)
+        else:
+            data = pq.read_table(fname_local, filters=filters, memory_map=True)
+
+        if columns is not None or filters is not None:
+            data_read_report(fname_local, data, metrics)
+        else:
+            pass
+    else:
+        schema = data_read_schema(fname_local, columns, reader)
+        data = pa.concat_tables([schema.empty_table(), *data_read_stream(fname_local, schema, None, filters, reader)])
+
+    metrics_end(metrics, data)
+    _logger.info(f"NYC taxi tabular data read from {fname_local}")
+
+    return data
+
+
+def data_read_batches(
+        fname: str | bytes | PathLike,
+        chunk_size: int,
+        engine: Literal["pandas", "arrow"] = "pandas",
+        columns: Dict[str, pa.DataType | None] | None = None,
+        filters: List[Tuple[str, str, Any]] | None = None,
+        reader: pa.RecordBatchReader | None = None,
+) -> Iterator[pd.DataFrame | pa.Table]:
+    """
+    Yields NYC taxi tabular data read in batches from given local path (PARQUET | CSV | CSV.GZ format).
+
+    Tabular data is streamed (see `data_read_stream()`), so only a single row group (PARQUET) or block (CSV) is kept in
+    memory at any given time. If set, only the selected columns/attributes are read (into their dtypes), and each batch
+    is filtered before being converted to pandas (if needed).
+
+    Args:
+        fname: Local path where NYC taxi tabular data is stored (PARQUET | CSV | CSV.GZ format).
+        chunk_size: Maximum number of rows per batch.
+        engine: Tabular data engine (pandas | arrow) used to represent each batch (DataFrame | Table).
+        columns: If set, columns/attributes to be read, along with the dtype each one is read into (None keeps the
+            stored one). Those missing in the local tabular data are ignored (see TABLE_TRIPS_READ_DTYPES).
+        filters: If set, filters (column/attribute, operator, value) all rows read meet (see `pyarrow.parquet`).
+        reader: If set, tabular data (CSV | CSV.GZ format) is read from it while it is downloaded to the given local
+            path, instead of once it has been stored there (see `data_download_tee()`).
+
+    Yields:
+        NYC taxi tabular data batches read from given local path.
+
+    Raises:
+        ValueError: If provided `fname` is not stored in a supported format (PARQUET | CSV | CSV.GZ).
+    """
+    fname_local = PATHS["data"]/Path(fname).name
+
+    batches = data_read_stream(fname_local, data_read_schema(fname_local, columns, reader), chunk_size, filters, reader)
+    if engine != "arrow":
+        batches = (batch.to_pandas(split_blocks=True) for batch in batches)
+    else:
+        pass
+
+    _logger.info(f"NYC taxi tabular data opened for batch reading from {fname_local}")
+
+    for i, batch in enumerate(metrics_batches("read", batches, fname=Path(fname).name)):
+        _logger.debug(f"Batch #{i} ({len(batch)} rows) read from {fname_local}")
+        yield batch
+
+
+def data_clean_batches(
+        batches: Iterable[pd.DataFrame | pa.Table],
+        dates: Tuple[datetime, datetime],
+) -> Iterator[pd.DataFrame | pa.Table]:
+    """
+    Yields cleaned tabular data (NYC taxi trips), one batch at a time.
+
+    Every cleaning rule applied by `data_clean()` is evaluated row by row (including the time period boundaries defined
+    by `dates`), so cleaning each batch independently yields the same rows as cleaning the whole tabular data at once.
+
+    Args:
+        batches: Tabular data (NYC taxi trips) batches to be cleaned (either pandas DataFrames or Arrow Tables).
+        dates: time period boundaries for the tabular data (NYC taxi trips) recorded.
+
+    Yields:
+        Cleaned tabular data (NYC taxi trips) batches.
+    """
+    for batch in batches:
+        if isinstance(batch, pa.Table):
+            yield data_clean_arrow(batch, dates)
+        else:
+            yield data_clean(batch, dates)
+
+
+def clean_rules_evaluate(
+        columns: Dict[str, pd.Series | pa.ChunkedArray],
+        dates: Tuple[Any, Any],
+        engine: Literal["pandas", "arrow"],
+) -> np.ndarray | pa.ChunkedArray:
+    """
+    Returns whether each NYC taxi trip is bad data according to any of the enabled rules (see CLEAN_RULES).
+
+    Every enabled rule is evaluated on its own, recording (see `clean_report()`) the number of trips it rejects, the
+    elapsed real (wall clock) time it takes, and the memory it allocates: peak memory traced by `tracemalloc` (pandas)
+    or memory retained from the Arrow memory pool (arrow). Note that rules may overlap, and memory is measured process
+    wide (i.e., it includes any allocation made concurrently by other threads).
+
+    Args:
+        columns: Columns/attributes of NYC taxi trips tabular data (including `dt` and `avg_speed`).
+        dates: time period boundaries for the tabular data (NYC taxi trips) recorded, comparable with `columns`.
+        engine: Tabular data engine (pandas | arrow) used to represent `columns` (Series | ChunkedArray).
+
+    Returns:
+        Whether each NYC taxi trip is bad data, as a NumPy array (or as a ChunkedArray without nulls for arrow, unless
+        every rule is disabled).
+    """
+    n_rows = len(columns["tpep_pickup_datetime"])
+
+    tracing = tracemalloc.is_tracing()
+    if engine == "pandas" and not tracing:
+        tracemalloc.start()
+    else:
+        pass
+
+    rejected = None
+    try:
+        for name, rule in CLEAN_RULES.items():
+            if not (rule["enabled"] or rule["required"]):
+                continue
+            else:
+                pass
+
+            if engine == "arrow":
+                mem_start = pa.total_allocated_bytes()
+            else:
+                tracemalloc.reset_peak()
+                mem_start = tracemalloc.get_traced_memory()[0]
+
+            start = perf_counter()
+            rejected_rule = rule[engine](columns, dates)
+            tex = perf_counter() - start
+
+            if engine == "arrow":
+                mem = pa.total_allocated_bytes() - mem_start
+                rows = pc.sum(rejected_rule).as_py() or 0
+                rejected = rejected_rule if rejected is None else pc.or_kleene(rejected, rejected_rule)
+            else:
+                mem = tracemalloc.get_traced_memory()[1] - mem_start
+                rejected_rule = rejected_rule.to_numpy()
+                rows = int(rejected_rule.sum())
+                rejected = rejected_rule if rejected is None else rejected | rejected_rule
+
+            stats = _clean_report["rules"][name]
+            stats["rows_rejected"] += rows
+            stats["tex"] += tex
+            stats["mem"] = max(stats["mem"], mem)
+    finally:
+        if engine == "pandas" and not tracing:
+            tracemalloc.stop()
+        else:
+            pass
+
+    if rejected is None:
+        rejected = np.zeros(n_rows, dtype=bool)
+        rows_rejected = 0
+    elif engine == "arrow":
+        rejected = pc.fill_null(rejected, False)
+        rows_rejected = pc.sum(rejected).as_py() or 0
+    else:
+        rows_rejected = int(rejected.sum())
+
+    _clean_report["rows"] += n_rows
+    _clean_report["rows_rejected"] += rows_rejected
+
+    return rejected
+
+
+def clean_report() -> Dict[str, Any]:
+    """
+    Returns a report of the rules identifying bad NYC taxi trips (see CLEAN_RULES) evaluated so far.
+
+    Returns:
+        Number of trips evaluated and rejected and, per rule, its description, whether it is enabled (and required),
+        the number of trips it rejected, its elapsed real (wall clock) time (in seconds), and its memory allocated (in
+        bytes).
+    """
+    return {
+        "rules_version": CLEAN_RULES_VERSION,
+        "rows": _clean_report["rows"],
+        "rows_rejected": _clean_report["rows_rejected"],
+        "rules": {
+            name: {
+                "description": rule["description"],
+                "enabled": rule["enabled"] or rule["required"],
+                "required": rule["required"],
+                **_clean_report["rules"][name],
+            }
+            for name, rule in CLEAN_RULES.items()
+        },
+    }
+
+
+def clean_report_write(fname: str | bytes | PathLike) -> None:
+    """
+    Writes a report of the rules identifying bad NYC taxi trips evaluated so far (see `clean_report()`).
+
+    Args:
+        fname: Local path where the report is to-be-written (JSON format).
+    """
+    report = clean_report()
+    with open(fname, "w") as f:
+        json.dump(report, f, indent=4)
+
+    for name, stats in report["rules"].items():
+        if stats["enabled"]:
+            _logger.info(
+                f"Cleaning rule {name}: {stats['rows_rejected']} rows rejected in {stats['tex']:.3f} s "
+                f"({stats['mem'] / 2**20:.1f} MiB)."
+            )
+        else:
+            _logger.info(f"Cleaning rule {name}: disabled.")
+
+    _logger.info(f"Cleaning rules report written to {fname}.")
+
+    return None
+
+
+def data_clean(data: pd.DataFrame, dates: Tuple[datetime, datetime]) -> pd.DataFrame:
+    """
+    Return cleaned tabular data (NYC taxi trips).
+
+    Every rule identifying bad data is evaluated once on the original columns/attributes, and all of them are combined
+    into a single mask. Then, tabular data is filtered once and columns/attributes are casted to their final dtypes
+    (INTEGER as int32, and REAL as float32). `avg_speed` is computed in float64 beforehand (see
+    TABLE_TRIPS_READ_DTYPES), so rules comparing it with the speed limits are not affected by compact dtypes. Optional
+    columns/attributes missing in older months (see TABLE_TRIPS_OPTIONAL) are added as missing values.
+
+    Args:
+        data: Tabular data (NYC taxi trips) to be cleaned.
+        dates: time period boundaries for the tabular data (NYC taxi trips) recorded.
+    """
+    metrics = metrics_begin("clean", engine="pandas")
+
+    # Check number of unique values per column/attribute and identify potential categorical values.
+    if _logger.isEnabledFor(logging.DEBUG):
+        for column in data.columns:
+            if data[column].nunique() < 10:
+                _logger.debug(
+                    f"Column {column} includes {data[column].nunique()} unique values ({data[column].unique()})."
+                )
+            else:
+                _logger.debug(f"Column {column} includes {data[column].nunique()} unique values.")
+    else:
+        pass
+
+    # Discard `store_and_fwd_flag` details because of its lack of relevance (i.e., it is not selected below).
+    columns = {column: data[column] for column in data.columns if column != "store_and_fwd_flag"}
+
+    # Originally stored as 'airport_fee', later on as 'Airport_fee'.
+    if "Airport_fee" in columns:
+        columns["airport_fee"] = columns.pop("Airport_fee")
+    else:
+        pass
+
+    for column in TABLE_TRIPS_OPTIONAL:
+        if column not in columns:
+            columns[column] = pd.Series(np.nan, index=data.index, dtype="float32")
+        else:
+            pass
+
+    pickup = columns["tpep_pickup_datetime"]
+    dropoff = columns["tpep_dropoff_datetime"]
+
+    # Compute delta time (time elapsed between pickup and dropoff).
+    columns["dt"] = dropoff - pickup
+
+    columns["avg_speed"] = (
+        columns["trip_distance"].astype("float64")
+        / (columns["dt"]/pd.Timedelta(hours=1))
+    )
+
+    # Discard trips considered bad data (see CLEAN_RULES).
+    rejected = clean_rules_evaluate(columns, dates, "pandas")
+
+    # Reorder columns/attributes based on its relevance and filter out bad data (resetting the index).
+    kept = ~rejected
+    data = pd.DataFrame({column: columns[column].to_numpy()[kept] for column in TABLE_TRIPS_DTYPES})
+
+    # REAL columns/attributes are only narrowed down once every rule has been evaluated (in full precision).
+    data = data.astype(
+        {
+            "PULocationID": "int32",
+            "DOLocationID": "int32",
+            "RatecodeID": "int32",
+            "passenger_count": "int32",
+            "payment_type": "int32",
+            "VendorID": "int32",
+            **{column: "float32" for column, dtype in TABLE_TRIPS_DTYPES.items() if dtype is sa.types.REAL},
+        }
+    )
+
+    metrics_end(metrics, data)
+    _logger.info("Tabular data (NYC taxi) cleaned.")
+
+    return data
+
+
+def data_clean_arrow(data: pa.Table, dates: Tuple[datetime, datetime]) -> pa.Table:
+    """
+    Return cleaned tabular data (NYC taxi trips), computed with Arrow compute functions (i.e., without pandas).
+
+    It applies the very same rules as `data_clean()` (see CLEAN_RULES). Note that Arrow comparisons involving nulls
+    return nulls, which are considered as not matching a rule (consistently with NaN/NaT comparisons in pandas).
+
+    Args:
+        data: Tabular data (NYC taxi trips) to be cleaned.
+        dates: time period boundaries for the tabular data (NYC taxi trips) recorded.
+    """
+    metrics = metrics_begin("clean", engine="arrow")
+
+    # Originally stored as 'airport_fee', later on as 'Airport_fee'.
+    if "Airport_fee" in data.column_names:
+        data = data.rename_columns(["airport_fee" if c == "Airport_fee" else c for c in data.column_names])
+    else:
+        pass
+
+    for column in TABLE_TRIPS_OPTIONAL:
+        if column not in data.column_names:
+            data = data.append_column(column, pa.nulls(data.num_rows, pa.float32()))
+        else:
+            pass
+
+    pickup = data["tpep_pickup_datetime"]
+    dropoff = data["tpep_dropoff_datetime"]
+    date_start = pa.scalar(dates[0], type=pickup.type)
+    date_end = pa.scalar(dates[1], type=pickup.type)
+
+    # Compute delta time (time elapsed between pickup and dropoff), in the resolution of pickup and dropoff datetimes.
+    dt = pc.subtract(dropoff, pickup)
+    dt_hours = pc.divide(pc.cast(dt, pa.int64()), float(UNITS_PER_HOUR[dt.type.unit]))
+    avg_speed = pc.divide(pc.cast(data["trip_distance"], pa.float64()), dt_hours)
+
+    data = data.append_column("dt", dt).append_column("avg_speed", avg_speed)
+
+    # Discard trips considered bad data (see CLEAN_RULES).
+    columns = {column: data[column] for column in data.column_names}
+    rejected = clean_rules_evaluate(columns, (date_start, date_end), "arrow")
+
+    # Reorder columns/attributes based on its relevance and filter out bad data.
+    data = data.select(list(TABLE_TRIPS_DTYPES)).filter(pc.invert(rejected))
+
+    schema = data.schema.remove_metadata()
+    for column in ["PULocationID", "DOLocationID", "RatecodeID", "passenger_count", "payment_type", "VendorID"]:
+        schema = schema.set(schema.get_field_index(column), pa.field(column, pa.int32()))
+
+    # REAL columns/attributes are only narrowed down once every rule has been evaluated (in full precision).
+    for column in [column for column, dtype in TABLE_TRIPS_DTYPES.items() if dtype is sa.types.REAL]:
+        schema = schema.set(schema.get_field_index(column), pa.field(column, pa.float32()))
+
+    data = data.cast(schema, safe=False)
+
+    metrics_end(metrics, data)
+    _logger.info("Tabular data (NYC taxi) cleaned.")
+
+    return data
+
+
+def month_range(months: str) -> List[str]:
+    """
+    Returns every month (YYYY-MM) within the given range of months (both included).
+
+    Args:
+        months: Range of months (YYYY-MM..YYYY-MM) or single month (YYYY-MM).
+
+    Returns:
+        Every month (YYYY-MM) within the given range of months.
+
+    Raises:
+        ValueError: If provided `months` is invalid.
+    """
+    if not bool(match(r"\d{4}-\d{2}(\.\.\d{4}-\d{2})?$", months)):
+        raise ValueError(f"Invalid range of months ({months}). Supported format: YYYY-MM..YYYY-MM.")
+    else:
+        pass
+
+    month_start, _, month_end = months.partition("..")
+    month = datetime.strptime(month_start, "%Y-%m")
+    month_end = datetime.strptime(month_end or month_start, "%Y-%m")
+
+    if month > month_end:
+        raise ValueError(f"Invalid range of months ({months}). The first month must not follow the last one.")
+    else:
+        pass
+
+    result = []
+    while month <= month_end:
+        result.append(month.strftime("%Y-%m"))
+        month += relativedelta(months=+1)
+
+    return result
+
+
+def month_dates(month: str) -> List[datetime]:
+    """
+    Returns the time period boundaries (first day of the month and first day of the next month) of the given month.
+
+    Args:
+        month: Month (YYYY-MM).
+
+    Returns:
+        Time period boundaries of the given month.
+    """
+    date_start = datetime.strptime(month, "%Y-%m")
+
+    return [date_start, date_start + relativedelta(months=+1)]
+
+
+def month_path(path: str | PathLike, month: str) -> str:
+    """
+    Returns the given url or local path, replacing the month (YYYY-MM) in its last component by the given one.
+
+    Args:
+        path: Url or local path of monthly tabular data (e.g., `.../yellow_tripdata_2021-01.parquet`).
+        month: Month (YYYY-MM).
+
+    Returns:
+        Url or local path of the given month tabular data.
+    """
+    head, sep, name = str(path).rpartition("/")
+
+    return head + sep + sub(r"\d{4}-\d{2}", month, name, count=1)
+
+
+def path_month(path: str | PathLike) -> str:
+    """
+    Returns the month (YYYY-MM) in the last component of the given url or local path.
+
+    Args:
+        path: Url or local path of monthly tabular data (e.g., `.../yellow_tripdata_2019-01.csv.gz`).
+
+    Returns:
+        Month (YYYY-MM).
+
+    Raises:
+        ValueError: If there is no month (YYYY-MM) in the last component of `path`.
+    """
+    month = search(r"\d{4}-\d{2}", str(path).rpartition("/")[2])
+    if month is None:
+        raise ValueError(f"[FATAL] month (YYYY-MM) not found in {path}. Exiting...")
+    else:
+        pass
+
+    return month.group(0)
+
+
+def clean_rules_key() -> str:
+    """
+    Returns the key identifying the cleaning rules in use: their version (CLEAN_RULES_VERSION) and which of them are
+    enabled.
+
+    Returns:
+        Key identifying the cleaning rules in use.
+    """
+    rules = ",".join(name for name, rule in CLEAN_RULES.items() if rule["enabled"] or rule["required"])
+
+    return f"{CLEAN_RULES_VERSION}|{rules}"
+
+
+def clean_cache_path(fname: str | bytes | PathLike, dates: Tuple[datetime, datetime]) -> Path:
+    """
+    Returns the local path where cleaned NYC taxi trips tabular data read from given local path is cached.
+
+    The cache key combines the content hash (SHA-256) of the raw tabular data, the time period boundaries used to clean
+    it, the version of the cleaning rules (CLEAN_RULES_VERSION), and which of them are enabled.
+
+    Args:
+        fname: Local path where (raw) NYC taxi trips tabular data is stored (PARQUET | CSV format).
+        dates: time period boundaries for the tabular data (NYC taxi trips) recorded.
+
+    Returns:
+        Local path (PARQUET format) next to the raw tabular data.
+    """
+    fname = PATHS["data"]/Path(fname).name
+    key = hashlib.sha256(
+        f"{file_sha256(fname)}|{dates[0].isoformat()}|{dates[1].isoformat()}|{clean_rules_key()}".encode()
+    ).hexdigest()
+
+    return fname.with_name(f"{fname.stem}.clean-{key[:16]}.parquet")
+
+
+def clean_cache_read(
+        fname_clean: Path,
+        chunk_size_read: int | None,
+        engine: Literal["pandas", "arrow"],
+) -> pd.DataFrame | pa.Table | Iterator[pd.DataFrame | pa.Table]:
+    """
+    Returns cleaned NYC taxi trips tabular data read from the local cache (memory-mapped).
+
+    Args:
+        fname_clean: Local path where cleaned NYC taxi trips tabular data is cached (PARQUET format).
+        chunk_size_read: If set, cached tabular data is lazily read in batches of (up to) this many rows.
+        engine: Tabular data engine (pandas | arrow) used to represent cached tabular data (DataFrame | Table).
+
+    Returns:
+        Cleaned NYC taxi trips tabular data (or an iterator of cleaned batches if `chunk_size_read` is set).
+    """
+    try:
+        tex_clean = json.loads(fname_clean.with_suffix(".json").read_text())["tex_clean"]
+    except (OSError, ValueError, KeyError):
+        tex_clean = None
+
+    def log_hit(tex: float) -> None:
+        if tex_clean is not None:
+            _logger.info(
+                f"Cleaned data cache hit ({fname_clean.name}): read in {tex:.2f} s instead of cleaned in "
+                f"{tex_clean:.2f} s ({tex_clean - tex:.2f} s saved)."
+            )
+        else:
+            _logger.info(f"Cleaned data cache hit ({fname_clean.name}): read in {tex:.2f} s.")
+
+    def convert(data: pa.Table) -> pd.DataFrame | pa.Table:
+        if engine == "arrow":
+            return data.replace_schema_metadata(None)
+        else:
+            return data.to_pandas()
+
+    if chunk_size_read is not None:
+        def batches() -> Iterator[pd.DataFrame | pa.Table]:
+            tex = 0.
+            start = perf_counter()
+            batches_clean = (
+                convert(pa.Table.from_batches([batch]))
+                for batch in pq.ParquetFile(fname_clean, memory_map=True).iter_batches(batch_size=chunk_size_read)
+            )
+            for batch in metrics_batches("read_clean_cache", batches_clean, fname=fname_clean.name):
+                tex += perf_counter() - start
+                yield batch
+                start = perf_counter()
+
+            log_hit(tex + perf_counter() - start)
+
+        return batches()
+    else:
+        metrics = metrics_begin("read_clean_cache", fname=fname_clean.name)
+        data = convert(pq.read_table(fname_clean, memory_map=True))
+        log_hit(metrics_end(metrics, data)["wall"])
+
+        return data
+
+
+def clean_cache_write(
+        data: Iterable[pd.DataFrame | pa.Table],
+        fname_clean: Path | Callable[[], Path],
+        fname_tmp: Path | None = None,
+) -> Iterator[pd.DataFrame | pa.Table]:
+    """
+    Yields cleaned NYC taxi trips tabular data batches, while caching them locally (PARQUET format).
+
+    The cache entry only becomes visible once every batch has been yielded. Otherwise, it is discarded. Any previous
+    cache entry of the same raw tabular data (i.e., with a different cache key) is removed.
+
+    Args:
+        data: Cleaned NYC taxi trips tabular data batches to be cached (either pandas DataFrames or Arrow Tables).
+        fname_clean: Local path where cleaned NYC taxi trips tabular data is cached (PARQUET format), or a function
+            returning it once every batch has been yielded (e.g., while raw tabular data is still being downloaded, so
+            its cache key is unknown yet).
+        fname_tmp: Local path where cleaned NYC taxi trips tabular data is written until every batch has been yielded
+            (required if `fname_clean` is a function). Defaults to `fname_clean` with a `.tmp` suffix.
+
+    Yields:
+        Cleaned NYC taxi trips tabular data batches (unmodified).
+    """
+    if fname_tmp is None:
+        fname_tmp = fname_clean.with_suffix(".tmp")
+    else:
+        pass
+
+    writer = None
+    tex = 0.
+    try:
+        start = perf_counter()
+        for batch in data:
+            tex += perf_counter() - start
+
+            if isinstance(batch, pa.Table):
+                table = batch
+            else:
+                table = pa.Table.from_pandas(batch, preserve_index=False)
+
+            if writer is None:
+                writer = pq.ParquetWriter(fname_tmp, table.schema)
+            else:
+                table = table.cast(writer.schema)
+
+            writer.write_table(table)
+
+            yield batch
+            start = perf_counter()
+
+        tex += perf_counter() - start
+
+        if writer is not None:
+            writer.close()
+            writer = None
+
+            if callable(fname_clean):
+                fname_clean = fname_clean()
+            else:
+                pass
+
+            for fname_stale in fname_clean.parent.glob(f"{fname_clean.name.split('.clean-')[0]}.clean-*"):
+                if fname_stale != fname_tmp:
+                    fname_stale.unlink(missing_ok=True)
+                else:
+                    pass
+
+            fname_clean.with_suffix(".json").write_text(json.dumps({"tex_clean": tex}))
+            fname_tmp.replace(fname_clean)
+            _logger.info(f"Cleaned data cached ({fname_clean.name}), cleaned in {tex:.2f} s.")
+        else:
+            pass
+    finally:
+        if writer is not None:
+            writer.close()
+            fname_tmp.unlink(missing_ok=True)
+        else:
+            pass
+
+
+def trips_read_options(
+        dates: Tuple[datetime, datetime],
+) -> Tuple[Dict[str, pa.DataType | None], List[Tuple[str, str, Any]] | None]:
+    """
+    Returns the columns/attributes (along with their dtypes) and filters used to read NYC taxi trips tabular data (see
+    `data_read()`).
+
+    Trips picked up outside the given time period are filtered out while reading, unless the rule discarding them is
+    disabled (see CLEAN_RULES). Note that they are not accounted for in the report of that rule, then.
+
+    Args:
+        dates: time period boundaries for the tabular data (NYC taxi trips) recorded.
+
+    Returns:
+        Columns/attributes to be read (along with their dtypes), and filters (if any) all trips read meet.
+    """
+    if CLEAN_RULES["outside_period"]["enabled"]:
+        filters = [("tpep_pickup_datetime", ">=", dates[0]), ("tpep_pickup_datetime", "<", dates[1])]
+    else:
+        filters = None
+
+    return TABLE_TRIPS_READ_DTYPES, filters
+
+
+def data_prepare(
+        fname: str | bytes | PathLike,
+        dates: Tuple[datetime, datetime],
+        chunk_size_read: int | None,
+        engine: Literal["pandas", "arrow"],
+        refresh_clean_cache: bool = False,
+        url: str | None = None,
+        chunk_size_dw: int = 1024,
+        cache_max_bytes: int = 0,
+        cache: bool = True,
+) -> pd.DataFrame | pa.Table | Iterator[pd.DataFrame | pa.Table]:
+    """
+    Returns cleaned NYC taxi trips tabular data read from given local path (PARQUET | CSV format).
+
+    Cleaned tabular data is cached next to the raw one (see `clean_cache_path()`), so later runs (e.g., while tuning
+    the data ingestion or retrying a failed one) read it (memory-mapped) instead of cleaning the raw tabular data again.
+    Unless `cache` is disabled (e.g., while benchmarking reading and cleaning it).
+
+    Args:
+        fname: Local path where NYC taxi trips tabular data is stored (PARQUET | CSV format).
+        dates: time period boundaries for the tabular data (NYC taxi trips) recorded.
+        chunk_size_read: If set, tabular data is lazily read and cleaned in batches of (up to) this many rows.
+        engine: Tabular data engine used to read and clean NYC taxi trips tabular data (pandas | arrow).
+        refresh_clean_cache: If set, cached cleaned tabular data is ignored and replaced.
+        url: If set, NYC taxi trips tabular data (CSV | CSV.GZ format) is downloaded from this remote location while it
+            is read and cleaned (see `data_download_tee()`), instead of read from the given local path once stored
+            there. Its cleaned data is cached once downloaded, but never looked up (its cache key is unknown yet).
+        chunk_size_dw: Chunk size to-be-used during data downloading (if `url` is set).
+        cache_max_bytes: Maximum size (in bytes) of the local download cache (0 disables it), if `url` is set.
+        cache: If set, cleaned tabular data is looked up in (and stored into) its local cache. Otherwise, raw tabular
+            data is always read and cleaned, and nothing is cached.
+
+    Returns:
+        Cleaned NYC taxi trips tabular data (or an iterator of cleaned batches if `chunk_size_read` is set).
+    """
+    if not cache:
+        fname_clean = None
+        fname_tmp = None
+    elif url is not None:
+        fname_local = PATHS["data"]/Path(fname).name
+        fname_clean = partial(clean_cache_path, fname, dates)
+        fname_tmp = fname_local.with_name(f"{fname_local.stem}.clean-download.tmp")
+    else:
+        fname_clean = clean_cache_path(fname, dates)
+        fname_tmp = None
+        if fname_clean.exists() and not refresh_clean_cache:
+            return clean_cache_read(fname_clean, chunk_size_read, engine)
+        else:
+            _logger.info(f"Cleaned data cache miss ({fname_clean.name}).")
+
+    columns, filters = trips_read_options(dates)
+
+    def clean() -> Iterator[pd.DataFrame | pa.Table]:
+        if url is not None:
+            # The download starts as soon as the first batch is requested (e.g., while ingesting lazily cleaned ones).
+            reader = data_download_tee(url, fname, chunk_size_dw, cache_max_bytes)
+        else:
+            reader = None
+
+        if chunk_size_read is not None:
+            yield from data_clean_batches(
+                data_read_batches(fname, chunk_size_read, engine, columns=columns, filters=filters, reader=reader),
+                dates,
+            )
+        elif engine == "arrow":
+            yield data_clean_arrow(data_read_arrow(fname, columns=columns, filters=filters, reader=reader), dates)
+        else:
+            yield data_clean(data_read(fname, columns=columns, filters=filters, reader=reader), dates)
+
+    if fname_clean is not None:
+        batches = clean_cache_write(clean(), fname_clean, fname_tmp)
+    else:
+        batches = clean()
+
+    if chunk_size_read is not None:
+        # Batches are lazily read and cleaned as they are ingested, bounding memory usage by `chunk_size_read`.
+        return batches
+    else:
+        [data] = batches
+
+        return data
+
+
+def pg_engine(pg_params: Dict[str, str], role: Literal["writer", "reader"] = "writer") -> sa.engine.Engine:
+    """
+    Returns a SQLAlchemy engine to enable communications between a client and the given PostgreSQL database (SSL).
+
+    Args:
+        pg_params: PostgreSQL database connection parameters.
+        role: Role whose client certificate (`fmerinocasallo_<role>.crt` and `.key`, in `PATHS["certs"]`) is used:
+            read-write (writer) or read-only (reader).
+
+    Returns:
+        SQLAlchemy engine connected to the given PostgreSQL database.
+    """
+    url = (
+        f"postgresql://{pg_params['username']}:{pg_params['passwd']}"
+        f"@{pg_params['host']}:{pg_params['port']}/{pg_params['db']}"
+    )
+    connect_args = {
+        "sslmode": "require",
+        "sslrootcert": str(PATHS["certs"]/"server-ca.crt"),
+        "sslcert": str(PATHS["certs"]/f"fmerinocasallo_{role}.crt"),
+        "sslkey": str(PATHS["certs"]/f"fmerinocasallo_{role}.key"),
+    }
+
+    return sa.create_engine(url=url, connect_args=connect_args)
+
+
+async def pg_connect_async(url: sa.engine.URL) -> asyncpg.Connection:
+    """
+    Returns an asyncpg connection to the given PostgreSQL database (SSL), as the ones of `pg_engine()`.
+
+    Args:
+        url: SQLAlchemy URL of the PostgreSQL database (e.g., `engine.url`).
+
+    Returns:
+        asyncpg connection to the given PostgreSQL database.
+    """
+    # Equivalent to `sslmode=require` along with a root certificate (i.e., the server certificate is verified, but not
+    # its hostname).
+    ssl_context = ssl.create_default_context(cafile=str(PATHS["certs"]/"server-ca.crt"))
+    ssl_context.check_hostname = False
+    ssl_context.load_cert_chain(
+        str(PATHS["certs"]/"fmerinocasallo_writer.crt"),
+        str(PATHS["certs"]/"fmerinocasallo_writer.key"),
+    )
+
+    return await asyncpg.connect(
+        user=url.username,
+        password=url.password,
+        host=url.host,
+        port=url.port,
+        database=url.database,
+        ssl=ssl_context,
+    )
+
+
+@contextmanager
+def pg_session_async(url: sa.engine.URL) -> Iterator[Tuple[asyncio.AbstractEventLoop, asyncpg.Connection]]:
+    """
+    Yields an asyncpg connection to the given PostgreSQL database (see `pg_connect_async()`) along with the event loop
+    driving it, so synchronous code can reuse the same connection (e.g., across calls to `data_insert()`).
+
+    The event loop belongs to the calling thread, and only runs while a coroutine is awaited on it.
+
+    Args:
+        url: SQLAlchemy URL of the PostgreSQL database (e.g., `engine.url`).
+
+    Yields:
+        Event loop and asyncpg connection to the given PostgreSQL database (closed afterwards).
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        conn = loop.run_until_complete(pg_connect_async(url))
+        try:
+            yield loop, conn
+        finally:
+            loop.run_until_complete(conn.close())
+    finally:
+        loop.close()
+
+
+@contextmanager
+def pg_transaction_async(
+        url: sa.engine.URL,
+        session: Tuple[asyncio.AbstractEventLoop, asyncpg.Connection] | None = None,
+) -> Iterator[Tuple[asyncio.AbstractEventLoop, asyncpg.Connection]]:
+    """
+    Yields an asyncpg connection within a transaction, committed if the block succeeds and rolled back otherwise (as
+    `engine.begin()` does).
+
+    Args:
+        url: SQLAlchemy URL of the PostgreSQL database (e.g., `engine.url`).
+        session: Event loop and asyncpg connection to be reused (see `pg_session_async()`). If unset, a new connection
+            is opened (and closed afterwards).
+
+    Yields:
+        Event loop and asyncpg connection to the given PostgreSQL database.
+    """
+    with pg_session_async(url) if session is None else nullcontext(session) as (loop, conn):
+        transaction = conn.transaction()
+        loop.run_until_complete(transaction.start())
+        try:
+            yield loop, conn
+        except BaseException:
+            try:
+                loop.run_until_complete(transaction.rollback())
+            except Exception:
+                # E.g., an interrupted COPY statement. PostgreSQL rolls the transaction back once disconnected.
+                conn.terminate()
+
+            raise
+        else:
+            loop.run_until_complete(transaction.commit())
+
+
+def data_ingest_worker_init(pg_params: Dict[str, str]) -> None:
+    """
+    Initializes a worker process for parallel data ingestion with its own connection to the PostgreSQL database.
+
+    Args:
+        pg_params: PostgreSQL database connection parameters.
+    """
+    global _engine, _metrics_fname
+    _engine = pg_engine(pg_params)
+
+    # Stage metrics are sent back to the main process instead (see `data_ingest_shard()`).
+    _metrics.clear()
+    _metrics_fname = None
+
+
+def data_shard(
+        data: pd.DataFrame | pa.Table,
+        unit: Literal["day", "month"] = "day",
+) -> Iterator[pd.DataFrame | pa.Table]:
+    """
+    Yields shards of NYC taxi trips tabular data, one per pickup day (or month).
+
+    Args:
+        data: NYC taxi trips tabular data to be sharded (either a pandas DataFrame or an Arrow Table).
+        unit: Time period spanned by each shard (day | month).
+
+    Yields:
+        NYC taxi trips tabular data recorded during the same pickup day (or month).
+    """
+    if isinstance(data, pa.Table):
+        periods = pc.floor_temporal(data["tpep_pickup_datetime"], unit=unit)
+        for period in pc.unique(periods):
+            yield data.filter(pc.equal(periods, period))
+    else:
+        freq = "M" if unit == "month" else "D"
+        for _, shard in data.groupby(data["tpep_pickup_datetime"].dt.to_period(freq)):
+            yield shard
+
+
+def data_ingest_shard(
+        data: pd.DataFrame | pa.Table,
+        pg_params: Dict[str, str],
+        table_name: str,
+) -> Tuple[int, int, float, List[Dict[str, Any]]]:
+    """
+    Ingests a shard of NYC taxi trips tabular data into a PostgreSQL database from a worker process.
+
+    Args:
+        data: Shard of NYC taxi trips tabular data to be ingested into a PostgreSQL database.
+        pg_params: PostgreSQL database connection parameters.
+        table_name: PostgreSQL destination table.
+
+    Returns:
+        Worker process ID, number of rows ingested, elapsed real (wall clock) time, in seconds, and stage metrics
+        recorded by the worker process (to be recorded by the main process).
+    """
+    start = perf_counter()
+    data_insert(
+        data,
+        _engine,
+        pg_params["schema"],
+        table_name,
+        TABLE_TRIPS_DTYPES,
+        int(pg_params["chunk_size"]),
+        pg_params["method"],
+        int(pg_params.get("mem_max_sql", "0")),
+    )
+    tex = perf_counter() - start
+
+    with _metrics_lock:
+        metrics = _metrics.copy()
+        _metrics.clear()
+
+    return getpid(), len(data), tex, metrics
+
+
+def data_ingest_parallel(
+        batches: Iterable[pd.DataFrame | pa.Table],
+        pg_params: Dict[str, str],
+        table_name: str,
+        workers: int,
+) -> None:
+    """
+    Ingests NYC taxi trips tabular data into a PostgreSQL database from a pool of worker processes.
+
+    Each batch is split into shards by pickup day, which are then ingested concurrently. Every worker process uses its
+    own connection to the PostgreSQL database. Batches are ingested one after another, so only a single batch is kept
+    in memory at any given time.
+
+    Args:
+        batches: NYC taxi trips tabular data batches to be ingested into a PostgreSQL database.
+        pg_params: PostgreSQL database connection parameters.
+        table_name: PostgreSQL destination table.
+        workers: Number of worker processes.
+    """
+    stats = defaultdict(lambda: [0, 0.])
+    start = perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=data_ingest_worker_init,
+        initargs=(pg_params,),
+    ) as executor:
+        for batch in batches:
+            futures = [
+                executor.submit(data_ingest_shard, shard, pg_params, table_name)
+                for shard in data_shard(batch)
+            ]
+
+            try:
+                for future in as_completed(futures):
+                    pid, rows, tex, metrics = future.result()
+                    stats[pid][0] += rows
+                    stats[pid][1] += tex
+
+                    for metrics_i in metrics:
+                        metrics_record({**metrics_i, "run": _metrics_run})
+            except Exception:
+                for future in futures:
+                    future.cancel()
+
+                raise
+
+    tex = perf_counter() - start
+
+    for pid, (rows, tex_pid) in stats.items():
+        _logger.info(f"Worker {pid} ingested {rows} rows in {tex_pid:.2f} s ({rows / max(tex_pid, 1e-9):.0f} rows/s).")
+
+    rows = sum(rows for rows, _ in stats.values())
+    _logger.info(f"{workers} workers ingested {rows} rows in {tex:.2f} s ({rows / max(tex, 1e-9):.0f} rows/s).")
+
+    return None
+
+
+def trips_table(schema: str, table_name: str, **kwargs: Any) -> sa.Table:
+    """
+    Returns the definition of a table storing NYC taxi trips tabular data (one column/attribute per TABLE_TRIPS_DTYPES).
+
+    Args:
+        schema: PostgreSQL schema of the table.
+        table_name: PostgreSQL table.
+        kwargs: Additional (dialect-specific) arguments of the table definition (e.g., `prefixes`).
+
+    Returns:
+        SQLAlchemy table definition.
+    """
+    return sa.Table(
+        table_name,
+        sa.MetaData(),
+        *[sa.Column(column, dtype) for column, dtype in TABLE_TRIPS_DTYPES.items()],
+        schema=schema,
+        **kwargs,
+    )
+
+
+def trips_sort(data: pd.DataFrame | pa.Table) -> pd.DataFrame | pa.Table:
+    """
+    Returns NYC taxi trips tabular data sorted by pickup datetime (see TABLE_TRIPS_INDEXES).
+
+    Args:
+        data: NYC taxi trips tabular data (either a pandas DataFrame or an Arrow Table) to be sorted.
+
+    Returns:
+        NYC taxi trips tabular data sorted by pickup datetime (a sorted copy).
+    """
+    metrics = metrics_begin("sort")
+    if isinstance(data, pa.Table):
+        data = data.sort_by("tpep_pickup_datetime")
+    else:
+        data = data.sort_values("tpep_pickup_datetime", kind="stable", ignore_index=True)
+
+    metrics_end(metrics, data)
+
+    return data
+
+
+def trips_index(engine: sa.engine.Engine, schema: str, table_name: str, sort: bool) -> Dict[str, float]:
+    """
+    Indexes a table storing NYC taxi trips tabular data (see TABLE_TRIPS_INDEXES) and analyzes it afterwards.
+
+    Every index is built concurrently over its own connection, as each one scans the whole table. Indexes already
+    created are kept (e.g., those of a partitioned table, which are created on every partition attached to it later).
+
+    Args:
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        schema: PostgreSQL schema of the table.
+        table_name: PostgreSQL table (either a partitioned one or not).
+        sort: Whether NYC taxi trips tabular data was sorted by pickup datetime before being ingested (see
+            `trips_sort()`). Otherwise, every index is a btree one.
+
+    Returns:
+        Elapsed real (wall clock) time, in seconds, spent building indexes (`index`) and analyzing (`analyze`).
+    """
+    def index(column: str) -> None:
+        method = TABLE_TRIPS_INDEXES[column] if sort else "btree"
+        with engine.begin() as conn:
+            conn.execute(sa.text(
+                f'CREATE INDEX IF NOT EXISTS {table_name}_{column.lower()}_idx '
+                f'ON {schema}.{table_name} USING {method} ("{column}")'
+            ))
+
+        _logger.info(f"Index {schema}.{table_name}_{column.lower()}_idx ({method}) available in PostgreSQL database.")
+
+    phases = {}
+    with metrics_stage("index", table=table_name) as metrics:
+        with ThreadPoolExecutor(max_workers=len(TABLE_TRIPS_INDEXES)) as executor:
+            for future in as_completed([executor.submit(index, column) for column in TABLE_TRIPS_INDEXES]):
+                future.result()
+
+    phases["index"] = metrics["wall"]
+
+    with metrics_stage("analyze", table=table_name) as metrics, engine.begin() as conn:
+        conn.execute(sa.text(f"ANALYZE {schema}.{table_name}"))
+
+    phases["analyze"] = metrics["wall"]
+
+    return phases
+
+
+def progress_table(schema: str) -> sa.Table:
+    """
+    Returns the definition of the table recording the progress of data ingestion (see TABLE_PROGRESS_NAME).
+
+    Each row records a range of rows (`row_start` to `row_end`, excluded) of the cleaned NYC taxi trips of a month
+    committed into a table, along with the cleaning rules in use (see `clean_rules_key()`).
+
+    Args:
+        schema: PostgreSQL schema of the table.
+
+    Returns:
+        SQLAlchemy table definition.
+    """
+    return sa.Table(
+        TABLE_PROGRESS_NAME,
+        sa.MetaData(),
+        sa.Column("table_name", sa.types.String(63), primary_key=True),
+        sa.Column("month", sa.types.String(7), primary_key=True),
+        sa.Column("row_start", sa.types.BIGINT, primary_key=True),
+        sa.Column("row_end", sa.types.BIGINT, nullable=False),
+        sa.Column("clean_rules", sa.types.String(255), nullable=False),
+        sa.Column("committed_at", sa.types.TIMESTAMP, server_default=sa.func.now(), nullable=False),
+        schema=schema,
+    )
+
+
+def progress_read(conn: sa.engine.Connection, schema: str, table_name: str) -> Dict[str, int]:
+    """
+    Returns the number of rows of the cleaned NYC taxi trips of each month already committed into the given table.
+
+    Only the row range starting at row 0 and recorded without gaps counts (batches are committed one after another).
+
+    Args:
+        conn: SQLAlchemy connection to the PostgreSQL database.
+        schema: PostgreSQL schema of the tables.
+        table_name: PostgreSQL table storing NYC taxi trips tabular data.
+
+    Returns:
+        Number of rows committed, per month (YYYY-MM).
+
+    Raises:
+        ValueError: If rows were committed under different cleaning rules (so row ranges do not match).
+    """
+    table = progress_table(schema)
+    table.create(conn, checkfirst=True)
+    ranges = conn.execute(
+        sa.select(table.c.month, table.c.row_start, table.c.row_end, table.c.clean_rules)
+        .where(table.c.table_name == table_name)
+        .order_by(table.c.month, table.c.row_start)
+    ).all()
+
+    committed = {}
+    for month, row_start, row_end, clean_rules in ranges:
+        if clean_rules != clean_rules_key():
+            raise ValueError(
+                f"Rows of {month} were committed into {schema}.{table_name} under different cleaning rules "
+                f"({clean_rules}). They cannot be resumed."
+            )
+        elif committed.get(month, 0) == row_start:
+            committed[month] = row_end
+        else:
+            pass
+
+    return committed
+
+
+def progress_reset(conn: sa.engine.Connection, schema: str, table_name: str) -> None:
+    """
+    Forgets the progress of data ingestion into the given table (e.g., because it is being replaced).
+
+    Args:
+        conn: SQLAlchemy connection to the PostgreSQL database.
+        schema: PostgreSQL schema of the tables.
+        table_name: PostgreSQL table storing NYC taxi trips tabular data.
+    """
+    table = progress_table(schema)
+    table.create(conn, checkfirst=True)
+    conn.execute(table.delete().where(table.c.table_name == table_name))
+
+    return None
+
+
+def progress_rename(conn: sa.engine.Connection, schema: str, table_name: str, table_name_new: str) -> None:
+    """
+    Moves the progress of data ingestion into a table to another one (e.g., a staging table renamed to it), replacing
+    the progress of the latter.
+
+    Args:
+        conn: SQLAlchemy connection to the PostgreSQL database.
+        schema: PostgreSQL schema of the tables.
+        table_name: PostgreSQL table whose progress is moved.
+        table_name_new: PostgreSQL table whose progress is replaced.
+    """
+    table = progress_table(schema)
+    progress_reset(conn, schema, table_name_new)
+    conn.execute(table.update().where(table.c.table_name == table_name).values(table_name=table_name_new))
+
+    return None
+
+
+def progress_insert(schema: str, table_name: str, month: str, row_start: int, row_end: int) -> sa.sql.Executable:
+    """
+    Returns the SQL statement recording a range of rows of the cleaned NYC taxi trips of a month committed into a table
+    (to be executed within the same transaction as those rows, see `data_insert()`).
+
+    Args:
+        schema: PostgreSQL schema of the tables.
+        table_name: PostgreSQL table storing NYC taxi trips tabular data.
+        month: Month (YYYY-MM) of the NYC taxi trips.
+        row_start: First row of the range (within the cleaned NYC taxi trips of the month).
+        row_end: Last row of the range (excluded).
+
+    Returns:
+        SQL statement.
+    """
+    return progress_table(schema).insert().values(
+        table_name=table_name,
+        month=month,
+        row_start=row_start,
+        row_end=row_end,
+        clean_rules=clean_rules_key(),
+    )
+
+
+def progress_batches(
+        batches: Iterable[pd.DataFrame | pa.Table],
+        committed: Dict[str, int],
+) -> Iterator[Tuple[str, int, pd.DataFrame | pa.Table]]:
+    """
+    Yields NYC taxi trips tabular data batches along with their month and the position of their first row within the
+    cleaned NYC taxi trips of that month, skipping those rows already committed (see `progress_read()`).
+
+    Batches spanning several months (e.g., if trips picked up outside the month of their file are not discarded, see
+    CLEAN_RULES) are split into one per month (see `data_shard()`), so every row range is recorded under the month of
+    all its rows. Batches partially committed (e.g., if the batch size changed since) are sliced, and empty batches are
+    skipped.
+
+    Args:
+        batches: NYC taxi trips tabular data batches.
+        committed: Number of rows already committed, per month (YYYY-MM).
+
+    Yields:
+        Month (YYYY-MM), position of the first row, and rows not committed yet of each batch.
+    """
+    def shards() -> Iterator[Tuple[str, pd.DataFrame | pa.Table]]:
+        for batch in batches:
+            if len(batch) == 0:
+                continue
+            elif isinstance(batch, pa.Table):
+                pickup = pc.min_max(batch["tpep_pickup_datetime"])
+                pickup_min, pickup_max = pickup["min"].as_py(), pickup["max"].as_py()
+            else:
+                pickup_min, pickup_max = batch["tpep_pickup_datetime"].min(), batch["tpep_pickup_datetime"].max()
+
+            if f"{pickup_min:%Y-%m}" == f"{pickup_max:%Y-%m}":
+                yield f"{pickup_min:%Y-%m}", batch
+            else:
+                for shard in data_shard(batch, unit="month"):
+                    if isinstance(shard, pa.Table):
+                        yield f"{shard['tpep_pickup_datetime'][0].as_py():%Y-%m}", shard
+                    else:
+                        yield f"{shard['tpep_pickup_datetime'].iloc[0]:%Y-%m}", shard
+
+    rows = defaultdict(int)
+    skipped = 0
+    for month, batch in shards():
+        row_start = rows[month]
+        rows[month] += len(batch)
+
+        skip = min(max(committed.get(month, 0) - row_start, 0), len(batch))
+        skipped += skip
+        if skip == len(batch):
+            continue
+        elif skip > 0:
+            batch = batch.slice(skip) if isinstance(batch, pa.Table) else batch.iloc[skip:]
+        else:
+            pass
+
+        yield month, row_start + skip, batch
+
+    if skipped > 0:
+        _logger.info(f"{skipped} rows of NYC taxi trips tabular data skipped (already committed).")
+    else:
+        pass
+
+    return None
+
+
+def data_ingest_replace(
+        data_trips: Iterator[pd.DataFrame | pa.Table],
+        engine: sa.engine.Engine,
+        pg_params: Dict[str, str],
+) -> None:
+    """
+    Ingests NYC taxi trips tabular data into a PostgreSQL database, replacing the whole destination table.
+
+    If `pg_params['fast_load']` is "True", trips are ingested into an `UNLOGGED` staging table without any index (so
+    neither WAL records nor index entries are written per row). Afterwards, it is switched to `LOGGED`, indexed (see
+    TABLE_TRIPS_INDEXES), and analyzed, and then it replaces the destination table in a single transaction, which
+    also grants `SELECT` permissions to the `reader` role. If `pg_params['index']` is "True", the table (staging or not)
+    is indexed and analyzed likewise once loaded (see `trips_index()`). The time spent in each phase is logged.
+
+    Otherwise (a single worker, no fast load), each batch is checkpointed: its row range is recorded in the progress
+    table (see TABLE_PROGRESS_NAME) within the same transaction as its rows. If
+    `pg_params['resume']` is "True" and progress was recorded for the existing destination table, it is not replaced,
+    and only the rows not committed yet are ingested, so no batch is ever ingested twice.
+
+    Args:
+        data_trips: NYC taxi trips tabular data batches to be ingested into a PostgreSQL database. Each batch is
+            ingested before the next one is requested.
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        pg_params: PostgreSQL database connection parameters.
+    """
+    schema = pg_params["schema"]
+    workers = int(pg_params.get("workers", "1"))
+    fast_load = pg_params.get("fast_load", "False") == "True"
+    index = pg_params.get("index", "False") == "True"
+    resume = pg_params.get("resume", "False") == "True"
+
+    if workers > 1 or fast_load:
+        # Workers commit independently, so trips are ingested into a staging table first. It only replaces the
+        # destination table once every worker succeeded, so the whole ingestion either becomes visible or not at all.
+        table_trips_name = f"{pg_params['table_trips_name']}_staging"
+    else:
+        table_trips_name = pg_params["table_trips_name"]
+
+    # Batches ingested straight into the destination table (one after another) are checkpointed.
+    checkpoint = table_trips_name == pg_params["table_trips_name"]
+
+    phases = {}
+
+    committed = {}
+    if resume and table_trips_name == pg_params["table_trips_name"]:
+        with engine.begin() as conn:
+            if sa.inspect(conn).has_table(table_trips_name, schema=schema):
+                committed = progress_read(conn, schema, table_trips_name)
+            else:
+                pass
+
+        if committed:
+            _logger.info(
+                f"Resuming data ingestion into {schema}.{table_trips_name}: "
+                + ", ".join(f"{rows} rows of {month}" for month, rows in committed.items())
+                + " already committed."
+            )
+        else:
+            _logger.warning(f"No progress recorded for {schema}.{table_trips_name}. Ingesting it from scratch.")
+    else:
+        pass
+
+    if not committed:
+        # The first batch is required beforehand to define the columns/attributes of the new table.
+        batch_trips = next(data_trips)
+        data_trips = chain([batch_trips], data_trips)
+
+        # Create a new table to store NYC taxi trips tabular data.
+        metrics = metrics_begin("create", table=table_trips_name)
+        if table_trips_name == pg_params["table_trips_name"]:
+            # Progress recorded for the previous table is forgotten before the table itself is replaced.
+            with engine.begin() as conn:
+                progress_reset(conn, schema, table_trips_name)
+        else:
+            pass
+
+        if fast_load:
+            table = trips_table(schema, table_trips_name, prefixes=["UNLOGGED"])
+            with engine.begin() as conn:
+                table.drop(conn, checkfirst=True)
+                table.create(conn)
+        else:
+            if isinstance(batch_trips, pa.Table):
+                data_trips_empty = batch_trips.slice(0, 0).to_pandas()
+            else:
+                data_trips_empty = batch_trips.head(n=0)
+
+            data_trips_empty.to_sql(
+                name=table_trips_name,
+                con=engine,
+                schema=schema,
+                if_exists="replace",
+                index=False,
+                dtype=TABLE_TRIPS_DTYPES,
+            )
+
+        phases["create"] = metrics_end(metrics)["wall"]
+        _logger.info(f"New table {schema}.{table_trips_name} created in PostgreSQL database.")
+    else:
+        pass
+
+    # Import NYC taxi (monthly) trips tabular data into the newly created table (one batch at a time).
+    start = perf_counter()
+    try:
+        if workers > 1:
+            data_ingest_parallel(data_trips, pg_params, table_trips_name, workers)
+        else:
+            # With asynchronous COPY, every batch is ingested over the same connection.
+            with pg_session_async(engine.url) if pg_params["method"] == "psql_copy_async" else nullcontext() as session:
+                for month, row_start, batch_trips in progress_batches(data_trips, committed):
+                    data_insert(
+                        batch_trips,
+                        engine,
+                        schema,
+                        table_trips_name,
+                        TABLE_TRIPS_DTYPES,
+                        int(pg_params["chunk_size"]),
+                        pg_params["method"],
+                        int(pg_params.get("mem_max_sql", "0")),
+                        progress_insert(schema, table_trips_name, month, row_start, row_start + len(batch_trips))
+                        if checkpoint else None,
+                        session,
+                    )
+
+        phases["load"] = perf_counter() - start
+
+        if fast_load:
+            with metrics_stage("logged", table=table_trips_name) as metrics, engine.begin() as conn:
+                conn.execute(sa.text(f"ALTER TABLE {schema}.{table_trips_name} SET LOGGED"))
+
+            phases["logged"] = metrics["wall"]
+        else:
+            pass
+
+        if fast_load or index:
+            phases.update(trips_index(engine, schema, table_trips_name, index))
+        else:
+            pass
+    except Exception:
+        if table_trips_name != pg_params["table_trips_name"]:
+            with engine.begin() as conn:
+                conn.execute(sa.text(f"DROP TABLE IF EXISTS {schema}.{table_trips_name}"))
+        else:
+            pass
+
+        raise
+
+    if table_trips_name != pg_params["table_trips_name"]:
+        metrics = metrics_begin("swap", table=pg_params["table_trips_name"])
+        with engine.begin() as conn:
+            progress_reset(conn, schema, pg_params["table_trips_name"])
+            conn.execute(sa.text(f"DROP TABLE IF EXISTS {schema}.{pg_params['table_trips_name']}"))
+            conn.execute(sa.text(
+                f"ALTER TABLE {schema}.{table_trips_name} RENAME TO {pg_params['table_trips_name']}"
+            ))
+
+            if fast_load or index:
+                for column in TABLE_TRIPS_INDEXES:
+                    conn.execute(sa.text(
+                        f"ALTER INDEX {schema}.{table_trips_name}_{column.lower()}_idx "
+                        f"RENAME TO {pg_params['table_trips_name']}_{column.lower()}_idx"
+                    ))
+            else:
+                pass
+
+            if fast_load:
+                # Otherwise, `reader`s would not be able to access the new table until `data_ingest()` grants them.
+                conn.execute(sa.text(f"GRANT SELECT ON TABLE {schema}.{pg_params['table_trips_name']} TO reader"))
+            else:
+                pass
+
+        phases["swap"] = metrics_end(metrics)["wall"]
+        _logger.info(
+            f"Table {schema}.{table_trips_name} renamed to "
+            f"{schema}.{pg_params['table_trips_name']} in PostgreSQL database."
+        )
+    else:
+        pass
+
+    for phase, tex in phases.items():
+        _logger.info(f"Phase {phase} took {tex:.2f} s.")
+
+    _logger.info(f"NYC taxi trips tabular data ingested in {sum(phases.values()):.2f} s.")
+
+    return None
+
+
+def partition_name(table_name: str, month: datetime) -> str:
+    """
+    Returns the name of the partition of a (range-partitioned) table storing the given month.
+
+    Args:
+        table_name: PostgreSQL partitioned table.
+        month: First day of the month stored in the partition.
+
+    Returns:
+        PostgreSQL partition name (e.g., yellow_taxi_trips_2021_01).
+    """
+    return f"{table_name}_{month:%Y_%m}"
+
+
+def partitioned_table_create(engine: sa.engine.Engine, schema: str, table_name: str) -> None:
+    """
+    Creates a table to store NYC taxi trips tabular data range-partitioned by pickup datetime, unless it already exists.
+
+    Args:
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        schema: PostgreSQL schema of the partitioned table.
+        table_name: PostgreSQL partitioned table.
+
+    Raises:
+        ValueError: If a table named `table_name` already exists, but it is not partitioned.
+    """
+    with engine.connect() as conn:
+        relkind = conn.execute(
+            sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": f"{schema}.{table_name}"},
+        ).scalar()
+
+    if relkind is None:
+        table = trips_table(schema, table_name, postgresql_partition_by="RANGE (tpep_pickup_datetime)")
+        with metrics_stage("create", table=table_name):
+            table.create(engine)
+
+        _logger.info(f"New partitioned table {schema}.{table_name} created in PostgreSQL database.")
+    elif relkind != "p":
+        # An existing (non-partitioned) table is never dropped implicitly, as it may store any number of months.
+        raise ValueError(f"Table {schema}.{table_name} already exists, but it is not partitioned.")
+    else:
+        pass
+
+    return None
+
+
+def partition_swap(engine: sa.engine.Engine, schema: str, table_name: str, staging_name: str, month: datetime) -> None:
+    """
+    Swaps a staging table in as the partition storing the given month, replacing the previous one (if any).
+
+    The staging table is checked against the partition bounds beforehand, so attaching it does not scan it again. The
+    previous partition is detached concurrently. Therefore, neither step blocks readers of the partitioned table, even
+    though the month being swapped briefly looks empty to them. The progress of data ingestion into the staging table
+    (if any, see TABLE_PROGRESS_NAME) replaces that of the previous partition while it is attached.
+
+    Args:
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        schema: PostgreSQL schema of the partitioned table.
+        table_name: PostgreSQL partitioned table.
+        staging_name: PostgreSQL staging table storing NYC taxi trips tabular data of the given month.
+        month: First day of the month stored in the staging table.
+    """
+    partition = partition_name(table_name, month)
+    bounds = f"'{month:%Y-%m-%d}'", f"'{month + relativedelta(months=+1):%Y-%m-%d}'"
+
+    with engine.begin() as conn:
+        conn.execute(sa.text(
+            f"ALTER TABLE {schema}.{staging_name} ADD CONSTRAINT {staging_name}_bounds CHECK ("
+            f"tpep_pickup_datetime IS NOT NULL AND tpep_pickup_datetime >= {bounds[0]} "
+            f"AND tpep_pickup_datetime < {bounds[1]})"
+        ))
+        attached = conn.execute(
+            sa.text("SELECT relispartition FROM pg_class WHERE oid = to_regclass(:partition)"),
+            {"partition": f"{schema}.{partition}"},
+        ).scalar()
+
+    if attached:
+        # `DETACH PARTITION ... CONCURRENTLY` cannot be run inside a transaction block.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(sa.text(
+                f"ALTER TABLE {schema}.{table_name} DETACH PARTITION {schema}.{partition} CONCURRENTLY"
+            ))
+
+        _logger.info(f"Partition {schema}.{partition} detached from {schema}.{table_name} in PostgreSQL database.")
+    else:
+        pass
+
+    with engine.begin() as conn:
+        progress_rename(conn, schema, staging_name, partition)
+        conn.execute(sa.text(f"DROP TABLE IF EXISTS {schema}.{partition}"))
+        conn.execute(sa.text(f"ALTER TABLE {schema}.{staging_name} RENAME TO {partition}"))
+        conn.execute(sa.text(
+            f"ALTER TABLE {schema}.{table_name} ATTACH PARTITION {schema}.{partition} "
+            f"FOR VALUES FROM ({bounds[0]}) TO ({bounds[1]})"
+        ))
+        conn.execute(sa.text(f"ALTER TABLE {schema}.{partition} DROP CONSTRAINT {staging_name}_bounds"))
+
+    _logger.info(f"Partition {schema}.{partition} attached to {schema}.{table_name} in PostgreSQL database.")
+
+    return None
+
+
+def data_ingest_partitioned(
+        data_trips: Iterator[pd.DataFrame | pa.Table],
+        engine: sa.engine.Engine,
+        pg_params: Dict[str, str],
+) -> None:
+    """
+    Ingests NYC taxi trips tabular data into a PostgreSQL database, replacing only the partitions of the months found.
+
+    The destination table is range-partitioned by pickup datetime (one partition per month). Each month is ingested into
+    a standalone staging table, which is swapped in for the previous partition of that month (if any) as soon as the
+    next month starts. Therefore, reingesting a month neither touches nor blocks readers of any other month. If
+    `pg_params['fast_load']` is "True", staging tables are `UNLOGGED` until they are swapped in. If `pg_params['index']`
+    is "True", the partitioned table is indexed and analyzed once every month has been swapped in (see `trips_index()`),
+    so partitions attached later on are indexed while they are attached.
+
+    Otherwise (a single worker, no fast load), each batch is checkpointed into the progress table (see
+    `data_ingest_replace()`), and the staging table of a month whose ingestion fails is kept. If `pg_params['resume']`
+    is "True", the ingestion of a month whose staging table was kept continues from its first row not committed yet,
+    and months whose partition was swapped in by a checkpointed ingestion are skipped otherwise.
+
+    Args:
+        data_trips: NYC taxi trips tabular data batches to be ingested into a PostgreSQL database. Each batch is
+            ingested before the next one is requested. Batches of the same month must be consecutive.
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        pg_params: PostgreSQL database connection parameters.
+
+    Raises:
+        ValueError: If batches of the same month are not consecutive.
+    """
+    schema = pg_params["schema"]
+    table_name = pg_params["table_trips_name"]
+    workers = int(pg_params.get("workers", "1"))
+    fast_load = pg_params.get("fast_load", "False") == "True"
+    index = pg_params.get("index", "False") == "True"
+    resume = pg_params.get("resume", "False") == "True"
+    checkpoint = workers == 1 and not fast_load
+
+    partitioned_table_create(engine, schema, table_name)
+
+    def shards() -> Iterator[Tuple[datetime, pd.DataFrame | pa.Table]]:
+        for batch in data_trips:
+            for shard in data_shard(batch, unit="month"):
+                if isinstance(shard, pa.Table):
+                    pickup = shard["tpep_pickup_datetime"][0].as_py()
+                else:
+                    pickup = shard["tpep_pickup_datetime"].iloc[0]
+
+                yield datetime(year=pickup.year, month=pickup.month, day=1), shard
+
+    months = []
+    for month, shards_month in groupby(shards(), key=itemgetter(0)):
+        if month in months:
+            raise ValueError(f"NYC taxi trips tabular data of {month:%Y-%m} is not consecutive.")
+        else:
+            months.append(month)
+
+        staging_name = f"{partition_name(table_name, month)}_staging"
+        ingested, committed = False, {}
+        if resume:
+            # A staging table kept by the last (interrupted) ingestion of the month takes precedence over its partition.
+            with engine.begin() as conn:
+                if sa.inspect(conn).has_table(staging_name, schema=schema):
+                    committed = progress_read(conn, schema, staging_name)
+                else:
+                    pass
+
+                if not committed:
+                    ingested = f"{month:%Y-%m}" in progress_read(conn, schema, partition_name(table_name, month))
+                else:
+                    pass
+        else:
+            pass
+
+        if ingested:
+            # Every batch of the month must still be consumed (e.g., to compute rollups).
+            deque(shards_month, maxlen=0)
+            _logger.info(f"Partition {schema}.{partition_name(table_name, month)} already ingested. Skipping it.")
+            continue
+        elif committed:
+            _logger.info(f"Resuming data ingestion into {schema}.{staging_name}: {sum(committed.values())} rows "
+                         "already committed.")
+        else:
+            with metrics_stage("create", table=staging_name), engine.begin() as conn:
+                progress_reset(conn, schema, staging_name)
+                conn.execute(sa.text(f"DROP TABLE IF EXISTS {schema}.{staging_name}"))
+                conn.execute(sa.text(
+                    f"CREATE {'UNLOGGED ' if fast_load else ''}TABLE {schema}.{staging_name} "
+                    f"(LIKE {schema}.{table_name} INCLUDING DEFAULTS)"
+                ))
+
+            _logger.info(f"New table {schema}.{staging_name} created in PostgreSQL database.")
+
+        try:
+            batches = (shard for _, shard in shards_month)
+            if workers > 1:
+                data_ingest_parallel(batches, pg_params, staging_name, workers)
+            else:
+                # With asynchronous COPY, every batch of the month is ingested over the same connection.
+                with (
+                    pg_session_async(engine.url) if pg_params["method"] == "psql_copy_async" else nullcontext()
+                ) as session:
+                    for month_i, row_start, batch in progress_batches(batches, committed):
+                        data_insert(
+                            batch,
+                            engine,
+                            schema,
+                            staging_name,
+                            TABLE_TRIPS_DTYPES,
+                            int(pg_params["chunk_size"]),
+                            pg_params["method"],
+                            int(pg_params.get("mem_max_sql", "0")),
+                            progress_insert(schema, staging_name, month_i, row_start, row_start + len(batch))
+                            if checkpoint else None,
+                            session,
+                        )
+
+            if fast_load:
+                # Partitions must be as persistent as their partitioned table.
+                with metrics_stage("logged", table=staging_name), engine.begin() as conn:
+                    conn.execute(sa.text(f"ALTER TABLE {schema}.{staging_name} SET LOGGED"))
+                    conn.execute(sa.text(f"ANALYZE {schema}.{staging_name}"))
+            else:
+                pass
+
+            with metrics_stage("swap", table=partition_name(table_name, month)):
+                partition_swap(engine, schema, table_name, staging_name, month)
+        except BaseException:
+            if checkpoint:
+                # The staging table is kept, so its ingestion can be resumed later on.
+                _logger.warning(f"Table {schema}.{staging_name} kept in PostgreSQL database (see --resume).")
+            else:
+                with engine.begin() as conn:
+                    conn.execute(sa.text(f"DROP TABLE IF EXISTS {schema}.{staging_name}"))
+
+            raise
+
+    if index:
+        trips_index(engine, schema, table_name, index)
+    else:
+        pass
+
+    return None
+
+
+def data_ingest_zones(data_zones: pd.DataFrame, engine: sa.engine.Engine, pg_params: Dict[str, str]) -> None:
+    """
+    Ingests NYC taxi zones tabular data into a (newly created) table in a PostgreSQL database.
+
+    Args:
+        data_zones: NYC taxi zones tabular data to be ingested into a PostgreSQL database.
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        pg_params: PostgreSQL database connection parameters.
+    """
+    # Create a new table to store NYC taxi zones tabular data.
+    metrics = metrics_begin("create", table=pg_params["table_zones_name"])
+    data_zones.head(n=0).to_sql(
+        name=pg_params["table_zones_name"],
+        con=engine,
+        schema=pg_params["schema"],
+        if_exists="replace",
+        index=False,
+        dtype=TABLE_ZONES_DTYPES,
+    )
+    metrics_end(metrics)
+    _logger.info(f"New table {pg_params['schema']}.{pg_params['table_zones_name']} created in PostgreSQL database.")
+
+    # Import NYC taxi zones tabular data into the newly created table.
+    data_insert(
+        data_zones,
+        engine,
+        pg_params["schema"],
+        pg_params["table_zones_name"],
+        TABLE_ZONES_DTYPES,
+        int(pg_params["chunk_size"]),
+        pg_params["method"],
+        int(pg_params.get("mem_max_sql", "0")),
+    )
+
+    return None
+
+
+def rollup_aggregate(data: pa.Table, keys: List[str], aggregates: Dict[str, Tuple[str, str]]) -> pa.Table:
+    """
+    Returns the given aggregates of tabular data grouped by the given keys (a single vectorized group-by pass).
+
+    Args:
+        data: Tabular data to be aggregated.
+        keys: Columns/attributes tabular data is grouped by.
+        aggregates: Aggregates to be computed (name: column/attribute, function).
+
+    Returns:
+        Keys and aggregates (named after `aggregates`) of every group.
+    """
+    grouped = data.group_by(keys, use_threads=False).aggregate(
+        [(column, function) for column, function in dict.fromkeys(aggregates.values())]
+    )
+
+    return pa.table(
+        {key: grouped[key] for key in keys}
+        | {name: grouped[f"{column}_{function}"] for name, (column, function) in aggregates.items()}
+    )
+
+
+def rollup_dtypes(name: str) -> Dict[str, sa.types.TypeEngine]:
+    """
+    Returns the SQL type of each column/attribute of the companion table storing the given rollup (see ROLLUPS).
+
+    Args:
+        name: Rollup.
+
+    Returns:
+        SQL type of each key (month first) and aggregate of the given rollup.
+    """
+    dtypes = {key: ROLLUP_KEYS_DTYPES[key] for key in ["month", *ROLLUPS[name]["keys"]]}
+    for aggregate, (column, function) in ROLLUPS[name]["aggregates"].items():
+        if function == "count":
+            dtypes[aggregate] = sa.types.BIGINT
+        elif function == "sum":
+            dtypes[aggregate] = sa.types.DOUBLE_PRECISION
+        else:
+            dtypes[aggregate] = TABLE_TRIPS_DTYPES[column]
+
+    return dtypes
+
+
+def rollups_compute(data: pd.DataFrame | pa.Table, names: List[str]) -> Dict[str, pa.Table]:
+    """
+    Returns the given rollups (see ROLLUPS) of a batch of cleaned NYC taxi trips tabular data.
+
+    Only the columns/attributes required are converted to Arrow (if needed), and derived keys are computed once for
+    every rollup. Note that rollups of different batches are partial, so they must be merged (see `rollups_merge()`).
+
+    Args:
+        data: Cleaned NYC taxi trips tabular data (either a pandas DataFrame or an Arrow Table).
+        names: Rollups to be computed.
+
+    Returns:
+        Keys and aggregates of every group, per rollup.
+    """
+    metrics = metrics_begin("rollup")
+    keys = {key for name in names for key in ["month", *ROLLUPS[name]["keys"]]}
+    columns = {column for name in names for column, _ in ROLLUPS[name]["aggregates"].values()}
+    columns = sorted((columns | keys | {"tpep_pickup_datetime", "trip_distance"}) & set(TABLE_TRIPS_DTYPES))
+
+    if isinstance(data, pa.Table):
+        table = data.select(columns)
+    else:
+        table = pa.Table.from_pandas(data[columns], preserve_index=False)
+
+    for key in sorted(keys - set(columns)):
+        if key == "distance_bucket":
+            bounds = [0, *ROLLUP_DISTANCE_BUCKETS]
+            labels = [f"{low}-{high}" for low, high in zip(bounds, bounds[1:])] + [f"{bounds[-1]}+"]
+            buckets = np.searchsorted(ROLLUP_DISTANCE_BUCKETS, table["trip_distance"].to_numpy(), side="left")
+            table = table.append_column(key, pa.array(labels).take(buckets))
+        else:
+            table = table.append_column(key, pc.floor_temporal(table["tpep_pickup_datetime"], unit=key))
+
+    rollups = {
+        name: rollup_aggregate(table, ["month", *ROLLUPS[name]["keys"]], ROLLUPS[name]["aggregates"])
+        for name in names
+    }
+    metrics_end(metrics, data)
+
+    return rollups
+
+
+def rollups_merge(rollups: List[Dict[str, pa.Table]]) -> Dict[str, pa.Table]:
+    """
+    Merges partial rollups (see `rollups_compute()`), e.g., those of different batches of NYC taxi trips tabular data.
+
+    Args:
+        rollups: Partial rollups to be merged (keys and aggregates of every group, per rollup).
+
+    Returns:
+        Keys and aggregates of every group, per rollup.
+    """
+    merged = {}
+    for name in dict.fromkeys(name for rollups_i in rollups for name in rollups_i):
+        merged[name] = rollup_aggregate(
+            pa.concat_tables([rollups_i[name] for rollups_i in rollups if name in rollups_i]),
+            ["month", *ROLLUPS[name]["keys"]],
+            {
+                aggregate: (aggregate, ROLLUP_MERGE[function])
+                for aggregate, (_, function) in ROLLUPS[name]["aggregates"].items()
+            },
+        )
+
+    return merged
+
+
+def rollups_store(
+        rollups: Dict[str, pa.Table],
+        engine: sa.engine.Engine,
+        schema: str,
+        table_trips_name: str,
+        chunk_size: int,
+        replace: bool = False,
+) -> None:
+    """
+    Stores rollups of NYC taxi trips tabular data into their companion tables (`<table_trips>_<name>`), replacing only
+    the months they include (or every month, if `replace`).
+
+    Companion tables (keyed by month and the keys of their rollup) are created unless they already exist. The months
+    found in each rollup (or every month) are deleted and then copied (binary COPY) in a single transaction, so readers
+    of a companion table see either the previous or the new version of every month.
+
+    Args:
+        rollups: Keys and aggregates of every group, per rollup (see `rollups_compute()`).
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        schema: PostgreSQL schema of the companion tables.
+        table_trips_name: PostgreSQL table storing NYC taxi trips tabular data.
+        chunk_size: Number of rows inserted per COPY statement.
+        replace: If set, months not included in the rollups are deleted as well (e.g., the whole trips table has been
+            replaced).
+    """
+    for name, data in rollups.items():
+        table_name = f"{table_trips_name}_{name}"
+        dtypes = rollup_dtypes(name)
+        keys = ["month", *ROLLUPS[name]["keys"]]
+        table = sa.Table(
+            table_name,
+            sa.MetaData(),
+            *[sa.Column(column, dtype, primary_key=column in keys) for column, dtype in dtypes.items()],
+            schema=schema,
+        )
+        months = pc.unique(data["month"]).to_pylist()
+
+        with metrics_stage("rollup_store", table=table_name) as metrics, engine.begin() as conn:
+            table.create(conn, checkfirst=True)
+            if replace:
+                conn.execute(table.delete())
+            else:
+                conn.execute(table.delete().where(table.c.month.in_(months)))
+            psql_copy_binary(
+                data.select(list(dtypes)).sort_by([(key, "ascending") for key in keys]),
+                conn,
+                f"{schema}.{table_name}",
+                dtypes,
+                chunk_size,
+            )
+            conn.execute(sa.text(f"GRANT SELECT ON TABLE {schema}.{table_name} TO reader"))
+            metrics["rows"] = data.num_rows
+
+        _logger.info(
+            f"Rollup {schema}.{table_name} stored in PostgreSQL database ({data.num_rows} rows replacing "
+            + ("every month" if replace else ", ".join(f"{month:%Y-%m}" for month in sorted(months)))
+            + ")."
+        )
+
+    return None
+
+
+def data_ingest(
+        data_trips: pd.DataFrame | pa.Table | Iterable[pd.DataFrame | pa.Table],
+        data_zones: pd.DataFrame,
+        pg_params: Dict[str, str],
+) -> None:
+    """
+    Ingests NYC taxi tabular data into a PostgreSQL database.
+
+    Args:
+        data_trips: NYC taxi trips tabular data to be ingested into a PostgreSQL database. It can be provided either as
+            a single DataFrame (or Arrow Table) or as an iterable of DataFrames (or Arrow Tables) sharing the same
+            columns/attributes. In the latter case, each batch is ingested before the next one is requested.
+        data_zones: NYC taxi zones tabular data to be ingested into a PostgreSQL database.
+        pg_params: PostgreSQL database connection parameters. If `pg_params['partitioned']` is "True", the trips table
+            is range-partitioned by month and only the months found in `data_trips` are replaced. If
+            `pg_params['index']` is "True", trips are sorted by pickup datetime (within each batch) before being
+            ingested, and the trips table is indexed and analyzed afterwards (see `trips_index()`). If
+            `pg_params['rollups']` is set (comma-separated), those rollups (see ROLLUPS) are computed from every batch
+            while it is ingested, and their months are replaced in their companion tables afterwards (every month,
+            unless the trips table is partitioned, as the whole trips table is replaced then). If
+            `pg_params['resume']` is "True", rows already committed by an interrupted data ingestion are skipped (see
+            `data_ingest_replace()` and `data_ingest_partitioned()`).
+
+    Raises:
+        ValueError: If provided `pg_params['method']` is unsupported.
+    """
+    # Define the SQLAlchemy engine to enable communications between a client and the given PostgreSQL database.
+    engine = pg_engine(pg_params)
+    _logger.info("SQLAlchemy engine created successfully.")
+
+    if pg_params["method"] not in ["multi", "psql_insert_copy", "psql_copy_binary", "psql_copy_async", "None"]:
+        raise ValueError(f"Invalid method ({pg_params['method']})")
+
+    if isinstance(data_trips, (pd.DataFrame, pa.Table)):
+        batches_trips = iter([data_trips])
+    else:
+        batches_trips = iter(data_trips)
+
+    rollups_names = [name for name in pg_params.get("rollups", "").split(",") if name]
+    rollups = []
+
+    def rollups_tap(batches: Iterator[pd.DataFrame | pa.Table]) -> Iterator[pd.DataFrame | pa.Table]:
+        for batch in batches:
+            rollups.append(rollups_compute(batch, rollups_names))
+            if len(rollups) >= ROLLUP_MERGE_BATCHES:
+                rollups[:] = [rollups_merge(rollups)]
+            else:
+                pass
+
+            yield batch
+
+    if rollups_names:
+        batches_trips = rollups_tap(batches_trips)
+    else:
+        pass
+
+    if pg_params.get("index", "False") == "True":
+        batches_trips = (trips_sort(batch) for batch in batches_trips)
+    else:
+        pass
+
+    # With asynchronous COPY, NYC taxi zones tabular data is ingested (over its own connection) while NYC taxi trips
+    # tabular data is.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        if pg_params["method"] == "psql_copy_async":
+            future_zones = executor.submit(data_ingest_zones, data_zones, engine, pg_params)
+        else:
+            future_zones = None
+
+        # Import NYC taxi (monthly) trips tabular data.
+        if pg_params.get("partitioned", "False") == "True":
+            data_ingest_partitioned(batches_trips, engine, pg_params)
+        else:
+            data_ingest_replace(batches_trips, engine, pg_params)
+
+        if rollups:
+            rollups_store(
+                rollups_merge(rollups),
+                engine,
+                pg_params["schema"],
+                pg_params["table_trips_name"],
+                int(pg_params["chunk_size"]),
+                pg_params.get("partitioned", "False") != "True",
+            )
+        else:
+            pass
+
+        if future_zones is not None:
+            future_zones.result()
+        else:
+            data_ingest_zones(data_zones, engine, pg_params)
+
+    _logger.info(f"Tabular data (NYC taxi trips & zones) ingested into PostgreSQL database `{pg_params['db']}`.")
+
+    # Grant SELECT permissions (ro) to the `reader` role for the newly created table. Otherwise, `reader`s won't be able
+    # to access it.
+    query_trips = f"GRANT SELECT ON TABLE {pg_params['schema']}.{pg_params['table_trips_name']} TO reader"
+    query_zones = f"GRANT SELECT ON TABLE {pg_params['schema']}.{pg_params['table_zones_name']} TO reader"
+    with metrics_stage("grant"), engine.connect() as conn:
+        conn.execute(sa.text(query_trips))
+        conn.execute(sa.text(query_zones))
+        conn.commit()
+
+    _logger.info(
+        "Granted `SELECT` permissions to role `reader` in PostgreSQL new tables "
+        f"`{pg_params['schema']}.{pg_params['table_trips_name']}` "
+        f"and `{pg_params['schema']}.{pg_params['table_zones_name']}`."
+    )
+
+    return None
+
+
+def pipeline_get(queue: Queue, failed: Event, stats: Dict[str, float]) -> Iterator[Any]:
+    """
+    Yields the items received through a queue connecting two stages of a pipeline until its end-of-stream marker.
+
+    Args:
+        queue: Queue connecting the previous and current stages of the pipeline.
+        failed: Event set whenever any stage of the pipeline fails.
+        stats: Stats of the current stage of the pipeline (time spent waiting is added to `idle`).
+
+    Yields:
+        Items received through the queue.
+
+    Raises:
+        RuntimeError: If any other stage of the pipeline failed.
+    """
+    while True:
+        start = perf_counter()
+        while True:
+            try:
+                item = queue.get(timeout=0.1)
+                break
+            except Empty:
+                if failed.is_set():
+                    raise RuntimeError("Pipeline stopped, as another stage failed.")
+                else:
+                    pass
+
+        stats["idle"] += perf_counter() - start
+
+        if item is _PIPELINE_END:
+            return None
+        else:
+            yield item
+
+
+def pipeline_put(queue: Queue, item: Any, failed: Event, stats: Dict[str, float]) -> None:
+    """
+    Sends an item through a (bounded) queue connecting two stages of a pipeline.
+
+    Args:
+        queue: Queue connecting the current and next stages of the pipeline.
+        item: Item to be sent.
+        failed: Event set whenever any stage of the pipeline fails.
+        stats: Stats of the current stage of the pipeline (time spent waiting is added to `idle`).
+
+    Raises:
+        RuntimeError: If any other stage of the pipeline failed.
+    """
+    start = perf_counter()
+    while True:
+        try:
+            queue.put(item, timeout=0.1)
+            break
+        except Full:
+            if failed.is_set():
+                raise RuntimeError("Pipeline stopped, as another stage failed.")
+            else:
+                pass
+
+    stats["idle"] += perf_counter() - start
+
+    return None
+
+
+def pipeline_stage(
+        func: Callable[[Any], Iterable[Any]],
+        items: Iterable[Any],
+        queue: Queue,
+        failed: Event,
+        stats: Dict[str, float],
+) -> None:
+    """
+    Runs a stage of a pipeline, sending every output of `func` (for each input item) to the next stage.
+
+    Args:
+        func: Function run by the stage of the pipeline, returning the outputs for a given input item.
+        items: Input items of the stage of the pipeline.
+        queue: Queue connecting the current and next stages of the pipeline.
+        failed: Event set whenever any stage of the pipeline fails.
+        stats: Stats of the current stage of the pipeline (elapsed and idle time, number of outputs, and whether it was
+            the first stage to fail).
+    """
+    start = perf_counter()
+    try:
+        for item in items:
+            for output in func(item):
+                pipeline_put(queue, output, failed, stats)
+                stats["items"] += 1
+
+        pipeline_put(queue, _PIPELINE_END, failed, stats)
+    except BaseException:
+        # Only the first failure is meaningful, as it makes every other stage fail.
+        stats["failed"] = not failed.is_set()
+        failed.set()
+        raise
+    finally:
+        stats["elapsed"] = perf_counter() - start
+
+    return None
+
+
+def data_backfill(
+        months: List[str],
+        url_trips: str,
+        fname_trips: str | bytes | PathLike,
+        data_zones: pd.DataFrame,
+        pg_params: Dict[str, str],
+        chunk_size_dw: int,
+        segments_dw: int,
+        cache_max_bytes: int,
+        chunk_size_read: int | None,
+        engine: Literal["pandas", "arrow"],
+        refresh_clean_cache: bool = False,
+) -> None:
+    """
+    Ingests several months of NYC taxi trips tabular data into a PostgreSQL database (backfill).
+
+    Months are run through a three-stage pipeline (download, clean, and load), whose stages are connected by bounded
+    queues. Therefore, while month N+1 is downloaded, month N is cleaned and month N-1 is loaded, but no more than a
+    few months (or batches, if `chunk_size_read` is set) are kept in memory at any given time. Finally, a summary of the
+    utilization of each stage is logged to identify the bottleneck.
+
+    Args:
+        months: Months (YYYY-MM) of NYC taxi trips tabular data to be ingested.
+        url_trips: Remote url containing NYC taxi trips tabular data of any month (replaced by each of `months`).
+        fname_trips: Filename of the to-be-created local copy for NYC taxi trips tabular data of any month (replaced by
+            each of `months`).
+        data_zones: NYC taxi zones tabular data to be ingested into a PostgreSQL database.
+        pg_params: PostgreSQL database connection parameters.
+        chunk_size_dw: Chunk size to-be-used during data downloading.
+        segments_dw: Number of byte ranges downloaded in parallel (if supported by the remote location).
+        cache_max_bytes: Maximum size (in bytes) of the local download cache (0 disables it).
+        chunk_size_read: If set, NYC taxi trips tabular data is read, cleaned, and ingested in batches of (up to) this
+            many rows.
+        engine: Tabular data engine used to read and clean NYC taxi trips tabular data (pandas | arrow).
+        refresh_clean_cache: If set, cached cleaned NYC taxi trips tabular data is ignored and replaced.
+    """
+    def download(month: str) -> Iterator[str]:
+        data_download(
+            month_path(url_trips, month),
+            month_path(fname_trips, month),
+            chunk_size_dw,
+            segments=segments_dw,
+            cache_max_bytes=cache_max_bytes,
+        )
+        yield month
+
+    def clean(month: str) -> Iterator[pd.DataFrame | pa.Table]:
+        data_trips = data_prepare(
+            month_path(fname_trips, month),
+            month_dates(month),
+            chunk_size_read,
+            engine,
+            refresh_clean_cache,
+        )
+        if isinstance(data_trips, (pd.DataFrame, pa.Table)):
+            yield data_trips
+        else:
+            yield from data_trips
+
+    queue_downloaded = Queue(maxsize=1)
+    queue_cleaned = Queue(maxsize=1)
+    failed = Event()
+    stats = {stage: {"elapsed": 0., "idle": 0., "items": 0, "failed": False} for stage in ["download", "clean", "load"]}
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(pipeline_stage, download, months, queue_downloaded, failed, stats["download"]),
+            executor.submit(
+                pipeline_stage,
+                clean,
+                pipeline_get(queue_downloaded, failed, stats["clean"]),
+                queue_cleaned,
+                failed,
+                stats["clean"],
+            ),
+        ]
+
+        # Cleaned batches (of every month) are loaded as a single stream of NYC taxi trips tabular data.
+        try:
+            data_ingest(pipeline_get(queue_cleaned, failed, stats["load"]), data_zones, pg_params)
+        except BaseException:
+            failed.set()
+            for stage, future in zip(["download", "clean"], futures):
+                # Failures in the previous stages are reported instead of the ones they triggered in the load stage.
+                if future.exception() is not None and stats[stage]["failed"]:
+                    raise future.exception() from None
+                else:
+                    pass
+
+            raise
+        finally:
+            stats["load"]["elapsed"] = perf_counter() - start
+
+    tex = perf_counter() - start
+
+    stats["load"]["items"] = stats["clean"]["items"]
+    for stage, stats_stage in stats.items():
+        busy = stats_stage["elapsed"] - stats_stage["idle"]
+        _logger.info(
+            f"Stage {stage}: {busy:.2f} s busy out of {tex:.2f} s ({100 * busy / tex:.1f}% utilization; "
+            f"{stats_stage['items']} items)."
+        )
+
+    _logger.info(f"{len(months)} months of NYC taxi trips tabular data ingested in {tex:.2f} s.")
+
+    return None
+
+
+def export_schema(dtypes: Dict[str, sa.types.TypeEngine]) -> pa.Schema:
+    """
+    Returns the Arrow schema of tabular data exported from a PostgreSQL table (see `data_export()`).
+
+    Args:
+        dtypes: SQL type of each column/attribute to be exported (TIMESTAMP, BIGINT, INTEGER, DOUBLE PRECISION, or
+            REAL).
+
+    Returns:
+        Arrow schema (TIMESTAMP as timestamp[us], BIGINT as int64, INTEGER as int32, DOUBLE PRECISION as float64, and
+        REAL as float32).
+
+    Raises:
+        ValueError: If any of the provided `dtypes` is unsupported.
+    """
+    fields = []
+    for column, dtype in dtypes.items():
+        dtype = dtype() if isinstance(dtype, type) else dtype
+        if isinstance(dtype, sa.types.DateTime):
+            fields.append(pa.field(column, pa.timestamp("us")))
+        elif isinstance(dtype, sa.types.BigInteger):
+            fields.append(pa.field(column, pa.int64()))
+        elif isinstance(dtype, sa.types.Integer):
+            fields.append(pa.field(column, pa.int32()))
+        elif isinstance(dtype, sa.types.Double):
+            fields.append(pa.field(column, pa.float64()))
+        elif isinstance(dtype, sa.types.Float):
+            fields.append(pa.field(column, pa.float32()))
+        else:
+            raise ValueError(f"Unsupported SQL type ({dtype}) during data export.")
+
+    return pa.schema(fields)
+
+
+def export_query(
+        schema: str,
+        table_name: str,
+        columns: List[str],
+        fmt: Literal["binary", "csv"],
+        dates: Tuple[datetime, datetime] | None = None,
+) -> str:
+    """
+    Returns the COPY statement exporting NYC taxi trips tabular data from a PostgreSQL table.
+
+    In PostgreSQL binary COPY format, NULL values are replaced by zero and flagged in a trailing bitmask (`_nulls`, a
+    BIGINT whose i-th bit is set when the i-th column/attribute is NULL), so every tuple has the same width and can be
+    decoded as a whole (see `pgcopy_decode()`).
+
+    Args:
+        schema: PostgreSQL schema of the table.
+        table_name: PostgreSQL table storing NYC taxi trips tabular data.
+        columns: Columns/attributes to be exported (up to 63, in PostgreSQL binary COPY format).
+        fmt: COPY format (binary | csv).
+        dates: If set, time period boundaries of the NYC taxi trips to be exported (pickup datetime).
+
+    Returns:
+        COPY statement writing NYC taxi trips tabular data to STDOUT.
+
+    Raises:
+        ValueError: If there are too many `columns` to be flagged in the bitmask.
+    """
+    if fmt == "binary":
+        if len(columns) > 63:
+            raise ValueError(f"Too many columns/attributes ({len(columns)}) to be exported in binary COPY format.")
+        else:
+            pass
+
+        dtypes = {column: TABLE_TRIPS_DTYPES[column] for column in columns}
+        select = [
+            f'''coalesce("{column}", {"'epoch'" if dtypes[column] is sa.types.TIMESTAMP else 0})'''
+            for column in columns
+        ]
+        # Adding up constants is cheaper (server-side) than casting and shifting every IS NULL test.
+        select.append(
+            "(" + " + ".join(
+                f'CASE WHEN "{column}" IS NULL THEN {1 << i}::bigint ELSE 0::bigint END'
+                for i, column in enumerate(columns)
+            ) + ') AS "_nulls"'
+        )
+    else:
+        select = [f'"{column}"' for column in columns]
+
+    if dates is not None:
+        where = (
+            f""" WHERE "tpep_pickup_datetime" >= '{dates[0]:%Y-%m-%d}'"""
+            f""" AND "tpep_pickup_datetime" < '{dates[1]:%Y-%m-%d}'"""
+        )
+    else:
+        where = ""
+
+    return f"COPY (SELECT {', '.join(select)} FROM {schema}.{table_name}{where}) TO STDOUT WITH (FORMAT {fmt})"
+
+
+def export_months(engine: sa.engine.Engine, schema: str, table_name: str) -> List[str]:
+    """
+    Returns every month (YYYY-MM) between the first and last pickup datetimes stored in a table of NYC taxi trips.
+
+    Args:
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        schema: PostgreSQL schema of the table.
+        table_name: PostgreSQL table storing NYC taxi trips tabular data.
+
+    Returns:
+        Every month (YYYY-MM) between the first and last pickup datetimes (none, if the table is empty).
+    """
+    with engine.connect() as conn:
+        first, last = conn.execute(sa.text(
+            f'SELECT min("tpep_pickup_datetime"), max("tpep_pickup_datetime") FROM {schema}.{table_name}'
+        )).one()
+
+    if first is None:
+        return []
+    else:
+        return month_range(f"{first:%Y-%m}..{last:%Y-%m}")
+
+
+def data_export_stream(
+        engine: sa.engine.Engine,
+        sql: str,
+        fmt: Literal["binary", "csv"],
+        schema: pa.Schema,
+        chunk_size: int,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Yields tabular data exported by a COPY statement (to STDOUT), one record batch at a time, as it is received.
+
+    The COPY statement is run in its own thread, which writes its output to a pipe, from which it is parsed as it
+    arrives. Therefore, memory usage is bounded by the pipe and a single record batch, whatever the number of rows
+    exported. CSV is parsed by multiple threads (in blocks of CSV_BLOCK_SIZE bytes), whereas PostgreSQL binary COPY
+    format is decoded `chunk_size` rows at a time (see `pgcopy_decode()`).
+
+    Args:
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        sql: COPY statement writing tabular data to STDOUT (see `export_query()`).
+        fmt: COPY format (binary | csv).
+        schema: Arrow schema of the exported columns/attributes (see `export_schema()`).
+        chunk_size: Number of rows per record batch (PostgreSQL binary COPY format only).
+
+    Yields:
+        Exported tabular data, one record batch at a time.
+
+    Raises:
+        ValueError: If the output of the COPY statement is truncated or not laid out as expected.
+    """
+    fd_read, fd_write = pipe()
+
+    def copy() -> None:
+        with open(fd_write, "wb") as f, engine.connect() as conn:
+            with conn.connection.cursor() as cur:
+                cur.copy_expert(sql=sql, file=f)
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(copy)
+    executor.shutdown(wait=False)
+
+    file_read = open(fd_read, "rb")
+    # Bytes of an incomplete tuple (or the file trailer) left over after the last record batch.
+    rest = b""
+    try:
+        if fmt == "csv":
+            # Arrow refuses to open an empty CSV file (i.e., no NYC taxi trips exported).
+            if file_read.peek(1):
+                yield from pacsv.open_csv(
+                    pa.PythonFile(file_read, mode="r"),
+                    read_options=pacsv.ReadOptions(
+                        use_threads=True,
+                        block_size=CSV_BLOCK_SIZE,
+                        column_names=schema.names,
+                    ),
+                    convert_options=pacsv.ConvertOptions(column_types=schema),
+                )
+            else:
+                pass
+        else:
+            header = file_read.read(len(PGCOPY_HEADER))
+            # Its header is only missing if the COPY statement failed (reported below).
+            if header != PGCOPY_HEADER and len(header) == len(PGCOPY_HEADER):
+                raise ValueError("Unexpected file header in PostgreSQL binary COPY format.")
+            else:
+                pass
+
+            # Field count (2 bytes), and then length (4 bytes) and value of each field (including the bitmask).
+            width = 2 + sum(4 + field.type.bit_width // 8 for field in schema) + 4 + 8
+            while block := file_read.read(chunk_size * width):
+                block = rest + block if rest else block
+                rows = len(block) // width
+                if rows > 0:
+                    yield pgcopy_decode(memoryview(block)[:rows * width], schema)
+                else:
+                    pass
+
+                rest = block[rows * width:]
+    except BaseException:
+        # Closing the pipe stops the COPY statement (if still running). Its own failure (e.g., a connection reset), if
+        # any, is reported instead of the one it triggered while parsing (e.g., a truncated row).
+        file_read.close()
+        error_copy = future.exception()
+        if error_copy is not None and not isinstance(error_copy, BrokenPipeError):
+            raise error_copy from None
+        else:
+            raise
+
+    file_read.close()
+    future.result()
+
+    if fmt == "binary" and rest != PGCOPY_TRAILER:
+        raise ValueError("Truncated tabular data in PostgreSQL binary COPY format (file trailer not found).")
+    else:
+        pass
+
+
+def data_export_file(batches: Iterable[pa.RecordBatch], schema: pa.Schema, fname: Path) -> Tuple[int, int]:
+    """
+    Writes tabular data into a local file (PARQUET format), one record batch (row group) at a time.
+
+    Record batches are written to a partial file as they arrive, which is only renamed once every one of them has been
+    written (or removed otherwise).
+
+    Args:
+        batches: Tabular data, one record batch at a time.
+        schema: Arrow schema of the tabular data.
+        fname: Local path where tabular data will be stored (PARQUET format).
+
+    Returns:
+        Number of rows and size (in bytes, in memory) of the tabular data written.
+    """
+    fname_part = fname.with_name(f"{fname.name}.part")
+    rows, nbytes = 0, 0
+    try:
+        with pq.ParquetWriter(fname_part, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+                nbytes += batch.nbytes
+    except BaseException:
+        fname_part.unlink(missing_ok=True)
+        raise
+
+    fname_part.replace(fname)
+
+    return rows, nbytes
 
-    Args:
-        data: NYC taxi trips tabular data to be ingested into a PostgreSQL database.
-        data: NYC taxi trips tabular data to be ingested into a PostgreSQL database.
-        pg_params: PostgreSQL database connection parameters.
 
-    Raises:
-        ValueError: If provided `pg_params['method']` is unsupported.
+def data_export(
+        engine: sa.engine.Engine,
+        schema: str,
+        table_name: str,
+        fname: str | bytes | PathLike,
+        fmt: Literal["binary", "csv"],
+        chunk_size: int,
+        months: List[str] | None = None,
+        by_month: bool = False,
+) -> List[Path]:
     """
+    Exports NYC taxi trips tabular data from a PostgreSQL table into local files (PARQUET format).
 
-    table_trips_dtypes = {
-        "tpep_pickup_datetime": sa.types.TIMESTAMP,
-        "tpep_dropoff_datetime": sa.types.TIMESTAMP,
-        "dt": sa.types.BIGINT,
-        "trip_distance": sa.types.REAL,
-        "avg_speed": sa.types.REAL,
-        "PULocationID": sa.types.INTEGER,
-        "DOLocationID": sa.types.INTEGER,
-        "RatecodeID": sa.types.INTEGER,
-        "passenger_count": sa.types.INTEGER,
-        "total_amount": sa.types.REAL,
-        "fare_amount": sa.types.REAL,
-        "tip_amount": sa.types.REAL,
-        "tolls_amount": sa.types.REAL,
-        "extra": sa.types.REAL,
-        "mta_tax": sa.types.REAL,
-        "improvement_surcharge": sa.types.REAL,
-        "congestion_surcharge": sa.types.REAL,
-        "airport_fee": sa.types.REAL,
-        "payment_type": sa.types.INTEGER,
-        "VendorID": sa.types.INTEGER,
-    }
-
-    table_zones_dtypes = {
-        "LocationID": sa.types.INTEGER,
-        "Borough": sa.types.String(15),
-        "Zone": sa.types.String(45),
-        "service_zone": sa.types.String(15),
-    }
+    NYC taxi trips are streamed by a COPY statement (see `export_query()`) and written as they are parsed (see
+    `data_export_stream()`), so memory usage does not grow with the number of rows exported, unlike `pd.read_sql()`
+    (which builds Python objects for every single value).
 
-    # Define the SQLAlchemy engine to enable communications between a client and the given PostgreSQL database.
-    url = (
-        f"postgresql://{pg_params['username']}:{pg_params['passwd']}"
-        f"@{pg_params['host']}:{pg_params['port']}/{pg_params['db']}"
-    )
-    connect_args = {
-        "sslmode": "require",
-        "sslrootcert": str(PATHS["certs"]/"server-ca.crt"),
-        "sslcert": str(PATHS["certs"]/"fmerinocasallo_writer.crt"),
-        "sslkey": str(PATHS["certs"]/"fmerinocasallo_writer.key"),
-    }
+    Args:
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        schema: PostgreSQL schema of the table.
+        table_name: PostgreSQL table storing NYC taxi trips tabular data.
+        fname: Local path where NYC taxi trips tabular data will be stored (PARQUET format), within `PATHS["data"]`.
+        fmt: COPY format (binary | csv).
+        chunk_size: Number of rows per record batch (PostgreSQL binary COPY format only).
+        months: If set, months (YYYY-MM) of the NYC taxi trips to be exported (pickup datetime). Otherwise, every NYC
+            taxi trip is exported.
+        by_month: If set, every month is exported into its own file, replacing the month in `fname` (e.g.,
+            `yellow_tripdata_2021-01.parquet`). Months default to those between the first and last pickup datetimes.
 
-    engine = sa.create_engine(url=url, connect_args=connect_args)
-    _logger.info("SQLAlchemy engine created successfully.")
+    Returns:
+        Local paths where NYC taxi trips tabular data was stored.
+    """
+    fname = PATHS["data"]/Path(fname).name
+    columns = list(TABLE_TRIPS_DTYPES)
+    schema_arrow = export_schema(TABLE_TRIPS_DTYPES)
 
-    chunk_size = int(pg_params["chunk_size"])
+    if by_month:
+        if months is None:
+            months = export_months(engine, schema, table_name)
+        else:
+            pass
 
-    if pg_params["method"] == "psql_insert_copy":
-        method = psql_insert_copy
-    elif pg_params["method"] == "None":
-        method = None
-    elif pg_params["method"] == "multi":
-        pass
+        exports = [(Path(month_path(fname, month)), month_dates(month)) for month in months]
+    elif months is not None:
+        exports = [(fname, (month_dates(months[0])[0], month_dates(months[-1])[1]))]
     else:
-        raise ValueError(f"Invalid method ({pg_params['method']})")
+        exports = [(fname, None)]
 
-    # Create a new table to store NYC taxi trips tabular data.
-    data_trips.head(n=0).to_sql(
-        name=pg_params["table_trips_name"],
-        con=engine,
-        schema=pg_params["schema"],
-        if_exists="replace",
-        index=False,
-        chunksize=chunk_size,
-        method=method,
-        dtype=table_trips_dtypes,
-    )
-    _logger.info(f"New table {pg_params['schema']}.{pg_params['table_trips_name']} created in PostgreSQL database.")
+    fnames = []
+    for fname_i, dates in exports:
+        sql = export_query(schema, table_name, columns, fmt, dates)
+        with metrics_stage("export", table=table_name, fname=fname_i.name, format=fmt) as metrics:
+            batches = data_export_stream(engine, sql, fmt, schema_arrow, chunk_size)
+            metrics["rows"], metrics["bytes"] = data_export_file(batches, schema_arrow, fname_i)
 
-    # Create a new table to store NYC taxi zones tabular data.
-    data_zones.head(n=0).to_sql(
-        name=pg_params["table_zones_name"],
-        con=engine,
-        schema=pg_params["schema"],
-        if_exists="replace",
-        index=False,
-        chunksize=chunk_size,
-        method=method,
-        dtype=table_zones_dtypes,
-    )
-    _logger.info(f"New table {pg_params['schema']}.{pg_params['table_zones_name']} created in PostgreSQL database.")
+        _logger.info(
+            f"{metrics['rows']} NYC taxi trips exported from {schema}.{table_name} into {fname_i} in "
+            f"{metrics['wall']:.2f} s ({metrics['rows'] / max(metrics['wall'], 1e-9):.0f} rows/s)."
+        )
+        fnames.append(fname_i)
 
-    # Import NYC taxi (monthly) trips tabular data into the newly created table.
-    data_trips.to_sql(
-        name=pg_params["table_trips_name"],
-        con=engine,
-        schema=pg_params["schema"],
-        if_exists="append",
-        index=False,
-        chunksize=chunk_size,
-        method=method,
-        dtype=table_trips_dtypes,
-    )
+    return fnames
 
-    # Import NYC taxi zones tabular data into the newly created table.
-    data_zones.to_sql(
-        name=pg_params["table_zones_name"],
-        con=engine,
-        schema=pg_params["schema"],
-        if_exists="append",
-        index=False,
-        chunksize=chunk_size,
-        method=method,
-        dtype=table_zones_dtypes,
-    )
 
-    _logger.info(f"Tabular data (NYC taxi trips & zones) ingested into PostgreSQL database `{pg_params['db']}`.")
+class IngestDefaultGroup(click.Group):
+    """
+    Group of commands defaulting to `ingest`, so data ingestion is still run without naming it (e.g.,
+    `python data_manager.py --url-trips=... --url-zones=...`).
+    """
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = ["ingest", *args]
+        else:
+            pass
 
-    # Grant SELECT permissions (ro) to the `reader` role for the newly created table. Otherwise, `reader`s won't be able
-    # to access it.
-    query_trips = f"GRANT SELECT ON TABLE {pg_params['schema']}.{pg_params['table_trips_name']} TO reader"
-    query_zones = f"GRANT SELECT ON TABLE {pg_params['schema']}.{pg_params['table_zones_name']} TO reader"
-    with engine.connect() as conn:
-        conn.execute(sa.text(query_trips))
-        conn.execute(sa.text(query_zones))
-        conn.commit()
+        return super().parse_args(ctx, args)
 
-    _logger.info(
-        "Granted `SELECT` permissions to role `reader` in PostgreSQL new tables "
-        f"`{pg_params['schema']}.{pg_params['table_trips_name']}` "
-        f"and `{pg_params['schema']}.{pg_params['table_zones_name']}`."
-    )
 
+@click.group(cls=IngestDefaultGroup)
+def cli() -> None:
+    """
+    Ingest tabular data (NYC taxi trips) into a PostgreSQL database (default command), or export it back.
+    """
     return None
 
 
-@click.command()
+@cli.command(name="ingest")
 @click.option(
     '--url-trips',
     type=click.STRING,
@@ -454,6 +4594,12 @@ def data_ingest(
     type=click.STRING,
     required=True,
     help='Remote url containing NYC taxi zones tabular data to be ingested into a PostgreSQL database')
+@click.option(
+    '--months',
+    type=click.STRING,
+    default=None,
+    help='Range of months (YYYY-MM..YYYY-MM) to be ingested, replacing the month in --url-trips and --fname-trips.',
+)
 @click.option(
     '--fname-trips',
     type=click.Path(resolve_path=True, path_type=Path),
@@ -520,21 +4666,133 @@ def data_ingest(
     default=1024,
     help='Chunk size to-be-used during data downloading.',
 )
+@click.option(
+    '--segments-dw',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Number of byte ranges downloaded in parallel (if supported by the remote location).',
+)
+@click.option(
+    '--cache-max-bytes',
+    type=click.IntRange(min=0),
+    default=2**31,
+    help='Maximum size (in bytes) of the local download cache (0 disables it).',
+)
+@click.option(
+    '--stream-dw',
+    is_flag=True,
+    default=False,
+    help='Read and clean NYC taxi trips tabular data (CSV | CSV.GZ format) while it is downloaded (single stream).',
+)
 @click.option(
     '--chunk-size-sql',
     type=click.INT,
     default=1024,
     help='Chunk size to-be-used during data ingestion.',
 )
+@click.option(
+    '--mem-max-sql',
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        'If set, memory ceiling (in MiB, per process) during data ingestion. The chunk size is then adapted to the '
+        'throughput and memory growth measured on each chunk, starting from `--chunk-size-sql`.'
+    ),
+)
+@click.option(
+    '--chunk-size-read',
+    type=click.IntRange(min=1),
+    default=None,
+    help='If set, NYC taxi trips tabular data is read, cleaned, and ingested in batches of (up to) this many rows.',
+)
+@click.option(
+    '--engine',
+    type=click.Choice(['pandas', 'arrow']),
+    default="pandas",
+    help='Tabular data engine used to read and clean NYC taxi trips tabular data.',
+)
+@click.option(
+    '--disable-clean-rule',
+    type=click.Choice([name for name, rule in CLEAN_RULES.items() if not rule["required"]]),
+    multiple=True,
+    help='Rule identifying bad NYC taxi trips to-be-disabled during data cleaning (can be repeated).',
+)
+@click.option(
+    '--enable-clean-rule',
+    type=click.Choice(list(CLEAN_RULES)),
+    multiple=True,
+    help='Rule identifying bad NYC taxi trips to-be-enabled during data cleaning (can be repeated).',
+)
+@click.option(
+    '--clean-report',
+    type=click.Path(resolve_path=True, path_type=Path),
+    default=None,
+    help='Filename (JSON format) of the to-be-created report of the rules identifying bad NYC taxi trips.',
+)
+@click.option(
+    '--refresh-clean-cache',
+    is_flag=True,
+    default=False,
+    help='Ignore (and replace) cached cleaned NYC taxi trips tabular data.',
+)
+@click.option(
+    '--workers',
+    type=click.IntRange(min=1),
+    default=1,
+    help='Number of worker processes (each one with its own connection) used during NYC taxi trips data ingestion.',
+)
+@click.option(
+    '--partitioned',
+    is_flag=True,
+    default=False,
+    help='Range-partition the NYC taxi trips table by month, replacing only the partitions of the ingested months.',
+)
+@click.option(
+    '--fast-load',
+    is_flag=True,
+    default=False,
+    help='Ingest NYC taxi trips into an UNLOGGED staging table, indexed and swapped in for the destination one later.',
+)
+@click.option(
+    '--index',
+    is_flag=True,
+    default=False,
+    help='Sort NYC taxi trips by pickup datetime before ingesting them, then index (BRIN, btree) and analyze them.',
+)
+@click.option(
+    '--rollup',
+    type=click.Choice(list(ROLLUPS)),
+    multiple=True,
+    help='Rollup of NYC taxi trips to-be-computed during data ingestion into its companion table (can be repeated).',
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    default=False,
+    help='Resume an interrupted NYC taxi trips data ingestion, skipping the batches already committed.',
+)
 @click.option(
     '--method-sql',
-    type=click.Choice(['multi', 'psql_insert_copy', 'None']),
+    type=click.Choice(['multi', 'psql_insert_copy', 'psql_copy_binary', 'psql_copy_async', 'None']),
     default="psql_insert_copy",
     help='Controls the SQL insertion clause used.',
 )
+@click.option(
+    '--metrics',
+    type=click.Path(resolve_path=True, path_type=Path),
+    default=None,
+    help='Filename (JSON-lines format) where per-stage metrics (time, CPU, memory, rows, and bytes) are appended.',
+)
+@click.option(
+    '--metrics-prom',
+    type=click.Path(resolve_path=True, path_type=Path),
+    default=None,
+    help='Filename (Prometheus textfile collector format) of the to-be-created per-stage metrics.',
+)
 def main(
     url_trips: str,
     url_zones: str,
+    months: str | None,
     fname_trips: str | bytes | PathLike,
     fname_zones: str | bytes | PathLike,
     username: str,
@@ -546,8 +4804,26 @@ def main(
     table_trips: str,
     table_zones: str,
     chunk_size_dw: int,
+    segments_dw: int,
+    cache_max_bytes: int,
+    stream_dw: bool,
     chunk_size_sql: int,
+    mem_max_sql: int | None,
+    chunk_size_read: int | None,
+    engine: str,
+    disable_clean_rule: Tuple[str, ...],
+    enable_clean_rule: Tuple[str, ...],
+    clean_report: str | bytes | PathLike | None,
+    refresh_clean_cache: bool,
+    workers: int,
+    partitioned: bool,
+    fast_load: bool,
+    index: bool,
+    rollup: Tuple[str, ...],
+    resume: bool,
     method_sql: str,
+    metrics: str | bytes | PathLike | None,
+    metrics_prom: str | bytes | PathLike | None,
 ) -> None:
     """
     Ingest tabular data (NYC taxi trips) into a PostgreSQL database from a remote location (url).
@@ -555,6 +4831,8 @@ def main(
     Args:
         url_trips: Remote url containing NYC taxi trips tabular data to be ingested into a PostgreSQL database.
         url_zones: Remote url containing NYC taxi zones tabular data to be ingested into a PostgreSQL database.
+        months: If set, range of months (YYYY-MM..YYYY-MM) to be ingested (backfill), replacing the month in
+            `url-trips` and `fname-trips`.
         fname_trips: Filename of the to-be-created local copy for NYC taxi trips tabular data.
         fname_zones: Filename of the to-be-created local copy for NYC taxi zones tabular data.
         username: PostgreSQL username used during data ingestion.
@@ -566,9 +4844,57 @@ def main(
         table_trips: PostgreSQL table to-be-ingested with imported NYC taxi trips tabular data from `url-trips`.
         table_zones: PostgreSQL table to-be-ingested with imported NYC taxi trips tabular data from `url-zones`.
         chunk_size_dw: Chunk size to-be-used during data downloading.
+        segments_dw: Number of byte ranges downloaded in parallel (if supported by the remote location).
+        cache_max_bytes: Maximum size (in bytes) of the local download cache (0 disables it).
+        stream_dw: If set, NYC taxi trips tabular data (CSV | CSV.GZ format) is read and cleaned while it is downloaded
+            (see `data_download_tee()`), instead of read from its local copy once downloaded. Ignored for PARQUET files
+            (whose metadata is stored in their footer) and backfills (whose months are already downloaded while the
+            previous ones are cleaned).
         chunk_size_sql: Chunk size to-be-used during data ingestion.
-        method_sql: Controls the SQL insertion clause used.
+        mem_max_sql: If set, memory ceiling (in MiB, per process) during data ingestion. The chunk size is then adapted
+            online (additive increase, multiplicative decrease) to the throughput and memory growth measured on each
+            chunk, starting from `chunk_size_sql`, and the chunk sizes chosen are logged (and recorded as metrics).
+        chunk_size_read: If set, NYC taxi trips tabular data is read, cleaned, and ingested in batches of (up to) this
+            many rows. Otherwise, the whole NYC taxi trips tabular data is loaded into memory at once.
+        engine: Tabular data engine used to read and clean NYC taxi trips tabular data (pandas | arrow). The arrow
+            engine never converts NYC taxi trips tabular data to pandas when combined with `psql_copy_binary` (or
+            `psql_copy_async`).
+        disable_clean_rule: Rules identifying bad NYC taxi trips to-be-disabled during data cleaning (see
+            CLEAN_RULES).
+        enable_clean_rule: Rules identifying bad NYC taxi trips to-be-enabled during data cleaning (see CLEAN_RULES).
+        clean_report: If set, filename (JSON format) of the to-be-created report of the rules identifying bad NYC taxi
+            trips (rows rejected, elapsed time, and memory per rule). Note that cached cleaned tabular data is not
+            evaluated again (see `refresh_clean_cache`).
+        refresh_clean_cache: If set, cached cleaned NYC taxi trips tabular data (stored next to `fname-trips`) is
+            ignored and replaced.
+        workers: Number of worker processes (each one with its own connection) used during NYC taxi trips data
+            ingestion.
+        partitioned: If set, the NYC taxi trips table is range-partitioned by month (pickup datetime), so only the
+            partitions of the ingested months are replaced. Otherwise, the whole table is replaced.
+        fast_load: If set, NYC taxi trips tabular data is ingested into an `UNLOGGED` staging table without indexes,
+            which is switched to `LOGGED`, indexed, analyzed, and swapped in for the destination table afterwards.
+        index: If set, NYC taxi trips tabular data is sorted by pickup datetime before being ingested (within each
+            batch, if `chunk_size_read` is set), so table blocks store consecutive pickup datetimes. Afterwards, the
+            trips table is indexed (BRIN on pickup datetime, btree on pickup and dropoff locations; each one built over
+            its own connection) and analyzed.
+        rollup: Rollups (see ROLLUPS) to-be-computed from cleaned NYC taxi trips tabular data while it is ingested
+            (a vectorized group-by pass per batch), and stored in their companion tables (`<table_trips>_<rollup>`),
+            which are replaced as the trips table is (only the months ingested, if `partitioned`).
+        resume: If set, an interrupted NYC taxi trips data ingestion (with the same settings and cleaning rules) is
+            resumed. Every batch is committed along with its row range in a progress table (`ingest_progress`), so
+            batches already committed are skipped (or months, if `partitioned`), and the destination table is not
+            replaced. Requires a single worker and no fast load.
+        method_sql: Controls the SQL insertion clause used. With `psql_copy_async`, data is streamed asynchronously
+            (binary COPY), serializing the next chunk while the current one is sent, and NYC taxi zones tabular data is
+            ingested while NYC taxi trips tabular data is.
+        metrics: If set, filename (JSON-lines format) where per-stage metrics (download, read, clean, create, copy,
+            grant, etc.) are appended. Each record includes its elapsed real (wall clock) time, CPU time, peak resident
+            set size, and rows and bytes processed. A final `run` record covers the whole data ingestion and includes
+            its settings.
+        metrics_prom: If set, filename (Prometheus textfile collector format) of the to-be-created per-stage metrics.
     """
+    global _metrics_fname
+
     if not validators.url(url_trips):
         raise ValueError(f"[FATAL] url is invalid ({url_trips}). Exiting...")
     else:
@@ -579,9 +4905,37 @@ def main(
     else:
         pass
 
+    if months is not None:
+        months = month_range(months)
+    else:
+        pass
+
     fname_trips = sanitize_filepath(fname_trips)
+    if data_format(fname_trips) != "csv" and stream_dw:
+        _logger.warning("PARQUET files cannot be read until downloaded (footer metadata). Ignoring --stream-dw.")
+        stream_dw = False
+    elif stream_dw and months is not None:
+        _logger.warning("Months are already downloaded while the previous ones are cleaned. Ignoring --stream-dw.")
+        stream_dw = False
+    else:
+        pass
+
     fname_zones = sanitize_filepath(fname_zones)
 
+    if set(disable_clean_rule) & set(enable_clean_rule):
+        raise ValueError(
+            f"[FATAL] clean rules are both disabled and enabled ({set(disable_clean_rule) & set(enable_clean_rule)}). "
+            "Exiting..."
+        )
+    else:
+        pass
+
+    for name in disable_clean_rule:
+        CLEAN_RULES[name]["enabled"] = False
+
+    for name in enable_clean_rule:
+        CLEAN_RULES[name]["enabled"] = True
+
     password = open(password).readline().rstrip()
 
     if not validators.hostname(host, may_have_port=False):
@@ -616,19 +4970,34 @@ def main(
     else:
         pass
 
-    data_download(url_trips, fname_trips, chunk_size=chunk_size_dw)
-    data_download(url_zones, fname_zones, chunk_size=chunk_size_dw)
-
-    data_trips = data_read(fname_trips)
-    data_zones = data_read(fname_zones)
+    if resume and (workers > 1 or fast_load):
+        # Batches are only checkpointed when committed along with their progress, one after another.
+        raise ValueError("[FATAL] --resume is incompatible with --workers > 1 and --fast-load. Exiting...")
+    else:
+        pass
 
-    date_start = [int(x) for x in Path(url_trips).stem.split("_")[2].split("-")]
-    dates = [
-        datetime(year=date_start[0], month=date_start[1], day=1),
-        datetime(year=date_start[0], month=date_start[1], day=1) + relativedelta(months=+1),
-    ]
+    _metrics_fname = metrics
+    metrics_run = metrics_begin(
+        "run",
+        months=months,
+        chunk_size_dw=chunk_size_dw,
+        segments_dw=segments_dw,
+        stream_dw=stream_dw,
+        chunk_size_sql=chunk_size_sql,
+        mem_max_sql=mem_max_sql,
+        chunk_size_read=chunk_size_read,
+        engine=engine,
+        workers=workers,
+        partitioned=partitioned,
+        fast_load=fast_load,
+        index=index,
+        rollups=list(rollup),
+        resume=resume,
+        method=method_sql,
+    )
 
-    data_trips = data_clean(data_trips, dates)
+    data_download(url_zones, fname_zones, chunk_size_dw, segments=segments_dw, cache_max_bytes=cache_max_bytes)
+    data_zones = data_read(fname_zones)
 
     pg_params = {
         "username": username,
@@ -640,15 +5009,257 @@ def main(
         "table_trips_name": table_trips_name,
         "table_zones_name": table_zones_name,
         "chunk_size": str(chunk_size_sql),
+        "mem_max_sql": str(mem_max_sql * 2**20 if mem_max_sql is not None else 0),
         "method": method_sql,
+        "workers": str(workers),
+        "partitioned": str(partitioned),
+        "fast_load": str(fast_load),
+        "index": str(index),
+        "rollups": ",".join(rollup),
+        "resume": str(resume),
     }
 
     print(f"pg_params: {pg_params}", flush=True)
 
-    data_ingest(data_trips, data_zones, pg_params)
+    if months is not None:
+        data_backfill(
+            months,
+            url_trips,
+            fname_trips,
+            data_zones,
+            pg_params,
+            chunk_size_dw,
+            segments_dw,
+            cache_max_bytes,
+            chunk_size_read,
+            engine,
+            refresh_clean_cache,
+        )
+    elif stream_dw:
+        dates = month_dates(path_month(url_trips))
+        data_trips = data_prepare(
+            fname_trips,
+            dates,
+            chunk_size_read,
+            engine,
+            refresh_clean_cache,
+            url=url_trips,
+            chunk_size_dw=chunk_size_dw,
+            cache_max_bytes=cache_max_bytes,
+        )
+
+        data_ingest(data_trips, data_zones, pg_params)
+    else:
+        data_download(url_trips, fname_trips, chunk_size_dw, segments=segments_dw, cache_max_bytes=cache_max_bytes)
+
+        dates = month_dates(path_month(url_trips))
+        data_trips = data_prepare(fname_trips, dates, chunk_size_read, engine, refresh_clean_cache)
+
+        data_ingest(data_trips, data_zones, pg_params)
+
+    metrics_end(metrics_run)
+
+    if clean_report is not None:
+        clean_report_write(clean_report)
+    else:
+        pass
+
+    if metrics_prom is not None:
+        metrics_prometheus_write(metrics_prom)
+    else:
+        pass
+
+    return None
+
+
+@cli.command(name="export")
+@click.option(
+    '--username',
+    type=click.STRING,
+    required=True,
+    help='PostgreSQL username used during data export (read-only, along with its reader certificate).',
+)
+@click.option(
+    '--password',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='PostgreSQL password used during data export.',
+)
+@click.option(
+    '--host',
+    type=click.STRING,
+    required=True,
+    help='PostgreSQL server hostname.',
+)
+@click.option(
+    '--port',
+    type=click.INT,
+    required=True,
+    help='PostgreSQL server port.',
+)
+@click.option(
+    '--db',
+    type=click.STRING,
+    required=True,
+    help='PostgreSQL database source.',
+)
+@click.option(
+    '--schema',
+    type=click.STRING,
+    required=True,
+    help='PostgreSQL schema source.',
+)
+@click.option(
+    '--table-trips',
+    type=click.STRING,
+    required=True,
+    help='PostgreSQL table storing the NYC taxi trips tabular data to-be-exported.',
+)
+@click.option(
+    '--fname',
+    type=click.Path(resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (PARQUET format) of the to-be-created local copy for NYC taxi trips tabular data.',
+)
+@click.option(
+    '--months',
+    type=click.STRING,
+    default=None,
+    help='Range of months (YYYY-MM..YYYY-MM) to be exported (pickup datetime). Otherwise, every NYC taxi trip is.',
+)
+@click.option(
+    '--by-month',
+    is_flag=True,
+    default=False,
+    help='Export every month into its own file, replacing the month in --fname.',
+)
+@click.option(
+    '--format',
+    'fmt',
+    type=click.Choice(['binary', 'csv']),
+    default="binary",
+    help='COPY format to-be-used during data export.',
+)
+@click.option(
+    '--chunk-size',
+    type=click.IntRange(min=1),
+    default=2**17,
+    help='Number of rows per record batch (and PARQUET row group) to-be-used during data export (binary format).',
+)
+@click.option(
+    '--metrics',
+    type=click.Path(resolve_path=True, path_type=Path),
+    default=None,
+    help='Filename (JSON-lines format) where per-stage metrics (time, CPU, memory, rows, and bytes) are appended.',
+)
+def export_command(
+    username: str,
+    password: str | bytes | PathLike,
+    host: str,
+    port: int,
+    db: str,
+    schema: str,
+    table_trips: str,
+    fname: str | bytes | PathLike,
+    months: str | None,
+    by_month: bool,
+    fmt: str,
+    chunk_size: int,
+    metrics: str | bytes | PathLike | None,
+) -> None:
+    """
+    Export tabular data (NYC taxi trips) from a PostgreSQL database into local files (PARQUET format).
+
+    Args:
+        username: PostgreSQL username used during data export (read-only, along with its reader certificate).
+        password: PostgreSQL password used during data export.
+        host: PostgreSQL server hostname.
+        port: PostgreSQL server port.
+        db: PostgreSQL database source.
+        schema: PostgreSQL schema source.
+        table_trips: PostgreSQL table storing the NYC taxi trips tabular data to-be-exported.
+        fname: Filename (PARQUET format) of the to-be-created local copy for NYC taxi trips tabular data (within
+            `PATHS["data"]`).
+        months: If set, range of months (YYYY-MM..YYYY-MM) to be exported (pickup datetime). Otherwise, every NYC taxi
+            trip is exported.
+        by_month: If set, every month is exported into its own file, replacing the month in `fname`.
+        fmt: COPY format to-be-used during data export (binary | csv). Either of them is parsed straight into Arrow
+            record batches, without building Python objects for every row.
+        chunk_size: Number of rows per record batch (and PARQUET row group) to-be-used during data export (binary
+            format; CSV is parsed in blocks of CSV_BLOCK_SIZE bytes).
+        metrics: If set, filename (JSON-lines format) where per-stage metrics (export) are appended, along with a final
+            `run` record.
+    """
+    global _metrics_fname
+
+    if months is not None:
+        months = month_range(months)
+    else:
+        pass
+
+    fname = Path(sanitize_filepath(fname))
+    if by_month:
+        # Raises an error unless there is a month (YYYY-MM) to be replaced.
+        path_month(fname)
+    else:
+        pass
+
+    password = open(password).readline().rstrip()
+
+    if not validators.hostname(host, may_have_port=False):
+        raise ValueError(f"[FATAL] host is invalid ({host}). Exiting...")
+    else:
+        pass
+
+    if not (MIN_PORT < port < MAX_PORT):
+        raise ValueError(f"[FATAL] port is invalid ({port}). Exiting...")
+
+    db = db.lower()
+    if not bool(match("[0-9a-z_]{2,24}$", db)):
+        raise ValueError(f"[FATAL] db is invalid ({db}). Exiting...")
+    else:
+        pass
+
+    schema = schema.lower()
+    if not bool(match("[0-9a-z_]{2,24}$", schema)):
+        raise ValueError(f"[FATAL] schema is invalid ({schema}). Exiting...")
+    else:
+        pass
+
+    table_trips_name = table_trips.lower()
+    if not bool(match("[0-9a-z_]{2,24}$", table_trips_name)):
+        raise ValueError(f"[FATAL] table is invalid ({table_trips_name}). Exiting...")
+    else:
+        pass
+
+    _metrics_fname = metrics
+    metrics_run = metrics_begin(
+        "run",
+        command="export",
+        months=months,
+        by_month=by_month,
+        format=fmt,
+        chunk_size=chunk_size,
+    )
+
+    pg_params = {
+        "username": username,
+        "passwd": password,
+        "host": host,
+        "port": port,
+        "db": db,
+    }
+
+    engine = pg_engine(pg_params, role="reader")
+    try:
+        data_export(engine, schema, table_trips_name, fname, fmt, chunk_size, months, by_month)
+    finally:
+        engine.dispose()
+
+    metrics_end(metrics_run)
 
     return None
 
 
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,497 @@
+#!/usr/bin/env python
+# coding: utf-8
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from os import PathLike
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import perf_counter
+from typing import Any, Tuple
+
+import click
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_manager as dm  # noqa: E402
+
+_logger = dm._logger
+
+
+def data_clean_drop(data: pd.DataFrame, dates: Tuple[datetime, datetime]) -> pd.DataFrame:
+    """
+    Return cleaned tabular data (NYC taxi trips), discarding bad data one rule at a time.
+
+    Reference implementation: `data_manager.data_clean()` before it was rewritten to evaluate every rule at once.
+
+    Args:
+        data: Tabular data (NYC taxi trips) to be cleaned.
+        dates: time period boundaries for the tabular data (NYC taxi trips) recorded.
+    """
+    # Discard `store_and_fwd_flag` details because of its lack of relevance.
+    del data["store_and_fwd_flag"]
+
+    # Originally stored as 'airport_fee', later on as 'Airport_fee'.
+    if "Airport_fee" in data:
+        data["airport_fee"] = data["Airport_fee"]
+        del data["Airport_fee"]
+    else:
+        pass
+
+    # Check number of unique values per column/attribute and identify potential categorical values.
+    for column in data.columns:
+        if data[column].nunique() < 10:
+            _logger.debug(f"Column {column} includes {data[column].nunique()} unique values ({data[column].unique()}).")
+        else:
+            _logger.debug(f"Column {column} includes {data[column].nunique()} unique values.")
+
+    # Compute delta time (time elapsed between pickup and dropoff).
+    data["dt"] = (
+        data["tpep_dropoff_datetime"]
+        - data["tpep_pickup_datetime"]
+    )
+
+    data["avg_speed"] = (
+        data["trip_distance"]
+        / (data["dt"]/pd.Timedelta(hours=1))
+    )
+
+    # Reorder columns/attributes based on its relevance.
+    data = data[
+        [
+            "tpep_pickup_datetime",
+            "tpep_dropoff_datetime",
+            "dt",
+            "trip_distance",
+            "avg_speed",
+            "PULocationID",
+            "DOLocationID",
+            "RatecodeID",
+            "passenger_count",
+            "total_amount",
+            "fare_amount",
+            "tip_amount",
+            "tolls_amount",
+            "extra",
+            "mta_tax",
+            "improvement_surcharge",
+            "congestion_surcharge",
+            "airport_fee",
+            "payment_type",
+            "VendorID",
+        ]
+    ].copy()
+
+    # Discard trips considered bad data.
+
+    # Note that we cannot discuss with the business experts how to identify bad data and, therefore, our hability to do
+    # so is limited. Next, we propose several scenarios that could identify bad data using our shallow understanding in
+    # this sector.
+
+    # - Discard trips outside the analyzed time period and those with invalid pickup and dropoff datetimes.
+    data.drop(
+        data[
+            (data["tpep_dropoff_datetime"] <= data["tpep_pickup_datetime"])
+            | (data["tpep_pickup_datetime"] < dates[0])
+            | (data["tpep_pickup_datetime"] >= dates[1])
+            | (data["tpep_dropoff_datetime"] < dates[0])
+            | (data["tpep_dropoff_datetime"] >= dates[1])
+        ].index,
+        inplace=True,
+    )
+
+    # - Discard trips with invalid `VendorID` values.
+    data.drop(data[data["VendorID"] == 6].index, inplace=True)
+
+    # - Discard trips with invalid `RatecodeID` values and convert to `int64` this column/attribute.
+    data.drop(
+        data[
+            (data["RatecodeID"].isna())
+            | (data["RatecodeID"] == 99.0)
+        ].index,
+        inplace=True,
+    )
+
+    data["RatecodeID"] = data["RatecodeID"].astype("int64")
+
+    # - By law, a maximum of 4 passengers are allowed in standard NYC taxis. A child under 7 is allowed to sit on a
+    #     passenger's lap in the rear seat in addition to the passenger limit. Therefore, discard trips with more than 5
+    #     passengers. Also, discard trips with no passengers.
+    data.drop(data[(data["passenger_count"] > 5) | (data["passenger_count"] == 0)].index, inplace=True)
+    data["passenger_count"] = data["passenger_count"].astype("int64")
+
+    # - Discard trips with negative or nil distance.
+    data.drop(data[data["trip_distance"] <= 0].index, inplace=True)
+
+    # - Discard trips with a negligible duration (lower than 1 minute).
+    data.drop(data[data["dt"]/pd.Timedelta(minutes=1) < 1].index, inplace=True)
+
+    # - Discard trips with a negative average speed (i.e., the trip distance or duration is negative).
+    data.drop(data[data["avg_speed"] < 0].index, inplace=True)
+
+    # - Discard trips from or to outside NYC with an average speed higher than 75 mph (max freeway speed limit in the
+    #     surrounding states).
+    data.drop(
+        data[
+            (data["avg_speed"] > 75)
+            & (
+                (data["PULocationID"] > 263)
+                | (data["DOLocationID"] > 263)
+            )
+        ].index,
+        inplace=True,
+    )
+
+    # - Discard trips within NYC with an average speed higher than 50 mph (max speed limit in NYC).
+    data.drop(
+        data[
+            (data["avg_speed"] > 50)
+            & (
+                (data["PULocationID"] < 264)
+                & (data["DOLocationID"] < 264)
+            )
+        ].index,
+        inplace=True,
+    )
+
+    # - Discard trips taking more than 1 hour at an average speed lower than 3 mph, as it is assumed these slow trips
+    #     cannot even be associated with traffic jams, even in NYC.
+    data.drop(
+        data[
+            (data["dt"]/pd.Timedelta(hours=1) > 1)
+            & (data["avg_speed"] < 3)
+        ].index,
+        inplace=True,
+    )
+
+    data[
+        [
+            "PULocationID",
+            "DOLocationID",
+            "RatecodeID",
+            "passenger_count",
+            "payment_type",
+            "VendorID",
+        ]
+    ] = data[
+        [
+            "PULocationID",
+            "DOLocationID",
+            "RatecodeID",
+            "passenger_count",
+            "payment_type",
+            "VendorID",
+        ]
+    ].astype("int32")
+
+    # Reset index after data processing.
+    data.reset_index(drop=True, inplace=True)
+
+    _logger.info("Tabular data (NYC taxi) cleaned.")
+
+    return data
+
+
+def data_synthetic(month: str, rows: int, airport_fee: str = "airport_fee", seed: int = 0) -> pd.DataFrame:
+    """
+    Returns synthetic NYC taxi trips tabular data (as stored by the TLC in PARQUET format), including every kind of bad
+    data identified by the cleaning rules (see `data_manager.CLEAN_RULES`).
+
+    Besides random trips, it includes: missing `RatecodeID` and `passenger_count` values (in the same rows, as in TLC
+    data), pickup and dropoff datetimes on both sides of the time period boundaries (including the boundaries
+    themselves), negative and negligible durations, trips from or to zones outside NYC (264, 265) faster than both
+    speed limits, and trips right at the speed limits (3, 50, and 75 mph).
+
+    Args:
+        month: Month (YYYY-MM) of the NYC taxi trips.
+        rows: Number of NYC taxi trips.
+        airport_fee: Name of the airport fee column/attribute (originally 'airport_fee', later on 'Airport_fee').
+        seed: Seed of the random number generator.
+
+    Returns:
+        Synthetic NYC taxi trips tabular data.
+    """
+    rng = np.random.default_rng(seed)
+    dates = dm.month_dates(month)
+    date_start, date_end = np.datetime64(dates[0], "us"), np.datetime64(dates[1], "us")
+    hour = np.timedelta64(3600 * 10**6, "us")
+
+    # Pickups spread over the whole month, and up to 6 hours before and after it.
+    span = (date_end - date_start + 12 * hour).astype("i8")
+    pickup = date_start - 6 * hour + (rng.integers(0, span // 10**6, rows) * 10**6).astype("timedelta64[us]")
+    # Pickups right before, at, and right after the time period boundaries.
+    boundaries = [date_start - np.timedelta64(1, "s"), date_start, date_end - np.timedelta64(1, "s"), date_end]
+    pickup[:len(boundaries)] = boundaries
+
+    # Trip durations (seconds): mostly 2 to 60 minutes, but also negative, nil, negligible, and very long ones.
+    duration = rng.integers(120, 3600, rows)
+    kind = rng.random(rows)
+    duration = np.where(kind < 0.03, -rng.integers(1, 600, rows), duration)
+    duration = np.where((kind >= 0.03) & (kind < 0.05), 0, duration)
+    duration = np.where((kind >= 0.05) & (kind < 0.08), rng.integers(1, 60, rows), duration)
+    duration = np.where((kind >= 0.08) & (kind < 0.10), rng.integers(3600, 4 * 3600, rows), duration)
+    # Trips right at the speed limits last a multiple of 12 seconds (over 1 hour at 3 mph), so their distances (rounded
+    # to hundredths of a mile) are as close to them as possible: exactly at 3 and 75 mph, and within 0.1 mph at 50 mph.
+    limit = rng.random(rows) < 0.05
+    limit_speed = rng.choice([3.0, 50.0, 75.0], rows)
+    limit_duration = np.where(limit_speed == 3.0, rng.integers(301, 900, rows), rng.integers(1, 300, rows)) * 12
+    duration = np.where(limit, limit_duration, duration)
+    dropoff = pickup + (duration * 10**6).astype("timedelta64[us]")
+
+    distance = np.round(rng.gamma(2.0, 1.5, rows), 2)
+    distance = np.where(rng.random(rows) < 0.02, -np.round(rng.random(rows), 2) * (rng.random(rows) < 0.5), distance)
+
+    pu_location = rng.integers(1, 266, rows)
+    do_location = rng.integers(1, 266, rows)
+
+    # Trips faster than the speed limits within (50 mph) and around (75 mph) NYC, from or to zones outside it.
+    speeding = rng.random(rows) < 0.05
+    speed = rng.uniform(40, 100, rows)
+    distance = np.where(speeding & (duration > 0), np.round(speed * duration / 3600, 2), distance)
+    outside = speeding & (rng.random(rows) < 0.5)
+    pu_location = np.where(outside & (rng.random(rows) < 0.5), rng.integers(264, 266, rows), pu_location)
+    do_location = np.where(outside, rng.integers(264, 266, rows), do_location)
+    distance = np.where(limit, np.round(limit_speed * duration / 3600, 2), distance)
+
+    # Missing `RatecodeID` and `passenger_count` values (along with surcharges and flags) in the same rows.
+    missing = rng.random(rows) < 0.05
+    passenger_count = np.where(missing, np.nan, rng.choice([0, 1, 1, 1, 2, 3, 4, 5, 6, 7], rows).astype(float))
+    ratecode = np.where(missing, np.nan, rng.choice([1, 1, 1, 2, 3, 4, 5, 6, 99], rows).astype(float))
+    flag = np.where(missing, None, rng.choice(["N", "Y"], rows, p=[0.99, 0.01])).astype(object)
+
+    def amounts(scale: float) -> np.ndarray:
+        return np.round(rng.exponential(scale, rows), 2)
+
+    return pd.DataFrame(
+        {
+            "VendorID": rng.choice([1, 2, 2, 6], rows),
+            "tpep_pickup_datetime": pickup,
+            "tpep_dropoff_datetime": dropoff,
+            "passenger_count": passenger_count,
+            "trip_distance": distance,
+            "RatecodeID": ratecode,
+            "store_and_fwd_flag": flag,
+            "PULocationID": pu_location,
+            "DOLocationID": do_location,
+            "payment_type": rng.choice([0, 1, 1, 2, 3, 4], rows),
+            "fare_amount": amounts(12.0),
+            "extra": rng.choice([0.0, 0.5, 1.0, 2.5], rows),
+            "mta_tax": np.full(rows, 0.5),
+            "tip_amount": amounts(2.0),
+            "tolls_amount": np.where(rng.random(rows) < 0.05, 6.12, 0.0),
+            "improvement_surcharge": np.full(rows, 0.3),
+            "total_amount": amounts(18.0),
+            "congestion_surcharge": np.where(missing, np.nan, rng.choice([0.0, 2.5], rows)),
+            airport_fee: np.where(missing, np.nan, rng.choice([0.0, 0.0, 1.25], rows)),
+        }
+    )
+
+
+def data_real(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns cleaned tabular data (NYC taxi trips) with its REAL columns/attributes casted to float32, as cleaned by
+    `data_manager.data_clean()`.
+
+    Args:
+        data: Cleaned tabular data (NYC taxi trips), e.g., by `data_clean_drop()`.
+
+    Returns:
+        Cleaned tabular data with REAL columns/attributes as float32.
+    """
+    real = [column for column, dtype in dm.TABLE_TRIPS_DTYPES.items() if dtype is dm.sa.types.REAL]
+
+    return data.astype({column: "float32" for column in real})
+
+
+def benchmark(fname: str | bytes | PathLike, repeats: int) -> pd.DataFrame:
+    """
+    Check that `data_manager.data_clean()`, `data_manager.data_clean_arrow()` and `data_clean_drop()` return identical
+    tabular data (at REAL precision) and time them. The former two are also checked on tabular data read as when it is
+    ingested, i.e., projected, filtered, and read into compact dtypes (see `data_manager.trips_read_options()`).
+
+    Args:
+        fname: Local path where NYC taxi trips tabular data is stored (PARQUET format).
+        repeats: Number of executions per implementation.
+
+    Returns:
+        Elapsed real (wall clock) time of each execution, per implementation.
+
+    Raises:
+        AssertionError: If both implementations return different tabular data.
+    """
+    dm.PATHS["data"] = Path(fname).parent
+
+    dates = dm.month_dates(dm.path_month(fname))
+    data_raw = dm.data_read(fname)
+    data_raw_arrow = dm.data_read_arrow(fname)
+
+    data = []
+    results = {}
+    for name, clean in [("drop", data_clean_drop), ("mask", dm.data_clean), ("arrow", dm.data_clean_arrow)]:
+        for _ in range(repeats):
+            # `data_clean_drop()` modifies its input in place, at least partially.
+            data_i = data_raw_arrow if name == "arrow" else data_raw.copy()
+
+            start = perf_counter()
+            results[name] = clean(data_i, dates)
+            data.append([name, perf_counter() - start])
+
+    columns, filters = dm.trips_read_options(dates)
+    results["mask (read options)"] = dm.data_clean(dm.data_read(fname, columns, filters), dates)
+    results["arrow (read options)"] = dm.data_clean_arrow(dm.data_read_arrow(fname, columns, filters), dates)
+
+    expected = data_real(results.pop("drop"))
+    for name, result in results.items():
+        result = result.to_pandas() if name.startswith("arrow") else result
+        pd.testing.assert_frame_equal(result, expected, obj=name)
+
+    print(f"Identical cleaned tabular data ({len(expected)} out of {len(data_raw)} rows kept).")
+
+    return pd.DataFrame(data=data, columns=["method", "tex"])
+
+
+def check_formats(path: Path, month: str, rows: int) -> None:
+    """
+    Check that synthetic NYC taxi trips stored without 'airport_fee' (as in older months) are cleaned identically by
+    `data_manager.data_clean()` and `data_manager.data_clean_arrow()`, whether stored in CSV or PARQUET format.
+
+    Args:
+        path: Local path where synthetic NYC taxi trips tabular data is to be stored (CSV and PARQUET formats).
+        month: Month (YYYY-MM) of the NYC taxi trips.
+        rows: Number of NYC taxi trips.
+
+    Raises:
+        AssertionError: If cleaned tabular data differs, lacks 'airport_fee', or its delta time is not in microseconds.
+    """
+    dm.PATHS["data"] = path
+
+    dates = dm.month_dates(month)
+    data_raw = data_synthetic(month, rows).drop(columns="airport_fee")
+    # Datetimes are written in whole seconds, so they are inferred as `timestamp[s]` from CSV files.
+    data_raw.to_csv(path/f"yellow_tripdata_{month}.csv", index=False)
+    data_raw.to_parquet(path/f"yellow_tripdata_{month}.parquet", index=False)
+
+    results = {}
+    for fmt in ["csv", "parquet"]:
+        fname = path/f"yellow_tripdata_{month}.{fmt}"
+        data_arrow = dm.data_clean_arrow(dm.data_read_arrow(fname, columns=dm.TABLE_TRIPS_READ_DTYPES), dates)
+        assert data_arrow["dt"].type == pa.duration("us"), f"Delta time in {data_arrow['dt'].type} ({fmt})."
+        assert data_arrow["airport_fee"].null_count == len(data_arrow), f"Unexpected airport fees ({fmt})."
+
+        results[f"arrow ({fmt})"] = data_arrow.to_pandas()
+        results[f"mask ({fmt})"] = dm.data_clean(dm.data_read(fname, columns=dm.TABLE_TRIPS_READ_DTYPES), dates)
+
+    for name, result in results.items():
+        pd.testing.assert_frame_equal(result, results["mask (parquet)"], obj=name)
+
+    print(f"Identical cleaned tabular data without 'airport_fee' (CSV and PARQUET formats, {len(result)} rows kept).")
+
+    return None
+
+
+def check_csv_late_values(path: Path, month: str, rows: int) -> None:
+    """
+    Check that synthetic NYC taxi trips (CSV format) whose optional columns/attributes only include missing values in
+    the first block are read identically from a local path (twice, so its schema sidecar file is used as well) and while
+    they are downloaded (see `data_manager.data_download_tee()`).
+
+    Args:
+        path: Local path where synthetic NYC taxi trips tabular data is to be stored (CSV format) and downloaded.
+        month: Month (YYYY-MM) of the NYC taxi trips.
+        rows: Number of NYC taxi trips.
+
+    Raises:
+        AssertionError: If tabular data read differs.
+    """
+    path_remote = path/"remote"
+    path_remote.mkdir()
+    fname = f"yellow_tripdata_{month}.csv"
+
+    data_raw = data_synthetic(month, rows)
+    data_raw.loc[:rows // 2, ["congestion_surcharge", "airport_fee", "store_and_fwd_flag"]] = None
+    data_raw.to_csv(path_remote/fname, index=False)
+
+    # Blocks of 64 KiB (a few hundred rows), so the first one only includes missing values in those columns/attributes.
+    block_size, dm.CSV_BLOCK_SIZE = dm.CSV_BLOCK_SIZE, 2**16
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=str(path_remote)))
+    Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        dm.PATHS["data"] = path
+        url = f"http://127.0.0.1:{server.server_port}/{fname}"
+        results = {
+            "tee": dm.data_read_arrow(
+                fname, columns=dm.TABLE_TRIPS_READ_DTYPES, reader=dm.data_download_tee(url, fname, 2**20)
+            ),
+            "local": dm.data_read_arrow(fname, columns=dm.TABLE_TRIPS_READ_DTYPES),
+            "local (sidecar)": dm.data_read_arrow(fname, columns=dm.TABLE_TRIPS_READ_DTYPES),
+        }
+    finally:
+        server.shutdown()
+        dm.CSV_BLOCK_SIZE = block_size
+
+    for name, result in results.items():
+        assert result["airport_fee"].null_count < rows, f"Missing airport fees ({name})."
+        pd.testing.assert_frame_equal(result.to_pandas(), results["local"].to_pandas(), obj=name)
+
+    print(f"Identical tabular data read from CSV with late values (downloaded and local, {rows} rows).")
+
+    return None
+
+
+@click.command()
+@click.option(
+    '--fname',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    default=None,
+    help=(
+        'Filename (PARQUET format) storing NYC taxi trips tabular data (e.g., yellow_tripdata_2021-01.parquet). '
+        'Otherwise, synthetic NYC taxi trips tabular data is generated (see --month and --rows).'
+    ),
+)
+@click.option('--month', type=click.STRING, default="2021-01", help='Month (YYYY-MM) of synthetic NYC taxi trips.')
+@click.option('--rows', type=click.IntRange(min=100), default=200000, help='Number of synthetic NYC taxi trips.')
+@click.option('--repeats', type=click.IntRange(min=1), default=5, help='Number of executions per implementation.')
+def main(fname, month, rows, repeats):
+    """
+    Check and benchmark the single-pass (mask) and Arrow cleaning of NYC taxi trips against the rule-by-rule (drop) one.
+
+    By default, they are checked on synthetic NYC taxi trips (both with 'airport_fee' and 'Airport_fee'), so no dataset
+    is needed. Synthetic NYC taxi trips without 'airport_fee' are also checked, from CSV and PARQUET files, as well as
+    CSV files whose optional columns/attributes are only filled in after the first block.
+    """
+    if fname is not None:
+        results = benchmark(fname, repeats).groupby("method")["tex"].median()
+    else:
+        with TemporaryDirectory() as path:
+            results = []
+            for airport_fee in ["airport_fee", "Airport_fee"]:
+                fname_synthetic = Path(path)/airport_fee/f"yellow_tripdata_{month}.parquet"
+                fname_synthetic.parent.mkdir()
+                data_synthetic(month, rows, airport_fee).to_parquet(fname_synthetic, index=False)
+                print(f"Synthetic NYC taxi trips ({rows} rows, {airport_fee}):")
+                results.append(benchmark(fname_synthetic, repeats))
+
+            fname_synthetic.parent.with_name("no_airport_fee").mkdir()
+            check_formats(fname_synthetic.parent.with_name("no_airport_fee"), month, rows)
+
+            fname_synthetic.parent.with_name("late_values").mkdir()
+            check_csv_late_values(fname_synthetic.parent.with_name("late_values"), month, rows)
+
+        results = pd.concat(results).groupby("method")["tex"].median()
+
+    print(results)
+    print(f"Speedup (mask): {results['drop'] / results['mask']:.2f}x")
+    print(f"Speedup (arrow): {results['drop'] / results['arrow']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
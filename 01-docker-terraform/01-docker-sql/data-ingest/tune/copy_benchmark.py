@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# coding: utf-8
+import csv
+from io import StringIO
+from os import PathLike
+from pathlib import Path
+import sys
+from time import perf_counter
+from typing import Callable, Dict, List
+
+import click
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_manager as dm  # noqa: E402
+
+
+def serialize_csv(data: pd.DataFrame) -> None:
+    """
+    Serialize tabular data into CSV format, row by row, as `psql_insert_copy()` does.
+
+    Args:
+        data: Tabular data to be serialized.
+    """
+    s_buf = StringIO()
+    writer = csv.writer(s_buf)
+    writer.writerows(data.itertuples(index=False, name=None))
+
+
+def serialize_binary(data: pd.DataFrame) -> None:
+    """
+    Serialize tabular data into PostgreSQL binary COPY format, column by column, as `psql_copy_binary()` does.
+
+    Args:
+        data: Tabular data to be serialized.
+    """
+    dm.pgcopy_encode(data, dm.TABLE_TRIPS_DTYPES)
+
+
+def timeit(func: Callable[[], None], repeats: int) -> List[float]:
+    """
+    Returns the elapsed real (wall clock) time, in seconds, of each of the `repeats` executions of `func`.
+
+    Args:
+        func: Function to be timed.
+        repeats: Number of executions.
+
+    Returns:
+        Elapsed real (wall clock) time of each execution, in seconds.
+    """
+    tex = []
+    for _ in range(repeats):
+        start = perf_counter()
+        func()
+        tex.append(perf_counter() - start)
+
+    return tex
+
+
+def benchmark(
+        fname: str | bytes | PathLike,
+        repeats: int,
+        pg_params: Dict[str, str] | None,
+) -> pd.DataFrame:
+    """
+    Compare the CSV (`psql_insert_copy`) and binary (`psql_copy_binary`) COPY serializers.
+
+    Args:
+        fname: Local path where NYC taxi trips tabular data is stored (PARQUET format).
+        repeats: Number of executions per serializer.
+        pg_params: PostgreSQL database connection parameters. If provided, the whole ingestion is timed as well.
+
+    Returns:
+        Elapsed real (wall clock) time of each execution, per serializer and stage.
+    """
+    dm.PATHS["data"] = Path(fname).parent
+
+    dates = dm.month_dates(dm.path_month(fname))
+    data_trips = dm.data_clean(dm.data_read(fname), dates)
+    data_zones = pd.DataFrame(columns=list(dm.TABLE_ZONES_DTYPES))
+
+    data = []
+    for method, serialize in [("psql_insert_copy", serialize_csv), ("psql_copy_binary", serialize_binary)]:
+        for tex in timeit(lambda: serialize(data_trips), repeats):
+            data.append([method, "serialize", tex])
+
+        if pg_params is not None:
+            pg_params["method"] = method
+            for tex in timeit(lambda: dm.data_ingest(data_trips, data_zones, pg_params), repeats):
+                data.append([method, "ingest", tex])
+        else:
+            pass
+
+    return pd.DataFrame(data=data, columns=["method", "stage", "tex"])
+
+
+@click.command()
+@click.option(
+    '--fname',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (PARQUET format) storing NYC taxi trips tabular data (e.g., yellow_tripdata_2021-01.parquet).',
+)
+@click.option('--repeats', type=click.IntRange(min=1), default=5, help='Number of executions per serializer.')
+@click.option('--username', type=click.STRING, default=None, help='PostgreSQL username used during data ingestion.')
+@click.option(
+    '--password',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    default=None,
+    help='PostgreSQL password used during data ingestion.',
+)
+@click.option('--host', type=click.STRING, default=None, help='PostgreSQL server hostname.')
+@click.option('--port', type=click.INT, default=None, help='PostgreSQL server port.')
+@click.option('--db', type=click.STRING, default=None, help='PostgreSQL database destination.')
+@click.option('--schema', type=click.STRING, default=None, help='PostgreSQL schema destination.')
+@click.option('--table-trips', type=click.STRING, default="copy_benchmark_trips", help='PostgreSQL scratch table.')
+@click.option('--table-zones', type=click.STRING, default="copy_benchmark_zones", help='PostgreSQL scratch table.')
+@click.option('--chunk-size-sql', type=click.INT, default=100000, help='Chunk size to-be-used during data ingestion.')
+def main(fname, repeats, username, password, host, port, db, schema, table_trips, table_zones, chunk_size_sql):
+    """
+    Benchmark CSV vs binary COPY serializers on a monthly NYC taxi trips file.
+
+    Serialization is always timed. If PostgreSQL connection details are provided, the whole ingestion into (scratch)
+    tables is timed as well.
+    """
+    if username is not None:
+        missing = [
+            name for name, value in
+            [("password", password), ("host", host), ("port", port), ("db", db), ("schema", schema)]
+            if value is None
+        ]
+        if missing:
+            raise click.UsageError(
+                f"Missing option(s) required along with '--username': {', '.join(f'--{name}' for name in missing)}."
+            )
+        else:
+            pass
+
+        pg_params = {
+            "username": username,
+            "passwd": open(password).readline().rstrip(),
+            "host": host,
+            "port": port,
+            "db": db,
+            "schema": schema,
+            "table_trips_name": table_trips,
+            "table_zones_name": table_zones,
+            "chunk_size": str(chunk_size_sql),
+        }
+    else:
+        pg_params = None
+
+    results = benchmark(fname, repeats, pg_params)
+    print(results.groupby(["stage", "method"])["tex"].describe()[["count", "min", "50%", "max"]])
+
+
+if __name__ == "__main__":
+    main()
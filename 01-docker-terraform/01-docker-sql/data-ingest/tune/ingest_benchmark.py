@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+# coding: utf-8
+from collections import defaultdict
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from itertools import product
+import logging
+from os import PathLike
+from pathlib import Path
+import re
+import resource
+import sys
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import perf_counter
+from typing import Dict, Iterable, Tuple
+
+import click
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_manager as dm  # noqa: E402
+
+# Settings swept by the benchmark (in this order), as consumed by `tune_analyzer.plot()` (plus the engine and tee).
+CONFIG_COLUMNS = ["chunk_size_dw", "chunk_size_sql", "method", "engine", "stream_dw"]
+
+
+class QuietHTTPRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serves files from a local directory, without logging every request.
+    """
+    def log_message(self, format, *args):
+        pass
+
+
+def http_serve(directory: str | PathLike) -> ThreadingHTTPServer:
+    """
+    Serves files from a local directory over HTTP (on localhost, at a random port) from a background thread.
+
+    Args:
+        directory: Local directory whose files are served.
+
+    Returns:
+        Running HTTP server.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHTTPRequestHandler, directory=str(directory)))
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+def rss_peak_reset() -> None:
+    """
+    Resets the peak resident set size of the process (Linux only, see `/proc/[pid]/clear_refs` in proc(5)).
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def rss_peak() -> float:
+    """
+    Returns the peak resident set size of the process since it was last reset (see `rss_peak_reset()`).
+
+    Returns:
+        Peak resident set size of the process, in Kilobytes (since the process started, if it cannot be reset).
+    """
+    try:
+        with open("/proc/self/status") as f:
+            return float(re.search(r"VmHWM:\s+(\d+) kB", f.read()).group(1))
+    except (OSError, AttributeError):
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def trial(
+        config: Dict[str, int | str],
+        url_trips: str,
+        url_zones: str,
+        pg_params: Dict[str, str],
+        chunk_size_read: int | None,
+) -> Dict[str, float]:
+    """
+    Runs the whole data ingestion (download, read, clean, and load) once, as `data_manager.main()` does.
+
+    Args:
+        config: Settings of the data ingestion (see CONFIG_COLUMNS).
+        url_trips: Remote url (local HTTP server) containing NYC taxi trips tabular data.
+        url_zones: Remote url (local HTTP server) containing NYC taxi zones tabular data.
+        pg_params: PostgreSQL database connection parameters.
+        chunk_size_read: If set, NYC taxi trips tabular data is read, cleaned, and ingested in batches of (up to) this
+            many rows.
+
+    Returns:
+        Elapsed real (wall clock) time (`tex`, in seconds), peak resident set size (`mem`, in Kilobytes), and elapsed
+        real (wall clock) time spent in each stage (`tex_<stage>`, in seconds).
+    """
+    for url in [url_trips, url_zones]:
+        (dm.PATHS["data"]/Path(url).name).unlink(missing_ok=True)
+
+    dm._metrics.clear()
+    rss_peak_reset()
+
+    start = perf_counter()
+    dm.data_download(url_zones, Path(url_zones).name, config["chunk_size_dw"])
+    data_zones = dm.data_read(Path(url_zones).name)
+
+    if config["stream_dw"] and dm.data_format(url_trips) == "csv":
+        url = url_trips
+    else:
+        dm.data_download(url_trips, Path(url_trips).name, config["chunk_size_dw"])
+        url = None
+
+    # Bypassing the local cache of cleaned tabular data, so every trial reads and cleans it again.
+    dates = dm.month_dates(dm.path_month(url_trips))
+    data_trips = dm.data_prepare(
+        Path(url_trips).name,
+        dates,
+        chunk_size_read,
+        config["engine"],
+        url=url,
+        chunk_size_dw=config["chunk_size_dw"],
+        cache=False,
+    )
+
+    pg_params = {**pg_params, "chunk_size": str(config["chunk_size_sql"]), "method": config["method"]}
+    dm.data_ingest(data_trips, data_zones, pg_params)
+    tex = perf_counter() - start
+
+    stages = defaultdict(float)
+    for metrics in dm._metrics:
+        stages[f"tex_{metrics['stage']}"] += metrics["wall"]
+
+    return {"tex": tex, "mem": rss_peak(), **stages}
+
+
+def benchmark(
+        configs: Iterable[Dict[str, int | str]],
+        fname_trips: str | bytes | PathLike,
+        fname_zones: str | bytes | PathLike,
+        pg_params: Dict[str, str],
+        chunk_size_read: int | None,
+        warmup: int,
+        repeats: int,
+) -> pd.DataFrame:
+    """
+    Benchmarks the whole data ingestion for every given configuration, in this very process.
+
+    NYC taxi tabular data is downloaded from a local HTTP server (so no network transfer is timed) into a temporary
+    directory. Every configuration is run `warmup` times (discarded) before its `repeats` trials.
+
+    Args:
+        configs: Settings of the data ingestion to be benchmarked (see CONFIG_COLUMNS).
+        fname_trips: Local path where NYC taxi trips tabular data is stored (e.g., yellow_tripdata_2021-01.parquet).
+        fname_zones: Local path where NYC taxi zones tabular data is stored (CSV format).
+        pg_params: PostgreSQL database connection parameters.
+        chunk_size_read: If set, NYC taxi trips tabular data is read, cleaned, and ingested in batches of (up to) this
+            many rows.
+        warmup: Number of discarded executions per configuration.
+        repeats: Number of timed executions (trials) per configuration.
+
+    Returns:
+        Settings, elapsed real (wall clock) time (`tex`, in seconds), and peak resident set size (`mem`, in Kilobytes)
+        of each trial (in the schema consumed by `tune_analyzer.plot()`), along with the time spent in each stage.
+    """
+    data = []
+    with TemporaryDirectory() as dir_served, TemporaryDirectory() as dir_data:
+        for fname in [fname_trips, fname_zones]:
+            (Path(dir_served)/Path(fname).name).symlink_to(Path(fname).resolve())
+
+        server = http_serve(dir_served)
+        url = f"http://127.0.0.1:{server.server_port}"
+        dm.PATHS["data"] = Path(dir_data)
+
+        try:
+            for config in configs:
+                for i in range(warmup + repeats):
+                    results = trial(
+                        config,
+                        f"{url}/{Path(fname_trips).name}",
+                        f"{url}/{Path(fname_zones).name}",
+                        pg_params,
+                        chunk_size_read,
+                    )
+
+                    if i >= warmup:
+                        data.append({**config, "trial": i - warmup, **results})
+                        print(f"{config} - trial #{i - warmup}: {results['tex']:.2f} s, {results['mem']:.0f} KB")
+                    else:
+                        pass
+        finally:
+            server.shutdown()
+
+    return pd.DataFrame(data=data)
+
+
+def bootstrap_ci(values: np.ndarray, confidence: float, resamples: int = 2000) -> Tuple[float, float]:
+    """
+    Returns the (percentile) bootstrap confidence interval of the median of the given values.
+
+    Args:
+        values: Sample values.
+        confidence: Confidence level (e.g., 0.95).
+        resamples: Number of bootstrap resamples.
+
+    Returns:
+        Lower and upper bounds of the confidence interval.
+    """
+    rng = np.random.default_rng(0)
+    medians = np.median(rng.choice(values, size=(resamples, len(values)), replace=True), axis=1)
+    alpha = (1 - confidence) / 2
+
+    return float(np.quantile(medians, alpha)), float(np.quantile(medians, 1 - alpha))
+
+
+def summarize(data: pd.DataFrame, confidence: float) -> pd.DataFrame:
+    """
+    Summarizes the trials of each configuration: medians and their (bootstrap) confidence intervals.
+
+    Args:
+        data: Results of every trial (see `benchmark()`).
+        confidence: Confidence level (e.g., 0.95).
+
+    Returns:
+        Number of trials, and median (along with its confidence interval) time and memory per configuration.
+    """
+    summary = []
+    for config, group in data.groupby(CONFIG_COLUMNS, sort=False):
+        summary_i = dict(zip(CONFIG_COLUMNS, config))
+        summary_i["trials"] = len(group)
+        for column in ["tex", "mem"]:
+            summary_i[column] = group[column].median()
+            summary_i[f"{column}_low"], summary_i[f"{column}_high"] = bootstrap_ci(group[column].to_numpy(), confidence)
+
+        summary.append(summary_i)
+
+    return pd.DataFrame(data=summary)
+
+
+@click.command()
+@click.option(
+    '--fname-trips',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (PARQUET format) storing NYC taxi trips tabular data (e.g., yellow_tripdata_2021-01.parquet).',
+)
+@click.option(
+    '--fname-zones',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (CSV format) storing NYC taxi zones tabular data (e.g., taxi_zone_lookup.csv).',
+)
+@click.option('--username', type=click.STRING, required=True, help='PostgreSQL username used during data ingestion.')
+@click.option(
+    '--password',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='PostgreSQL password used during data ingestion.',
+)
+@click.option('--host', type=click.STRING, default="localhost", help='PostgreSQL server hostname.')
+@click.option('--port', type=click.INT, default=5432, help='PostgreSQL server port.')
+@click.option('--db', type=click.STRING, required=True, help='PostgreSQL database destination.')
+@click.option('--schema', type=click.STRING, default="nyc_taxi", help='PostgreSQL schema destination.')
+@click.option('--table-trips', type=click.STRING, default="tune_trips", help='PostgreSQL scratch table.')
+@click.option('--table-zones', type=click.STRING, default="tune_zones", help='PostgreSQL scratch table.')
+@click.option(
+    '--certs',
+    type=click.Path(exists=True, file_okay=False, resolve_path=True, path_type=Path),
+    default=None,
+    help='Directory storing the SSL certificates used to connect to the PostgreSQL server.',
+)
+@click.option(
+    '--chunk-size-dw',
+    type=click.IntRange(min=1),
+    multiple=True,
+    default=[1024, 65536, 1048576],
+    help='Chunk size to-be-used during data downloading (can be repeated).',
+)
+@click.option(
+    '--chunk-size-sql',
+    type=click.IntRange(min=1),
+    multiple=True,
+    default=[1000, 10000, 100000],
+    help='Chunk size to-be-used during data ingestion (can be repeated).',
+)
+@click.option(
+    '--method-sql',
+    type=click.Choice(['multi', 'psql_insert_copy', 'psql_copy_binary', 'psql_copy_async', 'None']),
+    multiple=True,
+    default=['psql_insert_copy', 'psql_copy_binary'],
+    help='SQL insertion clause to-be-used (can be repeated).',
+)
+@click.option(
+    '--engine',
+    type=click.Choice(['pandas', 'arrow']),
+    multiple=True,
+    default=['pandas'],
+    help='Tabular data engine to-be-used (can be repeated).',
+)
+@click.option(
+    '--stream-dw',
+    type=click.BOOL,
+    multiple=True,
+    default=[False],
+    help='Whether NYC taxi trips (CSV | CSV.GZ format) are read while downloaded (can be repeated, e.g., false, true).',
+)
+@click.option('--chunk-size-read', type=click.IntRange(min=1), default=None, help='Batch size used while reading.')
+@click.option('--workers', type=click.IntRange(min=1), default=1, help='Number of worker processes.')
+@click.option('--warmup', type=click.IntRange(min=0), default=1, help='Number of discarded runs per configuration.')
+@click.option('--repeats', type=click.IntRange(min=1), default=5, help='Number of trials per configuration.')
+@click.option(
+    '--confidence',
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    default=0.95,
+    help='Confidence level of the reported confidence intervals.',
+)
+@click.option(
+    '--output',
+    type=click.Path(resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (PARQUET format) of the to-be-created results (one row per trial), as consumed by tune_analyzer.',
+)
+def main(
+    fname_trips: Path,
+    fname_zones: Path,
+    username: str,
+    password: Path,
+    host: str,
+    port: int,
+    db: str,
+    schema: str,
+    table_trips: str,
+    table_zones: str,
+    certs: Path | None,
+    chunk_size_dw: Tuple[int, ...],
+    chunk_size_sql: Tuple[int, ...],
+    method_sql: Tuple[str, ...],
+    engine: Tuple[str, ...],
+    stream_dw: Tuple[bool, ...],
+    chunk_size_read: int | None,
+    workers: int,
+    warmup: int,
+    repeats: int,
+    confidence: float,
+    output: Path,
+):
+    """
+    Benchmark the whole data ingestion of a monthly NYC taxi trips file over a grid of settings, in a single process.
+
+    NYC taxi tabular data is served by a local HTTP server and ingested into (scratch) tables of a local PostgreSQL
+    server. Every combination of the given chunk sizes, SQL insertion clauses, engines, and download modes (tee or not)
+    is run `warmup` times and then timed `repeats` times. Median time and memory (along with their confidence intervals)
+    are printed per configuration, and every trial is stored in `output` (see `tune_analyzer.py`).
+    """
+    if certs is not None:
+        dm.PATHS["certs"] = certs
+    else:
+        pass
+
+    # Data ingestion logs would flood the output of the benchmark.
+    dm._logger.setLevel(logging.WARNING)
+
+    pg_params = {
+        "username": username,
+        "passwd": open(password).readline().rstrip(),
+        "host": host,
+        "port": port,
+        "db": db,
+        "schema": schema,
+        "table_trips_name": table_trips,
+        "table_zones_name": table_zones,
+        "workers": str(workers),
+    }
+
+    configs = [
+        dict(zip(CONFIG_COLUMNS, config))
+        for config in product(chunk_size_dw, chunk_size_sql, method_sql, engine, stream_dw)
+    ]
+
+    data = benchmark(configs, fname_trips, fname_zones, pg_params, chunk_size_read, warmup, repeats)
+    data.to_parquet(output)
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(summarize(data, confidence).to_string(index=False, float_format="{:.2f}".format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+# coding: utf-8
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+import json
+import logging
+from pathlib import Path
+import subprocess
+import sys
+from time import perf_counter
+from typing import Any, Dict, List
+
+import click
+import pandas as pd
+import sqlalchemy as sa
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_manager as dm  # noqa: E402
+
+# Analytic queries of the homework (see `homework.md` and `solutions.md`), adapted to the yellow taxi trips and zones
+# tables ingested by data-manager. Parameters: `start` and `end` (month), `day` (within that month), and `zone`.
+QUERIES = {
+    "trip_segments": """
+        SELECT
+            CASE
+                WHEN trip_distance <= 1 THEN 'Up to 1 mile'
+                WHEN trip_distance > 1 AND trip_distance <= 3 THEN '1~3 miles'
+                WHEN trip_distance > 3 AND trip_distance <= 7 THEN '3~7 miles'
+                WHEN trip_distance > 7 AND trip_distance <= 10 THEN '7~10 miles'
+                ELSE '10+ miles'
+            END AS segment,
+            count(1) AS num_trips
+        FROM {trips}
+        WHERE
+            tpep_pickup_datetime >= :start
+            AND tpep_pickup_datetime < :end
+            AND tpep_dropoff_datetime >= :start
+            AND tpep_dropoff_datetime < :end
+        GROUP BY segment
+    """,
+    "longest_trip_day": """
+        SELECT
+            tpep_pickup_datetime::date AS pickup_date,
+            max(trip_distance) AS longest_trip
+        FROM {trips}
+        GROUP BY tpep_pickup_datetime::date
+        ORDER BY longest_trip DESC
+        LIMIT 1
+    """,
+    "top_pickup_zones": """
+        SELECT
+            z."Zone",
+            round(sum(total_amount)::numeric, 3) AS grand_total_amount
+        FROM {trips} t
+        INNER JOIN {zones} z ON t."PULocationID" = z."LocationID"
+        WHERE tpep_pickup_datetime::date = :day
+        GROUP BY z."Zone"
+        ORDER BY grand_total_amount DESC
+        LIMIT 3
+    """,
+    "largest_tip": """
+        SELECT
+            puz."Zone" AS pickup_zone,
+            doz."Zone" AS dropoff_zone,
+            t.tip_amount
+        FROM {trips} t
+        INNER JOIN {zones} puz ON t."PULocationID" = puz."LocationID"
+        INNER JOIN {zones} doz ON t."DOLocationID" = doz."LocationID"
+        WHERE
+            puz."Zone" = :zone
+            AND tpep_pickup_datetime >= :start
+            AND tpep_pickup_datetime < :end
+        ORDER BY t.tip_amount DESC
+        LIMIT 1
+    """,
+}
+
+
+def table_layout(conn: sa.engine.Connection, schema: str, table_name: str) -> Dict[str, Any]:
+    """
+    Returns the physical layout of the given PostgreSQL table: whether it is partitioned, its number of indexes, and its
+    total size (partitions included).
+
+    Args:
+        conn: SQLAlchemy connection to the PostgreSQL database.
+        schema: PostgreSQL schema of the table.
+        table_name: PostgreSQL table.
+
+    Returns:
+        Whether the table is partitioned (`partitioned`), its number of indexes (`indexes`), and its total size (`size`,
+        in bytes, indexes and TOAST included).
+    """
+    return dict(conn.execute(
+        sa.text(
+            """
+            SELECT
+                c.relkind = 'p' AS partitioned,
+                (SELECT count(*) FROM pg_index i WHERE i.indrelid = c.oid) AS indexes,
+                coalesce(
+                    (SELECT sum(pg_total_relation_size(p.relid)) FROM pg_partition_tree(c.oid) p),
+                    pg_total_relation_size(c.oid)
+                )::bigint AS size
+            FROM pg_class c
+            WHERE c.oid = to_regclass(:table)
+            """
+        ),
+        {"table": f"{schema}.{table_name}"},
+    ).one()._mapping)
+
+
+def query_run(conn: sa.engine.Connection, query: str, params: Dict[str, Any]) -> float:
+    """
+    Returns the elapsed real (wall clock) time, in seconds, of a query, all of its rows fetched.
+
+    Args:
+        conn: SQLAlchemy connection to the PostgreSQL database.
+        query: SQL query.
+        params: Parameters of the SQL query.
+
+    Returns:
+        Elapsed real (wall clock) time, in seconds.
+    """
+    start = perf_counter()
+    conn.execute(sa.text(query), params).fetchall()
+
+    return perf_counter() - start
+
+
+def query_explain(conn: sa.engine.Connection, query: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Returns the plan of a query as actually executed, along with its buffer usage (`EXPLAIN (ANALYZE, BUFFERS)`).
+
+    Args:
+        conn: SQLAlchemy connection to the PostgreSQL database.
+        query: SQL query.
+        params: Parameters of the SQL query.
+
+    Returns:
+        Query plan (JSON format).
+    """
+    return conn.execute(sa.text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}"), params).scalar_one()
+
+
+def benchmark(
+        engine: sa.engine.Engine,
+        schema: str,
+        table_trips: str,
+        table_zones: str,
+        params: Dict[str, Any],
+        layout: str,
+        cold_command: str | None,
+        warmup: int,
+        repeats: int,
+        dir_plans: Path,
+) -> pd.DataFrame:
+    """
+    Benchmarks every homework query (see QUERIES) against the given NYC taxi trips and zones tables, cold and warm.
+
+    Cold executions run on a new connection (so a new PostgreSQL backend, without cached catalogs or plans), right after
+    `cold_command` if set (e.g., a command restarting PostgreSQL and dropping the OS page cache). Warm executions run on
+    a single connection, after `warmup` discarded ones. Each query is then explained (`EXPLAIN (ANALYZE, BUFFERS)`), and
+    its plan is stored in `dir_plans` (`<layout>_<query>.json`).
+
+    Args:
+        engine: SQLAlchemy engine connected to the PostgreSQL database.
+        schema: PostgreSQL schema of the tables.
+        table_trips: PostgreSQL table storing NYC taxi trips tabular data.
+        table_zones: PostgreSQL table storing NYC taxi zones tabular data.
+        params: Parameters of the homework queries (see QUERIES).
+        layout: Label identifying the layout of the tables (e.g., `index`, `partitioned`).
+        cold_command: If set, shell command run before every cold execution.
+        warmup: Number of discarded warm executions per query.
+        repeats: Number of timed executions per query and mode (cold | warm).
+        dir_plans: Directory where query plans are stored.
+
+    Returns:
+        Layout, query, mode, elapsed real (wall clock) time (`tex`, in seconds), and buffer usage of each execution.
+    """
+    dir_plans.mkdir(parents=True, exist_ok=True)
+    tables = {"trips": f"{schema}.{table_trips}", "zones": f"{schema}.{table_zones}"}
+
+    with engine.connect() as conn:
+        layout_trips = table_layout(conn, schema, table_trips)
+
+    data = []
+    for name, template in QUERIES.items():
+        query = template.format(**tables)
+
+        tex_cold = []
+        for _ in range(repeats):
+            if cold_command is not None:
+                subprocess.run(cold_command, shell=True, check=True)
+            else:
+                pass
+
+            # Pooled connections are discarded, so every cold execution starts a new PostgreSQL backend.
+            engine.dispose()
+            with engine.connect() as conn:
+                tex_cold.append(query_run(conn, query, params))
+
+        with engine.connect() as conn:
+            for _ in range(warmup):
+                query_run(conn, query, params)
+
+            tex_warm = [query_run(conn, query, params) for _ in range(repeats)]
+            plan = query_explain(conn, query, params)
+
+        with open(dir_plans/f"{layout}_{name}.json", "w") as f:
+            json.dump(plan, f, indent=2)
+
+        stats = {
+            "tex_planning": plan[0]["Planning Time"] / 1000,
+            "tex_execution": plan[0]["Execution Time"] / 1000,
+            "buffers_hit": plan[0]["Plan"]["Shared Hit Blocks"],
+            "buffers_read": plan[0]["Plan"]["Shared Read Blocks"],
+        }
+        for mode, tex in [("cold", tex_cold), ("warm", tex_warm)]:
+            for run, tex_i in enumerate(tex):
+                data.append(
+                    {"layout": layout, **layout_trips, "query": name, "mode": mode, "run": run, "tex": tex_i, **stats}
+                )
+
+        print(f"{name}: {pd.Series(tex_cold).median() * 1000:.1f} ms (cold), "
+              f"{pd.Series(tex_warm).median() * 1000:.1f} ms (warm)")
+
+    return pd.DataFrame(data=data)
+
+
+def summarize(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarizes the executions of each query: latency percentiles (p50, p90, p99), per layout and mode.
+
+    Args:
+        data: Results of every execution (see `benchmark()`).
+
+    Returns:
+        Number of executions and latency percentiles (in milliseconds), per layout, query, and mode.
+    """
+    grouped = data.groupby(["layout", "query", "mode"], sort=False)["tex"]
+    summary = grouped.quantile([0.5, 0.9, 0.99]).unstack() * 1000
+    summary.columns = ["p50", "p90", "p99"]
+
+    return pd.concat([grouped.size().rename("runs"), summary], axis=1).reset_index()
+
+
+@click.command()
+@click.option('--username', type=click.STRING, required=True, help='PostgreSQL username used during the benchmark.')
+@click.option(
+    '--password',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='PostgreSQL password used during the benchmark.',
+)
+@click.option('--host', type=click.STRING, default="localhost", help='PostgreSQL server hostname.')
+@click.option('--port', type=click.INT, default=5432, help='PostgreSQL server port.')
+@click.option('--db', type=click.STRING, required=True, help='PostgreSQL database storing NYC taxi tabular data.')
+@click.option('--schema', type=click.STRING, default="nyc_taxi", help='PostgreSQL schema storing NYC taxi data.')
+@click.option('--table-trips', type=click.STRING, default="trips", help='PostgreSQL table storing NYC taxi trips.')
+@click.option('--table-zones', type=click.STRING, default="zones", help='PostgreSQL table storing NYC taxi zones.')
+@click.option(
+    '--certs',
+    type=click.Path(exists=True, file_okay=False, resolve_path=True, path_type=Path),
+    default=None,
+    help='Directory storing the SSL certificates used to connect to the PostgreSQL server.',
+)
+@click.option(
+    '--month',
+    type=click.DateTime(formats=["%Y-%m"]),
+    default="2021-01",
+    help='Month (YYYY-MM) of the NYC taxi trips queried.',
+)
+@click.option('--zone', type=click.STRING, default="East Harlem North", help='Pickup zone of the largest tip query.')
+@click.option(
+    '--layout',
+    type=click.STRING,
+    required=True,
+    help='Label identifying the layout of the tables being queried (e.g., baseline, index, partitioned).',
+)
+@click.option(
+    '--cold-command',
+    type=click.STRING,
+    default=None,
+    help='Shell command to-be-run before every cold execution (e.g., restarting PostgreSQL and dropping OS caches).',
+)
+@click.option('--warmup', type=click.IntRange(min=0), default=2, help='Number of discarded warm runs per query.')
+@click.option('--repeats', type=click.IntRange(min=1), default=10, help='Number of runs per query and mode.')
+@click.option(
+    '--output',
+    type=click.Path(resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (PARQUET format) of the results (one row per run), appended to if it exists (see tune_analyzer).',
+)
+def main(
+    username: str,
+    password: Path,
+    host: str,
+    port: int,
+    db: str,
+    schema: str,
+    table_trips: str,
+    table_zones: str,
+    certs: Path | None,
+    month: datetime,
+    zone: str,
+    layout: str,
+    cold_command: str | None,
+    warmup: int,
+    repeats: int,
+    output: Path,
+):
+    """
+    Benchmark the homework queries against NYC taxi tabular data ingested into PostgreSQL by data-manager.
+
+    Every query is timed cold and warm `repeats` times, and its plan (`EXPLAIN (ANALYZE, BUFFERS)`) is stored next to
+    `output` (`<output>_plans/<layout>_<query>.json`). Results are appended to `output` under the given layout label,
+    so running the benchmark after ingesting the same month with different settings (e.g., `--index`, `--partitioned`)
+    compares their read performance (see `tune_analyzer.py queries`).
+    """
+    if certs is not None:
+        dm.PATHS["certs"] = certs
+    else:
+        pass
+
+    dm._logger.setLevel(logging.WARNING)
+
+    pg_params = {
+        "username": username,
+        "passwd": open(password).readline().rstrip(),
+        "host": host,
+        "port": port,
+        "db": db,
+    }
+    params = {
+        "start": month,
+        "end": month + relativedelta(months=+1),
+        # The 18th, as in the homework (2019-10-18).
+        "day": (month + relativedelta(days=+17)).date(),
+        "zone": zone,
+    }
+
+    data = benchmark(
+        dm.pg_engine(pg_params),
+        schema,
+        table_trips,
+        table_zones,
+        params,
+        layout,
+        cold_command,
+        warmup,
+        repeats,
+        output.with_name(f"{output.stem}_plans"),
+    )
+
+    if output.exists():
+        data = pd.concat([pd.read_parquet(output), data], ignore_index=True)
+    else:
+        pass
+
+    data.to_parquet(output)
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(summarize(data).to_string(index=False, float_format="{:.1f}".format))
+
+
+if __name__ == "__main__":
+    main()
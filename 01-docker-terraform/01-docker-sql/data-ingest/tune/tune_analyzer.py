@@ -1,15 +1,23 @@
 #!/usr/bin/env python
 # coding: utf-8
+from itertools import combinations
+from math import comb
 from os import PathLike
 from pathlib import Path
+import sys
+from typing import List
 
 import click
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
 
 plt.rcParams['backend'] = 'TkAgg'
 
+# Settings identifying each configuration in the performance stats (missing from older stats but the first three).
+CONFIG_COLUMNS = ["chunk_size_dw", "chunk_size_sql", "method", "engine", "stream_dw"]
+
 
 def plot(data: pd.DataFrame, fname: str | bytes | PathLike) -> None:
     """
@@ -19,7 +27,13 @@ def plot(data: pd.DataFrame, fname: str | bytes | PathLike) -> None:
         data: PostgreSQL ingestion performance stats.
         fname: Filename containing plotted figure.
     """
-    fig, axs = plt.subplots(nrows=data["method"].nunique(), ncols=2, figsize=(24, 8), layout="constrained")
+    fig, axs = plt.subplots(
+        nrows=data["method"].nunique(),
+        ncols=2,
+        figsize=(24, 8),
+        layout="constrained",
+        squeeze=False,
+    )
     for i, method in enumerate(data["method"].unique()):
         if i == (data["method"].nunique()-1):
             legend = "auto"
@@ -67,14 +81,172 @@ def plot(data: pd.DataFrame, fname: str | bytes | PathLike) -> None:
     plt.savefig(fname.with_suffix(".png"))
 
 
-@click.command()
+def plot_queries(data: pd.DataFrame, fname: str | bytes | PathLike) -> None:
+    """
+    Plot PostgreSQL query performance stats (see `query_benchmark.py`): latency per query and layout, cold and warm.
+
+    Args:
+        data: PostgreSQL query performance stats.
+        fname: Filename containing plotted figure.
+    """
+    modes = data["mode"].unique()
+    fig, axs = plt.subplots(nrows=1, ncols=len(modes), figsize=(24, 8), layout="constrained", squeeze=False)
+    for i, mode in enumerate(modes):
+        sns.barplot(
+            x="query",
+            y="tex",
+            hue="layout",
+            data=data[data["mode"] == mode],
+            estimator="median",
+            ax=axs[0][i],
+            legend="auto" if i == (len(modes)-1) else False,
+        )
+
+        axs[0][i].set_yscale("log")
+        axs[0][i].set_title(f"Query latency (s): {mode}")
+
+    plt.savefig(fname.with_suffix(".png"))
+
+
+def permutation_test(baseline: np.ndarray, candidate: np.ndarray, resamples: int = 10000) -> float:
+    """
+    Returns the (two-sided) p-value of the difference between the medians of two samples, under the null hypothesis
+    that both of them come from the same distribution (permutation test).
+
+    Every relabelling of the pooled samples is evaluated if there are no more than `resamples` of them (exact test).
+    Otherwise, `resamples` random relabellings are evaluated.
+
+    Args:
+        baseline: Baseline sample values.
+        candidate: Candidate sample values.
+        resamples: Maximum number of relabellings evaluated.
+
+    Returns:
+        p-value of the observed difference between medians.
+    """
+    pooled = np.concatenate([baseline, candidate])
+    observed = abs(np.median(candidate) - np.median(baseline))
+
+    if comb(len(pooled), len(candidate)) <= resamples:
+        labels = np.zeros((comb(len(pooled), len(candidate)), len(pooled)), dtype=bool)
+        for i, idx in enumerate(combinations(range(len(pooled)), len(candidate))):
+            labels[i, list(idx)] = True
+    else:
+        rng = np.random.default_rng(0)
+        labels = np.argsort(rng.random((resamples, len(pooled))), axis=1) < len(candidate)
+
+    samples = np.broadcast_to(pooled, labels.shape)
+    diffs = np.abs(
+        np.median(samples[labels].reshape(len(labels), -1), axis=1)
+        - np.median(samples[~labels].reshape(len(labels), -1), axis=1)
+    )
+
+    # A small tolerance prevents rounding errors from excluding the observed relabelling itself.
+    return float(np.mean(diffs >= observed - 1e-12))
+
+
+def compare(
+        baseline: pd.DataFrame,
+        candidate: pd.DataFrame,
+        threshold: float,
+        alpha: float,
+) -> pd.DataFrame:
+    """
+    Compare PostgreSQL ingestion performance stats (time and memory) of a candidate against a baseline, per
+    configuration.
+
+    A regression is flagged if the candidate median is higher than the baseline one by more than `threshold` (relative)
+    and the difference is statistically significant (see `permutation_test()`).
+
+    Args:
+        baseline: Baseline PostgreSQL ingestion performance stats.
+        candidate: Candidate PostgreSQL ingestion performance stats.
+        threshold: Maximum relative increase (e.g., 0.05) allowed in median time and memory.
+        alpha: Significance level.
+
+    Returns:
+        Medians, relative change, p-value, and regression flag of time and memory, per configuration present in both.
+    """
+    columns = [column for column in CONFIG_COLUMNS if column in baseline and column in candidate]
+
+    data = []
+    for config, group in candidate.groupby(columns, sort=False):
+        group_base = baseline[(baseline[columns] == config).all(axis=1)]
+        if group_base.empty:
+            continue
+        else:
+            pass
+
+        data_i = dict(zip(columns, config))
+        for metric in ["tex", "mem"]:
+            median_base, median = group_base[metric].median(), group[metric].median()
+            data_i[f"{metric}_baseline"] = median_base
+            data_i[f"{metric}_candidate"] = median
+            data_i[f"{metric}_change"] = median / median_base - 1
+            data_i[f"{metric}_pvalue"] = permutation_test(group_base[metric].to_numpy(), group[metric].to_numpy())
+            data_i[f"{metric}_regression"] = (
+                data_i[f"{metric}_change"] > threshold
+                and data_i[f"{metric}_pvalue"] < alpha
+            )
+
+        data.append(data_i)
+
+    return pd.DataFrame(data=data)
+
+
+def pareto(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return the Pareto-optimal configurations for time vs memory (i.e., those for which no other configuration is both
+    faster and lighter), based on median time and memory.
+
+    Args:
+        data: PostgreSQL ingestion performance stats.
+
+    Returns:
+        Median time and memory of Pareto-optimal configurations, sorted by time.
+    """
+    columns: List[str] = [column for column in CONFIG_COLUMNS if column in data]
+    medians = data.groupby(columns, as_index=False)[["tex", "mem"]].median()
+
+    tex, mem = medians["tex"].to_numpy(), medians["mem"].to_numpy()
+    dominated = (
+        (tex[None, :] <= tex[:, None])
+        & (mem[None, :] <= mem[:, None])
+        & ((tex[None, :] < tex[:, None]) | (mem[None, :] < mem[:, None]))
+    ).any(axis=1)
+
+    return medians[~dominated].sort_values("tex").reset_index(drop=True)
+
+
+@click.group(invoke_without_command=True)
+@click.option(
+    '--fname',
+    type=click.Path(resolve_path=True, path_type=Path),
+    default=None,
+    help='Filename (PARQUET format) storing performance stats of data-manager (same as `plot --fname`).',
+)
+@click.pass_context
+def main(ctx, fname):
+    """
+    Plot and compare PostgreSQL ingestion performance stats (and plot PostgreSQL query performance stats).
+    """
+    if ctx.invoked_subcommand is None:
+        if fname is None:
+            raise click.UsageError("Missing option '--fname' (or command).")
+        else:
+            ctx.invoke(plot_command, fname=fname)
+    else:
+        pass
+
+
+@main.command("plot")
 @click.option(
     '--fname',
     type=click.Path(resolve_path=True, path_type=Path),
     required=True,
     help='Filename (PARQUET format) storing performance stats of data-manager.',
 )
-def main(fname):
+def plot_command(fname):
     """
     Plot PostgreSQL ingestion performance stats.
 
@@ -85,5 +257,79 @@ def main(fname):
     plot(df, fname)
 
 
+@main.command("queries")
+@click.option(
+    '--fname',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (PARQUET format) storing query performance stats of query_benchmark.',
+)
+def queries_command(fname):
+    """
+    Plot PostgreSQL query performance stats, per query and layout of the tables.
+
+    Args:
+        fname: Filename (PARQUET format) storing PostgreSQL query performance stats.
+    """
+    df = pd.read_parquet(fname)
+    plot_queries(df, fname)
+
+
+@main.command("analyze")
+@click.option(
+    '--baseline',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (PARQUET format) storing baseline performance stats of data-manager.',
+)
+@click.option(
+    '--candidate',
+    type=click.Path(exists=True, resolve_path=True, path_type=Path),
+    required=True,
+    help='Filename (PARQUET format) storing candidate performance stats of data-manager.',
+)
+@click.option(
+    '--threshold',
+    type=click.FloatRange(min=0),
+    default=0.05,
+    help='Maximum relative increase allowed in median time and memory (e.g., 0.05 for 5%).',
+)
+@click.option(
+    '--alpha',
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    default=0.05,
+    help='Significance level used to flag regressions.',
+)
+def analyze_command(baseline, candidate, threshold, alpha):
+    """
+    Compare candidate against baseline PostgreSQL ingestion performance stats, per configuration.
+
+    Exits with a non-zero status if any configuration regresses (time or memory) significantly beyond the threshold.
+    The Pareto-optimal configurations (time vs memory) of the candidate are printed as well.
+
+    Args:
+        baseline: Filename (PARQUET format) storing baseline PostgreSQL ingestion performance stats.
+        candidate: Filename (PARQUET format) storing candidate PostgreSQL ingestion performance stats.
+        threshold: Maximum relative increase allowed in median time and memory.
+        alpha: Significance level.
+    """
+    data_candidate = pd.read_parquet(candidate)
+    results = compare(pd.read_parquet(baseline), data_candidate, threshold, alpha)
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(results.to_string(index=False, float_format="{:.3f}".format))
+        print("\nPareto-optimal configurations (time vs memory):")
+        print(pareto(data_candidate).to_string(index=False, float_format="{:.3f}".format))
+
+    if results.empty:
+        print("No configuration in common between baseline and candidate.")
+    elif results[["tex_regression", "mem_regression"]].any(axis=None):
+        regressions = results[["tex_regression", "mem_regression"]].any(axis=1).sum()
+        print(f"\n{regressions} configuration(s) regressed beyond {threshold:.0%} (alpha = {alpha}).")
+        sys.exit(1)
+    else:
+        pass
+
+
 if __name__ == "__main__":
     main()
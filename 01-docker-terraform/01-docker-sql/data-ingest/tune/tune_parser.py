@@ -98,21 +98,49 @@ def parse(fname: str | bytes | PathLike) -> pd.DataFrame:
     return pd.DataFrame(data=data, columns=["chunk_size_dw", "chunk_size_sql", "method", "tex", "mem"])
 
 
+def parse_metrics(fname: str | bytes | PathLike) -> pd.DataFrame:
+    """
+    Parse PostgreSQL ingestion performance stats recorded by data-manager (`--metrics`).
+
+    Args:
+        fname: local path where PostgreSQL ingestion performance stats are stored (JSON-lines format).
+
+    Returns:
+        Parsed PostgreSQL ingestion performance stats, one row per run: its settings, elapsed real (wall clock) time
+        (`tex`, in seconds), and maximum resident set size (`mem`, in Kilobytes), along with the elapsed real (wall
+        clock) time spent in each stage (`tex_<stage>`, in seconds).
+    """
+    metrics = pd.read_json(fname, lines=True)
+
+    runs = metrics[metrics["stage"] == "run"].dropna(axis="columns", how="all").set_index("run")
+    runs = runs.rename(columns={"wall": "tex"}).drop(columns=["stage", "rows", "bytes", "time"], errors="ignore")
+    runs["mem"] = runs.pop("rss_peak") / 1024
+
+    stages = metrics[metrics["stage"] != "run"].pivot_table(index="run", columns="stage", values="wall", aggfunc="sum")
+    stages.columns = [f"tex_{stage}" for stage in stages.columns]
+
+    return runs.join(stages).reset_index()
+
+
 @click.command()
 @click.option(
     '--fname',
     type=click.Path(resolve_path=True, path_type=Path),
     required=True,
-    help='Filename (TXT format) storing performance stats of data-manager.',
+    help='Filename (JSONL | TXT format) storing performance stats of data-manager.',
 )
 def main(fname):
     """
     Parse PostgreSQL ingestion performance stats.
 
     Args:
-        fname: local path where PostgreSQL ingestion performance stats are stored (TXT format).
+        fname: local path where PostgreSQL ingestion performance stats are stored (JSONL format, as recorded by
+            data-manager with `--metrics`, or TXT format, as formerly printed by `tune.sh`).
     """
-    parse(fname).to_parquet(fname.with_suffix(".parquet"))
+    if fname.suffix == ".jsonl":
+        parse_metrics(fname).to_parquet(fname.with_suffix(".parquet"))
+    else:
+        parse(fname).to_parquet(fname.with_suffix(".parquet"))
 
 
 if __name__ == "__main__":